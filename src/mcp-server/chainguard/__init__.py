@@ -68,7 +68,7 @@ v4.8.0 Changes:
 
 Modular Architecture:
 - config.py: Constants, Enums, Configuration
-- cache.py: LRU Cache, TTL-LRU Cache, Async File Locks, Git Cache
+- cache.py: LRU Cache, TTL-LRU Cache, Async File Locks, Git Cache, Path Resolution Cache
 - validators.py: Syntax validation (PHP, JS, JSON, Python, TS)
 - http_session.py: HTTP session management for testing
 - test_runner.py: Test execution and output parsing (v4.10)
@@ -20,7 +20,10 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Any, Tuple, TYPE_CHECKING
 from pathlib import Path
 from enum import Enum
+import os
 import re
+import threading
+from collections import OrderedDict
 
 from .config import logger
 
@@ -61,6 +64,19 @@ class RelationType(str, Enum):
     INSTANTIATES = "instantiates"
 
 
+# Trees kept for incremental re-parsing of edited files (LRU)
+INCREMENTAL_TREE_CACHE_SIZE = 512
+
+# Analyses of on-disk files, reused while (mtime, size) match (LRU);
+# sized so analysing a typical source directory doesn't evict itself
+ANALYSIS_CACHE_SIZE = 1024
+
+# analyze_directory never descends into directories with these names
+DIRECTORY_SKIP_DIRS = frozenset({
+    "node_modules", "vendor", ".git", "dist", "build",
+    "__pycache__", ".venv", "venv",
+})
+
 # Language file extensions
 LANGUAGE_EXTENSIONS: Dict[str, str] = {
     ".py": "python",
@@ -75,6 +91,8 @@ LANGUAGE_EXTENSIONS: Dict[str, str] = {
     ".java": "java",
 }
 
+_EXTENSION_SET = frozenset(LANGUAGE_EXTENSIONS)
+
 
 # =============================================================================
 # Data Classes
@@ -322,10 +340,16 @@ class RegexAnalyzer:
         },
     }
 
+    # PATTERNS compiled once; analyze() matches them against every line
+    _COMPILED: Dict[str, Dict[str, "re.Pattern"]] = {
+        language: {kind: re.compile(pattern) for kind, pattern in kinds.items()}
+        for language, kinds in PATTERNS.items()
+    }
+
     @classmethod
     def analyze(cls, content: str, language: str, file_path: str) -> FileAnalysis:
         """Analyze file content using regex patterns."""
-        patterns = cls.PATTERNS.get(language, {})
+        patterns = cls._COMPILED.get(language, {})
         if not patterns:
             return FileAnalysis(file_path=file_path, language=language)
 
@@ -346,7 +370,7 @@ class RegexAnalyzer:
 
             # Check class pattern
             if "class" in patterns:
-                match = re.match(patterns["class"], stripped)
+                match = patterns["class"].match(stripped)
                 if match:
                     class_name = match.group(1)
                     parent = match.group(2) if len(match.groups()) > 1 else None
@@ -377,7 +401,7 @@ class RegexAnalyzer:
 
             # Check interface pattern (TypeScript, PHP, Go)
             if "interface" in patterns:
-                match = re.match(patterns["interface"], stripped)
+                match = patterns["interface"].match(stripped)
                 if match:
                     iface_docstring = cls._extract_docstring(lines, line_num - 1, language)
                     symbols.append(CodeSymbol(
@@ -392,7 +416,7 @@ class RegexAnalyzer:
 
             # Check function pattern
             if "function" in patterns:
-                match = re.match(patterns["function"], stripped)
+                match = patterns["function"].match(stripped)
                 if match:
                     func_name = match.group(1)
                     params = match.group(2) if len(match.groups()) > 1 else ""
@@ -419,7 +443,7 @@ class RegexAnalyzer:
 
             # Check method pattern (Python indented methods)
             if "method" in patterns and language == "python":
-                match = re.match(patterns["method"], line)  # Don't strip - check indentation
+                match = patterns["method"].match(line)  # Don't strip - check indentation
                 if match and current_class:
                     func_name = match.group(1)
                     params = match.group(2)
@@ -443,7 +467,7 @@ class RegexAnalyzer:
 
             # Check import pattern
             if "import" in patterns:
-                match = re.match(patterns["import"], stripped)
+                match = patterns["import"].match(stripped)
                 if match:
                     if language == "python":
                         module = match.group(1) or ""
@@ -626,8 +650,12 @@ class TreeSitterAnalyzer:
     Requires: pip install tree-sitter tree-sitter-python tree-sitter-javascript ...
     """
 
-    _parser = None
     _languages: Dict[str, Any] = {}
+    # Parsers are reused per language, one set per thread (not thread-safe)
+    _local = threading.local()
+    # (file_path, language) -> (source bytes, tree) of the last incremental parse
+    _trees: "OrderedDict[Tuple[str, str], Tuple[bytes, Any]]" = OrderedDict()
+    _trees_lock = threading.Lock()
 
     @classmethod
     def is_available(cls) -> bool:
@@ -676,18 +704,105 @@ class TreeSitterAnalyzer:
         return False
 
     @classmethod
-    def analyze(cls, content: str, language: str, file_path: str) -> FileAnalysis:
-        """Analyze file content using tree-sitter."""
+    def _get_parser(cls, language: str):
+        """Parser for language, created once per thread and reused across files."""
+        parsers = getattr(cls._local, "parsers", None)
+        if parsers is None:
+            parsers = cls._local.parsers = {}
+        parser = parsers.get(language)
+        if parser is None:
+            import tree_sitter
+
+            parser = tree_sitter.Parser()
+            parser.language = cls._languages[language]
+            parsers[language] = parser
+        return parser
+
+    @staticmethod
+    def _edit_range(old: bytes, new: bytes) -> Dict[str, Any]:
+        """Single tree-sitter edit covering everything between the common prefix and suffix."""
+        limit = min(len(old), len(new))
+
+        # Binary search on slice equality (memcmp): ~0.2 ms for a 280 KB file,
+        # where a per-byte loop took ~25 ms of a ~70 ms full parse
+        lo, hi = 0, limit
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if old[:mid] == new[:mid]:
+                lo = mid
+            else:
+                hi = mid - 1
+        start = lo
+
+        lo, hi = 0, limit - start
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if old[len(old) - mid:] == new[len(new) - mid:]:
+                lo = mid
+            else:
+                hi = mid - 1
+        suffix = lo
+        old_end = len(old) - suffix
+        new_end = len(new) - suffix
+
+        def point(data: bytes, offset: int) -> Tuple[int, int]:
+            return data.count(b"\n", 0, offset), offset - (data.rfind(b"\n", 0, offset) + 1)
+
+        return {
+            "start_byte": start,
+            "old_end_byte": old_end,
+            "new_end_byte": new_end,
+            "start_point": point(old, start),
+            "old_end_point": point(old, old_end),
+            "new_end_point": point(new, new_end),
+        }
+
+    @classmethod
+    def _parse(cls, parser, source: bytes, language: str, file_path: str, incremental: bool):
+        """Parse source, reusing the file's previous tree when incremental."""
+        if not incremental:
+            return parser.parse(source)
+
+        key = (file_path, language)
+        with cls._trees_lock:
+            previous = cls._trees.pop(key, None)  # Take ownership (edit() mutates the tree)
+
+        if previous is None:
+            tree = parser.parse(source)
+        elif previous[0] == source:
+            tree = previous[1]
+        else:
+            old_source, old_tree = previous
+            try:
+                old_tree.edit(**cls._edit_range(old_source, source))
+                tree = parser.parse(source, old_tree=old_tree)
+            except Exception as e:
+                # Stale or mismatched tree: a full parse is always correct
+                logger.debug(f"Incremental parse of {file_path} failed, reparsing: {e}")
+                tree = parser.parse(source)
+
+        with cls._trees_lock:
+            cls._trees[key] = (source, tree)
+            while len(cls._trees) > INCREMENTAL_TREE_CACHE_SIZE:
+                cls._trees.popitem(last=False)
+        return tree
+
+    @classmethod
+    def analyze(cls, content: str, language: str, file_path: str, incremental: bool = False) -> FileAnalysis:
+        """
+        Analyze file content using tree-sitter.
+
+        With incremental=True the file's previous tree is kept and reused on
+        the next call, so re-analysing an edited file only re-parses the
+        changed region (used for per-edit memory updates).
+        """
         if not cls._ensure_parser(language):
             # Fallback to regex
             return RegexAnalyzer.analyze(content, language, file_path)
 
         try:
-            import tree_sitter
-
-            parser = tree_sitter.Parser()
-            parser.language = cls._languages[language]
-            tree = parser.parse(bytes(content, "utf8"))
+            parser = cls._get_parser(language)
+            tree = cls._parse(parser, content.encode("utf8"), language, file_path, incremental)
 
             symbols: List[CodeSymbol] = []
             imports: List[str] = []
@@ -714,6 +829,10 @@ class TreeSitterAnalyzer:
 
         except Exception as e:
             logger.error(f"tree-sitter analysis failed: {e}")
+            # Don't reuse a parser or tree left in an unknown state
+            getattr(cls._local, "parsers", {}).pop(language, None)
+            with cls._trees_lock:
+                cls._trees.pop((file_path, language), None)
             return RegexAnalyzer.analyze(content, language, file_path)
 
     @classmethod
@@ -831,6 +950,12 @@ class TreeSitterAnalyzer:
         return params
 
 
+def _file_signature(file_path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of file_path; raises OSError if it cannot be stat'ed."""
+    st = os.stat(file_path)
+    return (st.st_mtime_ns, st.st_size)
+
+
 # =============================================================================
 # Main Analyzer Class
 # =============================================================================
@@ -846,14 +971,48 @@ class ASTAnalyzer:
             logger.info("AST Analyzer: Using tree-sitter")
         else:
             logger.info("AST Analyzer: Using regex fallback")
+        # file_path -> ((mtime_ns, size), FileAnalysis); shared results, treat as read-only
+        self._analysis_cache: "OrderedDict[str, Tuple[Tuple[int, int], FileAnalysis]]" = OrderedDict()
+        self._analysis_lock = threading.Lock()
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """Drop the cached analysis of file_path (or of all files)."""
+        with self._analysis_lock:
+            if file_path is None:
+                self._analysis_cache.clear()
+            else:
+                self._analysis_cache.pop(file_path, None)
+
+    def _cached(self, file_path: str, signature: Tuple[int, int]) -> Optional[FileAnalysis]:
+        """Cached analysis of file_path if it still matches signature."""
+        with self._analysis_lock:
+            cached = self._analysis_cache.get(file_path)
+            if cached is not None and cached[0] == signature:
+                self._analysis_cache.move_to_end(file_path)
+                return cached[1]
+        return None
 
-    def analyze_file(self, file_path: str, content: Optional[str] = None) -> FileAnalysis:
+    def remember(self, file_path: str, signature: Tuple[int, int], analysis: FileAnalysis):
+        """Store an analysis computed elsewhere (e.g. in a worker process)."""
+        with self._analysis_lock:
+            self._analysis_cache[file_path] = (signature, analysis)
+            self._analysis_cache.move_to_end(file_path)
+            while len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+
+    def analyze_file(self, file_path: str, content: Optional[str] = None,
+                     incremental: bool = False) -> FileAnalysis:
         """
         Analyze a single file and extract symbols and relations.
 
+        When the file is read from disk (no content given), the result is
+        cached and reused until the file's mtime or size changes.
+
         Args:
             file_path: Path to the file
             content: Optional file content (if not provided, file is read)
+            incremental: Keep the parse tree for cheaper re-analysis after edits
+                (tree-sitter only)
 
         Returns:
             FileAnalysis with symbols, imports, and relations
@@ -864,17 +1023,73 @@ class ASTAnalyzer:
         if not language:
             return FileAnalysis(file_path=file_path, language="unknown")
 
+        signature = None
         if content is None:
             try:
+                signature = _file_signature(file_path)
+                cached = self._cached(file_path, signature)
+                if cached is not None:
+                    return cached
                 content = path.read_text(encoding='utf-8', errors='ignore')
             except Exception as e:
                 logger.error(f"Failed to read file {file_path}: {e}")
                 return FileAnalysis(file_path=file_path, language=language)
 
         if self.use_tree_sitter:
-            return TreeSitterAnalyzer.analyze(content, language, file_path)
+            analysis = TreeSitterAnalyzer.analyze(content, language, file_path, incremental=incremental)
         else:
-            return RegexAnalyzer.analyze(content, language, file_path)
+            analysis = RegexAnalyzer.analyze(content, language, file_path)
+
+        if signature is not None:
+            self.remember(file_path, signature, analysis)
+        return analysis
+
+    def list_directory(
+        self,
+        directory: str,
+        extensions: Optional[Set[str]] = None,
+    ) -> List[str]:
+        """
+        List the analyzable files in a directory (skips non-source directories).
+
+        Args:
+            directory: Path to directory
+            extensions: Optional set of extensions to include
+
+        Returns:
+            List of file paths
+        """
+        ext_set = _EXTENSION_SET if extensions is None else frozenset(extensions)
+
+        # One walk for all extensions; skipped directories are never entered
+        files: List[str] = []
+        for root, dirs, names in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in DIRECTORY_SKIP_DIRS]
+            for name in names:
+                if os.path.splitext(name)[1] in ext_set:
+                    files.append(os.path.join(root, name))
+
+        return files
+
+    def split_cached(self, files: List[str]) -> Tuple[Dict[str, FileAnalysis], List[str]]:
+        """
+        Split files into cached analyses and files that still need parsing.
+
+        Returns:
+            (dict of file path to cached FileAnalysis, list of uncached paths)
+        """
+        cached: Dict[str, FileAnalysis] = {}
+        misses: List[str] = []
+        for file_path in files:
+            try:
+                analysis = self._cached(file_path, _file_signature(file_path))
+            except OSError:
+                analysis = None
+            if analysis is None:
+                misses.append(file_path)
+            else:
+                cached[file_path] = analysis
+        return cached, misses
 
     def analyze_directory(
         self,
@@ -892,24 +1107,11 @@ class ASTAnalyzer:
             Dict mapping file paths to FileAnalysis
         """
         results: Dict[str, FileAnalysis] = {}
-        dir_path = Path(directory)
-
-        if extensions is None:
-            extensions = set(LANGUAGE_EXTENSIONS.keys())
-
-        for ext in extensions:
-            for file_path in dir_path.rglob(f"*{ext}"):
-                # Skip common non-source directories
-                path_str = str(file_path)
-                if any(skip in path_str for skip in [
-                    "node_modules", "vendor", ".git", "dist", "build",
-                    "__pycache__", ".venv", "venv"
-                ]):
-                    continue
 
-                analysis = self.analyze_file(str(file_path))
-                if analysis.symbols:
-                    results[str(file_path)] = analysis
+        for file_path in self.list_directory(directory, extensions):
+            analysis = self.analyze_file(file_path)
+            if analysis.symbols:
+                results[file_path] = analysis
 
         return results
 
@@ -965,3 +1167,17 @@ class ASTAnalyzer:
 # =============================================================================
 
 ast_analyzer = ASTAnalyzer()
+
+
+def analyze_file_signed(file_path: str) -> Tuple[Optional[Tuple[int, int]], FileAnalysis]:
+    """
+    Analyze a file from disk and return it with its (mtime_ns, size) signature.
+
+    Module-level so it can run in a worker process; the caller stores the
+    result with ASTAnalyzer.remember().
+    """
+    try:
+        signature = _file_signature(file_path)
+    except OSError:
+        signature = None
+    return signature, ast_analyzer.analyze_file(file_path)
@@ -1,7 +1,7 @@
 """
 CHAINGUARD MCP Server - Cache Module
 
-Contains: LRUCache, TTLLRUCache, AsyncFileLock, GitCache
+Contains: LRUCache, TTLLRUCache, AsyncFileLock, GitCache, resolve_path, ContentCache
 
 Copyright (c) 2026 Provimedia GmbH
 Licensed under the Polyform Noncommercial License 1.0.0
@@ -9,12 +9,19 @@ See LICENSE file in the project root for full license information.
 """
 
 import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Optional, Dict, Set, TypeVar, Generic
+from typing import Any, Optional, Dict, Set, TypeVar, Generic
 from collections import OrderedDict
 
-from .config import MAX_PROJECTS_IN_CACHE, GIT_CACHE_TTL_SECONDS
+from .config import (
+    logger, CHAINGUARD_HOME, MAX_PROJECTS_IN_CACHE, GIT_CACHE_TTL_SECONDS, INDEX_CACHE_MAX_ENTRIES
+)
 
 T = TypeVar('T')
 
@@ -191,3 +198,150 @@ class GitCache:
 
 # Global git cache instance
 git_cache = GitCache()
+
+
+# =============================================================================
+# Path Resolution Cache (with TTL)
+# =============================================================================
+# Absolute input path -> Path.resolve() result. Every handler resolves its
+# working_dir, so the repeated resolve() syscalls are skipped for known dirs.
+resolved_path_cache: TTLLRUCache[str] = TTLLRUCache(
+    maxsize=MAX_PROJECTS_IN_CACHE * 4, ttl_seconds=GIT_CACHE_TTL_SECONDS
+)
+
+
+def resolve_path(path: str) -> str:
+    """
+    Resolve a path to its canonical form (cached).
+
+    Relative inputs ('.', 'src') are joined with the current working
+    directory before the lookup, so a cwd change never returns the
+    resolution of another directory.
+    """
+    key = path if os.path.isabs(path) else os.path.join(os.getcwd(), path)
+    resolved = resolved_path_cache.get(key)
+    if resolved is None:
+        resolved = str(Path(key).resolve())
+        resolved_path_cache.set(key, resolved)
+    return resolved
+
+
+# =============================================================================
+# Persistent Content Cache (sqlite, keyed by content hash)
+# =============================================================================
+class ContentCache:
+    """
+    Persistent JSON payload cache keyed by a hash of the input content.
+
+    Used by memory_init to skip AST extraction and summarization of files
+    that have not changed since the last index. Backed by sqlite in WAL mode;
+    the connection is opened lazily and shared between worker threads.
+    Any sqlite error degrades to a cache miss.
+
+    stored_at is the last use of an entry: hits are collected in memory and
+    written back in one transaction by prune(), so frequently read entries
+    are not evicted as if they were cold.
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = INDEX_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._hits: Set[str] = set()
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Build a cache key from the given parts (e.g. version, path, content)."""
+        h = hashlib.sha256()
+        for part in parts:
+            h.update(part.encode("utf-8", errors="surrogatepass"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT payload FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Content cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        self._hits.add(key)
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        payload = json.dumps(value)
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, payload, stored_at) VALUES (?, ?, ?)",
+                    (key, payload, time.time())
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Content cache write failed: {e}")
+
+    def set_many(self, items):
+        """Store several (key, value) pairs in one transaction."""
+        now = time.time()
+        rows = [(key, json.dumps(value), now) for key, value in items]
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, payload, stored_at) VALUES (?, ?, ?)",
+                    rows
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Content cache write failed: {e}")
+
+    def prune(self) -> int:
+        """Drop the least recently used entries beyond max_entries. Returns count of removed items."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                hits, self._hits = self._hits, set()
+                if hits:
+                    now = time.time()
+                    conn.executemany(
+                        "UPDATE entries SET stored_at = ? WHERE key = ?", [(now, key) for key in hits]
+                    )
+                cur = conn.execute(
+                    "DELETE FROM entries WHERE key NOT IN ("
+                    "SELECT key FROM entries ORDER BY stored_at DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+                conn.commit()
+                return cur.rowcount
+        except sqlite3.Error as e:
+            logger.debug(f"Content cache prune failed: {e}")
+            return 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global extraction cache for memory_init
+index_cache = ContentCache(CHAINGUARD_HOME / "index_cache.sqlite")
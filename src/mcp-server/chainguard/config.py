@@ -39,6 +39,11 @@ TOON_ENABLED = True
 # Set to False to disable even if dependencies are installed
 MEMORY_ENABLED = False
 
+# Memory embeddings via int8-quantized ONNX model (onnxruntime) instead of PyTorch
+# Faster on CPU and lower RAM; needs sentence-transformers>=3.2 + optimum[onnxruntime]
+# Falls back to PyTorch if unavailable. Re-run memory_init after switching.
+EMBEDDING_ONNX_ENABLED = False
+
 # Symbol Validation (v6.2): Automatic hallucination detection in chainguard_track
 # Checks function calls against known definitions in codebase
 # Only runs in programming mode, WARN mode = inform only, never block
@@ -489,11 +494,14 @@ DESCRIPTION_PREVIEW_LENGTH = 200
 MAX_OUT_OF_SCOPE_FILES = 20
 MAX_CHANGED_FILES = 30
 MAX_RECENT_ACTIONS = 5
+ACTION_SAMPLE_INTERVAL = 10     # Read-only tools log only every Nth call
 MAX_PROJECTS_IN_CACHE = 20
 
 # Performance Tuning
 DEBOUNCE_DELAY_SECONDS = 0.5
 GIT_CACHE_TTL_SECONDS = 300
+INDEX_CACHE_MAX_ENTRIES = 50000  # memory_init extraction cache (sqlite)
+INDEX_PROCESS_POOL_MAX_WORKERS = 4  # each spawn worker re-imports handlers (~60 MB)
 SYNTAX_CHECK_TIMEOUT_SECONDS = 10
 HTTP_REQUEST_TIMEOUT_SECONDS = 10
 
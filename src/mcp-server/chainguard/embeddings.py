@@ -22,17 +22,22 @@ Usage:
 import asyncio
 import logging
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Dict, Set, Tuple
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
 
+from .config import EMBEDDING_ONNX_ENABLED
+
 logger = logging.getLogger("chainguard.embeddings")
 
 # Model configuration
 DEFAULT_MODEL = "all-MiniLM-L6-v2"
 EMBEDDING_DIMENSIONS = 384
 MAX_TOKENS = 256
+# Pre-quantized int8 export shipped with the model repo (AVX2: broadest x86 support)
+ONNX_MODEL_FILE = "onnx/model_quint8_avx2.onnx"
 
 
 @dataclass
@@ -109,22 +114,8 @@ class KeywordExtractor:
         Returns:
             ["login", "bug", "session", "handling", "verbessern"]
         """
-        # Normalize
-        text = text.lower()
-
-        # Replace special characters with spaces
-        text = re.sub(r'[^a-zäöüß0-9\s]', ' ', text)
-
-        # Tokenize
-        words = text.split()
-
-        # Remove stop words and short words
-        keywords = [
-            w for w in words
-            if w not in cls.STOP_WORDS and len(w) > 2
-        ]
-
-        return list(set(keywords))
+        # Cached per text (repeated queries); copy so callers may modify the list
+        return list(_extract_keywords(text))
 
     @classmethod
     def expand(cls, keywords: List[str]) -> List[str]:
@@ -159,6 +150,34 @@ class KeywordExtractor:
         return original, expanded
 
 
+# Repeated queries/descriptions skip tokenization (keyword + task type caches)
+KEYWORD_CACHE_SIZE = 1024
+
+_NON_WORD_CHARS = re.compile(r'[^a-zäöüß0-9\s]')
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def _extract_keywords(text: str) -> Tuple[str, ...]:
+    """Tokenize text into unique keywords (backs KeywordExtractor.extract)."""
+    # Normalize
+    text = text.lower()
+
+    # Replace special characters with spaces
+    text = _NON_WORD_CHARS.sub(' ', text)
+
+    # Tokenize
+    words = text.split()
+
+    # Remove stop words and short words
+    stop_words = KeywordExtractor.STOP_WORDS
+    keywords = [
+        w for w in words
+        if w not in stop_words and len(w) > 2
+    ]
+
+    return tuple(set(keywords))
+
+
 class EmbeddingEngine:
     """
     Local embedding engine using sentence-transformers.
@@ -170,8 +189,10 @@ class EmbeddingEngine:
     - Batched processing for efficiency
     """
 
-    def __init__(self, model_name: str = DEFAULT_MODEL):
+    def __init__(self, model_name: str = DEFAULT_MODEL, use_onnx: bool = EMBEDDING_ONNX_ENABLED):
         self.model_name = model_name
+        self.use_onnx = use_onnx
+        self.backend = "onnx-int8" if use_onnx else "torch"  # corrected on load
         self._model = None
         self._executor = ThreadPoolExecutor(max_workers=1)
         self._lock = asyncio.Lock()
@@ -182,6 +203,13 @@ class EmbeddingEngine:
         """Check if model is loaded."""
         return self._model is not None
 
+    @property
+    def model_label(self) -> str:
+        """Model name including the quantized backend, if used."""
+        if self.backend == "torch":
+            return self.model_name
+        return f"{self.model_name}-{self.backend}"
+
     @property
     def dimensions(self) -> int:
         """Get embedding dimensions."""
@@ -191,8 +219,20 @@ class EmbeddingEngine:
         """Load model synchronously (called in thread pool)."""
         try:
             from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer(self.model_name)
-            logger.info(f"Loaded embedding model: {self.model_name}")
+            if self.use_onnx:
+                try:
+                    self._model = SentenceTransformer(
+                        self.model_name,
+                        backend="onnx",
+                        model_kwargs={"file_name": ONNX_MODEL_FILE}
+                    )
+                    self.backend = "onnx-int8"
+                except Exception as e:
+                    logger.warning(f"ONNX embedding backend unavailable, using PyTorch: {e}")
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+                self.backend = "torch"
+            logger.info(f"Loaded embedding model: {self.model_label}")
         except ImportError as e:
             self._load_error = (
                 "sentence-transformers not installed. "
@@ -315,7 +355,7 @@ class EmbeddingEngine:
         await self._ensure_loaded()
 
         return {
-            "model": self.model_name,
+            "model": self.model_label,
             "dimensions": self._model.get_sentence_embedding_dimension(),
             "max_seq_length": getattr(self._model, 'max_seq_length', MAX_TOKENS),
             "loaded": self.is_loaded,
@@ -335,6 +375,7 @@ class EmbeddingEngine:
 embedding_engine = EmbeddingEngine()
 
 
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
 def detect_task_type(description: str) -> str:
     """
     Detect task type from description for relevance scoring.
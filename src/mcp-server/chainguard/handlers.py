@@ -9,10 +9,20 @@ Licensed under the Polyform Noncommercial License 1.0.0
 See LICENSE file in the project root for full license information.
 """
 
+import os
+import re
 import asyncio
+import fnmatch
+import hashlib
+import stat
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Callable, Awaitable, Set
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Set, Tuple, Union
 
 try:
     from mcp.types import TextContent
@@ -32,6 +42,7 @@ from .config import (
     MEMORY_ENABLED,
     SYMBOL_VALIDATION_AUTO,
     KANBAN_ENABLED,
+    INDEX_PROCESS_POOL_MAX_WORKERS,
     logger
 )
 
@@ -51,7 +62,7 @@ from .project_manager import project_manager as pm
 from .validators import SyntaxValidator
 from .symbol_validator import SymbolValidator, SymbolExtractor, SymbolValidationMode
 from .symbol_patterns import detect_language
-from .package_validator import PackageValidator, format_package_report
+from .package_validator import PackageValidator, format_package_report, registry_signature
 from .utils import sanitize_path, is_path_safe
 from .checklist import ChecklistRunner
 from .analyzers import CodeAnalyzer, ImpactAnalyzer
@@ -59,6 +70,15 @@ from .http_session import http_session_manager
 from .test_runner import TestRunner, TestConfig, TestResult
 from .history import HistoryManager, format_auto_suggest
 from .db_inspector import DBInspector, DBConfig, get_inspector, clear_inspector
+from .cache import LRUCache, TTLLRUCache, ContentCache, index_cache
+from .ast_analyzer import ast_analyzer, analyze_file_signed, LANGUAGE_EXTENSIONS, RegexAnalyzer
+
+# Async file I/O
+try:
+    import aiofiles
+    HAS_AIOFILES = True
+except ImportError:
+    HAS_AIOFILES = False
 
 # Kanban System (v6.5)
 try:
@@ -73,9 +93,9 @@ except ImportError:
 try:
     from .memory import (
         memory_manager, context_injector, get_project_id,
-        RelevanceScorer, ContextFormatter, should_index_file
+        RelevanceScorer, ContextFormatter, should_index_file, MemoryBatch
     )
-    from .embeddings import KeywordExtractor, detect_task_type
+    from .embeddings import KeywordExtractor, detect_task_type, embedding_engine
     # v6.0: Memory can be disabled via config even if dependencies are available
     # This prevents high RAM usage and potential kernel panics on low-memory systems
     MEMORY_AVAILABLE = MEMORY_ENABLED
@@ -177,16 +197,206 @@ handler = HandlerRegistry
 # Helper Functions
 # =============================================================================
 def _text(msg: str) -> List[TextContent]:
-    """Create a single TextContent response."""
+    """
+    Create a single TextContent response.
+
+    Note: Uses the regular constructor on purpose. With pydantic v2 the
+    validated __init__ (~2µs) is faster than model_construct() or a
+    model_copy() of a template, so there is nothing to gain by bypassing it.
+    """
     return [TextContent(type="text", text=msg)]
 
 
+def _basename(path: str) -> str:
+    """Fast basename for '/' or '\\' separated paths (avoids a Path() per call)."""
+    return path.rpartition("/")[2].rpartition("\\")[2]
+
+
+def _line_count(content: str) -> int:
+    """Line count as splitlines() gives for \\n / \\r\\n text, without building the list."""
+    if not content:
+        return 0
+    return content.count("\n") + (not content.endswith("\n"))
+
+
+def _project_file(project_path: Union[str, Path], file: str) -> Path:
+    """Resolve a file argument against the project (absolute paths are kept)."""
+    if os.path.isabs(file):
+        return Path(file)
+    return Path(project_path, file)
+
+
 def _check_context(args: Dict[str, Any]) -> str:
     """Check for context marker and return refresh text if missing."""
     ctx = args.get("ctx", "")
     return "" if ctx == CONTEXT_MARKER else CONTEXT_REFRESH_TEXT
 
 
+# =============================================================================
+# Static Responses
+# =============================================================================
+# Responses whose content is fully constant. The output format is fixed at
+# import time, so build the XML/legacy string once instead of per call.
+def _static(xml_factory: Callable[[], str], legacy: str) -> str:
+    return xml_factory() if XML_RESPONSES_ENABLED else legacy
+
+
+_RESP_TEST_CONFIG_EMPTY = _static(
+    lambda: xml_info(
+        tool="test_config",
+        message="Kein Test-Command konfiguriert",
+        data={
+            "example": "chainguard_test_config(command=\"./vendor/bin/phpunit\", args=\"tests/\")"
+        }
+    ),
+    "Kein Test-Command konfiguriert.\n\nBeispiel:\nchainguard_test_config(\n  command=\"./vendor/bin/phpunit\",\n  args=\"tests/\"\n)"
+)
+_RESP_RUN_TESTS_NO_CONFIG = _static(
+    lambda: xml_blocked(
+        tool="run_tests",
+        message="Kein Test-Command konfiguriert",
+        blocker_type="test_config_required",
+        blocker_data={"action": "chainguard_test_config(command=\"...\")"}
+    ),
+    "✗ Kein Test-Command konfiguriert.\n\nZuerst: chainguard_test_config(command=\"...\")"
+)
+_RESP_TEST_STATUS_NONE = _static(
+    lambda: xml_info(
+        tool="test_status",
+        message="Keine Tests ausgeführt",
+        data={"hint": "chainguard_run_tests()"}
+    ),
+    "Keine Tests ausgeführt.\n\nNutze: chainguard_run_tests()"
+)
+_RESP_RECALL_NO_QUERY = _static(
+    lambda: xml_warning(
+        tool="recall",
+        message="Query required",
+        data={"example": 'chainguard_recall(query="php syntax Controller")'}
+    ),
+    "⚠ Query required. Example: chainguard_recall(query=\"php syntax Controller\")"
+)
+_RESP_LEARN_NO_RESOLUTION = _static(
+    lambda: xml_warning(
+        tool="learn",
+        message="resolution required",
+        data={"example": 'chainguard_learn(resolution="Missing semicolon before }")'}
+    ),
+    "⚠ resolution required. Example: chainguard_learn(resolution=\"Missing semicolon before }\")"
+)
+_RESP_LEARN_NO_RECENT_ERROR = _static(
+    lambda: xml_warning(
+        tool="learn",
+        message="Kein kuerzlicher Fehler gefunden",
+        data={
+            "hint": "Bitte file_pattern und error_type angeben",
+            "required_params": ["file_pattern", "error_type"]
+        }
+    ),
+    "⚠ Kein kürzlicher Fehler gefunden. Bitte file_pattern und error_type angeben."
+)
+_RESP_DB_NO_CREDENTIALS = _static(
+    lambda: xml_error(
+        tool="db_connect",
+        message="Keine Credentials. user + database angeben.",
+        data={"hint": "Gib user, password, database an. Nach Erfolg werden sie gespeichert."}
+    ),
+    "⚠ Keine Credentials. user + database angeben."
+)
+_RESP_DB_USER_REQUIRED = _static(
+    lambda: xml_error(
+        tool="db_connect",
+        message="user und database sind erforderlich",
+        data={"required_params": ["user", "database"]}
+    ),
+    "⚠ user und database sind erforderlich"
+)
+_RESP_DB_SCHEMA_NOT_CONNECTED = _static(
+    lambda: xml_blocked(
+        tool="db_schema",
+        message="Keine DB verbunden",
+        blocker_type="db_not_connected",
+        blocker_data={"action": "chainguard_db_connect(...)"}
+    ),
+    "✗ Keine DB verbunden. Zuerst: chainguard_db_connect(...)"
+)
+_RESP_DB_SCHEMA_LOAD_FAILED = _static(
+    lambda: xml_error(
+        tool="db_schema",
+        message="Schema konnte nicht geladen werden"
+    ),
+    "✗ Schema konnte nicht geladen werden"
+)
+_RESP_DB_TABLE_PARAM_REQUIRED = _static(
+    lambda: xml_error(
+        tool="db_table",
+        message="table parameter erforderlich"
+    ),
+    "⚠ table parameter erforderlich"
+)
+_RESP_DB_TABLE_NOT_CONNECTED = _static(
+    lambda: xml_blocked(
+        tool="db_table",
+        message="Keine DB verbunden",
+        blocker_type="db_not_connected",
+        blocker_data={"action": "chainguard_db_connect(...)"}
+    ),
+    "✗ Keine DB verbunden. Zuerst: chainguard_db_connect(...)"
+)
+_RESP_DB_DISCONNECTED = _static(
+    lambda: xml_success(
+        tool="db_disconnect",
+        message="Datenbankverbindung getrennt",
+        data={"disconnected": True, "cache_cleared": True}
+    ),
+    "✓ Datenbankverbindung getrennt, Cache gelöscht"
+)
+_RESP_DB_FORGET_NONE = _static(
+    lambda: xml_info(
+        tool="db_forget",
+        message="Keine gespeicherten Credentials gefunden",
+        data={"deleted": False}
+    ),
+    "ℹ Keine gespeicherten Credentials für dieses Projekt"
+)
+_RESP_HEALTH_NOTHING_TO_CHECK = _static(
+    lambda: xml_warning(
+        tool="health_check",
+        message="No endpoints or services specified"
+    ),
+    "⚠ No endpoints or services specified"
+)
+_RESP_SOURCES_EMPTY = _static(
+    lambda: xml_info(
+        tool="sources",
+        message="No sources tracked yet",
+        data={"hint": "chainguard_add_source(url=\"...\")"}
+    ),
+    "📚 No sources tracked yet.\n\nUse: chainguard_add_source(url=\"...\")"
+)
+_RESP_FACTS_EMPTY = _static(
+    lambda: xml_info(
+        tool="facts",
+        message="No facts indexed yet",
+        data={"hint": "chainguard_index_fact(fact=\"...\")"}
+    ),
+    "🔬 No facts indexed yet.\n\nUse: chainguard_index_fact(fact=\"...\")"
+)
+
+
+# Message-only responses: XML envelope or "<icon> <message>" text, chosen
+# once at import time instead of branching in every handler.
+def _respond_xml(xml_builder: Callable[..., str], tool: str, message: str, icon: str) -> List[TextContent]:
+    return _text(xml_builder(tool=tool, message=message))
+
+
+def _respond_text(xml_builder: Callable[..., str], tool: str, message: str, icon: str) -> List[TextContent]:
+    return _text(f"{icon} {message}")
+
+
+_respond = _respond_xml if XML_RESPONSES_ENABLED else _respond_text
+
+
 # =============================================================================
 # CORE HANDLERS
 # =============================================================================
@@ -564,6 +774,7 @@ async def handle_track(args: Dict[str, Any]) -> List[TextContent]:
                 # Collect known symbols from project (cached per language)
                 lang = detect_language(str(full_path))
                 if lang:
+                    await _refresh_file_symbols(state.project_path, full_path, lang)
                     known_symbols = await _get_project_symbols(state.project_path, lang)
 
                     # Validate
@@ -1582,13 +1793,7 @@ async def handle_analyze(args: Dict[str, Any]) -> List[TextContent]:
     target = args.get("target", "")
 
     if not target:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_warning(
-                tool="analyze",
-                message="target parameter required"
-            ))
-        return _text("❌ target parameter required")
+        return _respond(xml_warning, "analyze", "target parameter required", "❌")
 
     result = await CodeAnalyzer.analyze_file(target, state.project_path)
     state.add_action(f"ANALYZE: {Path(target).name}")
@@ -1905,17 +2110,7 @@ async def handle_test_config(args: Dict[str, Any]) -> List[TextContent]:
 
             return _text(f"Test Config:\n  Command: {cfg.get('command', '-')}\n  Args: {cfg.get('args', '-')}\n  Timeout: {cfg.get('timeout', 300)}s")
 
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_info(
-                tool="test_config",
-                message="Kein Test-Command konfiguriert",
-                data={
-                    "example": "chainguard_test_config(command=\"./vendor/bin/phpunit\", args=\"tests/\")"
-                }
-            ))
-
-        return _text("Kein Test-Command konfiguriert.\n\nBeispiel:\nchainguard_test_config(\n  command=\"./vendor/bin/phpunit\",\n  args=\"tests/\"\n)")
+        return _text(_RESP_TEST_CONFIG_EMPTY)
 
     # Save config
     state.test_config = {
@@ -1949,14 +2144,7 @@ async def handle_run_tests(args: Dict[str, Any]) -> List[TextContent]:
 
     # Check for config
     if not state.test_config or not state.test_config.get("command"):
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_blocked(
-                tool="run_tests",
-                message="Kein Test-Command konfiguriert",
-                blocker_type="test_config_required",
-                blocker_data={"action": "chainguard_test_config(command=\"...\")"}
-            ))
-        return _text("✗ Kein Test-Command konfiguriert.\n\nZuerst: chainguard_test_config(command=\"...\")")
+        return _text(_RESP_RUN_TESTS_NO_CONFIG)
 
     # Build config
     config = TestConfig.from_dict(state.test_config)
@@ -1999,17 +2187,13 @@ async def handle_run_tests(args: Dict[str, Any]) -> List[TextContent]:
             data["errors"] = result.error_lines[:5]
 
         if result.success:
-            return _text(xml_success(
-                tool="run_tests",
-                message=f"Tests bestanden: {result.passed}/{result.total}",
-                data=data
-            ))
+            envelope = xml_success
+            message = f"Tests bestanden: {result.passed}/{result.total}"
         else:
-            return _text(xml_error(
-                tool="run_tests",
-                message=f"Tests fehlgeschlagen: {result.failed}/{result.total}",
-                data=data
-            ))
+            envelope = xml_error
+            message = f"Tests fehlgeschlagen: {result.failed}/{result.total}"
+
+        return _text(envelope(tool="run_tests", message=message, data=data))
 
     # Legacy response
     return _text(TestRunner.format_result(result))
@@ -2022,13 +2206,7 @@ async def handle_test_status(args: Dict[str, Any]) -> List[TextContent]:
     state = await pm.get_async(working_dir)
 
     if not state.test_results:
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_info(
-                tool="test_status",
-                message="Keine Tests ausgeführt",
-                data={"hint": "chainguard_run_tests()"}
-            ))
-        return _text("Keine Tests ausgeführt.\n\nNutze: chainguard_run_tests()")
+        return _text(_RESP_TEST_STATUS_NONE)
 
     result = TestResult.from_dict(state.test_results)
 
@@ -2084,14 +2262,7 @@ async def handle_recall(args: Dict[str, Any]) -> List[TextContent]:
     limit = args.get("limit", 5)
 
     if not query:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_warning(
-                tool="recall",
-                message="Query required",
-                data={"example": 'chainguard_recall(query="php syntax Controller")'}
-            ))
-        return _text("⚠ Query required. Example: chainguard_recall(query=\"php syntax Controller\")")
+        return _text(_RESP_RECALL_NO_QUERY)
 
     # Search error index
     results = await HistoryManager.recall(
@@ -2152,8 +2323,8 @@ async def handle_recall(args: Dict[str, Any]) -> List[TextContent]:
             lines.append(f"   Scope: {entry.scope_desc[:40]}")
         lines.append("")
 
-    state.add_action(f"RECALL: {query[:20]}")
-    await pm.save_async(state)
+    if state.add_action_sampled(f"RECALL: {query[:20]}"):
+        await pm.save_async(state)
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
@@ -2166,6 +2337,42 @@ async def handle_recall(args: Dict[str, Any]) -> List[TextContent]:
     return _text("\n".join(lines))
 
 
+def _render_history_toon(entries_data: List[Dict[str, Any]], count: int, scope_only: bool) -> str:
+    """TOON format (30-60% token savings on arrays)."""
+    return toon_history(entries_data)
+
+
+def _render_history_xml(entries_data: List[Dict[str, Any]], count: int, scope_only: bool) -> str:
+    """XML format (disabled by default)."""
+    return xml_info(
+        tool="history",
+        message=f"{count} Eintraege" + (" (aktueller Scope)" if scope_only else ""),
+        data={
+            "count": count,
+            "scope_only": scope_only,
+            "entries": entries_data
+        }
+    )
+
+
+def _render_history_legacy(entries_data: List[Dict[str, Any]], count: int, scope_only: bool) -> str:
+    """Legacy plain-text format."""
+    lines = [f"📜 {count} Einträge" + (" (aktueller Scope)" if scope_only else ""), ""]
+    for e in entries_data:
+        lines.append(f"{e['time']} {e['action']:6} {e['file']:20} {'✓' if e['status'] == 'ok' else '✗'}")
+    return "\n".join(lines)
+
+
+# Output flags are fixed at import time - pick the history renderer once
+# instead of re-checking TOON_ENABLED / XML_RESPONSES_ENABLED per call.
+if TOON_ENABLED:
+    _render_history = _render_history_toon
+elif XML_RESPONSES_ENABLED:
+    _render_history = _render_history_xml
+else:
+    _render_history = _render_history_legacy
+
+
 @handler.register("chainguard_history")
 async def handle_history(args: Dict[str, Any]) -> List[TextContent]:
     """View recent change history for the current project."""
@@ -2191,7 +2398,7 @@ async def handle_history(args: Dict[str, Any]) -> List[TextContent]:
     entries_data = []
     for entry in entries[:limit]:
         ts_short = entry.ts[11:16] if len(entry.ts) > 16 else entry.ts[:5]
-        file_short = Path(entry.file).name if entry.file else "?"
+        file_short = _basename(entry.file) if entry.file else "?"
         status = "ok" if entry.validation == "PASS" else "err"
         entries_data.append({
             "time": ts_short,
@@ -2200,27 +2407,7 @@ async def handle_history(args: Dict[str, Any]) -> List[TextContent]:
             "status": status
         })
 
-    # v6.0: TOON Response (30-60% token savings on arrays)
-    if TOON_ENABLED:
-        return _text(toon_history(entries_data))
-
-    # v6.0: XML Response (disabled by default)
-    if XML_RESPONSES_ENABLED:
-        return _text(xml_info(
-            tool="history",
-            message=f"{len(entries)} Eintraege" + (" (aktueller Scope)" if scope_only else ""),
-            data={
-                "count": len(entries),
-                "scope_only": scope_only,
-                "entries": entries_data
-            }
-        ))
-
-    # Legacy
-    lines = [f"📜 {len(entries)} Einträge" + (" (aktueller Scope)" if scope_only else ""), ""]
-    for e in entries_data:
-        lines.append(f"{e['time']} {e['action']:6} {e['file']:20} {'✓' if e['status'] == 'ok' else '✗'}")
-    return _text("\n".join(lines))
+    return _text(_render_history(entries_data, len(entries), scope_only))
 
 
 @handler.register("chainguard_learn")
@@ -2233,14 +2420,7 @@ async def handle_learn(args: Dict[str, Any]) -> List[TextContent]:
     error_type = args.get("error_type", "")
 
     if not resolution:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_warning(
-                tool="learn",
-                message="resolution required",
-                data={"example": 'chainguard_learn(resolution="Missing semicolon before }")'}
-            ))
-        return _text("⚠ resolution required. Example: chainguard_learn(resolution=\"Missing semicolon before }\")")
+        return _text(_RESP_LEARN_NO_RESOLUTION)
 
     # If no specific pattern given, try to find the most recent error
     if not file_pattern or not error_type:
@@ -2254,20 +2434,10 @@ async def handle_learn(args: Dict[str, Any]) -> List[TextContent]:
                 file = err.get("file", "")
                 if file:
                     # HistoryManager is already imported at module level
-                    file_pattern = file_pattern or HistoryManager._extract_pattern(Path(file).name)
+                    file_pattern = file_pattern or HistoryManager._extract_pattern(_basename(file))
 
     if not file_pattern or not error_type:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_warning(
-                tool="learn",
-                message="Kein kuerzlicher Fehler gefunden",
-                data={
-                    "hint": "Bitte file_pattern und error_type angeben",
-                    "required_params": ["file_pattern", "error_type"]
-                }
-            ))
-        return _text("⚠ Kein kürzlicher Fehler gefunden. Bitte file_pattern und error_type angeben.")
+        return _text(_RESP_LEARN_NO_RECENT_ERROR)
 
     # Update the error index with the resolution
     success = await HistoryManager.update_resolution(
@@ -2340,13 +2510,7 @@ async def handle_db_connect(args: Dict[str, Any]) -> List[TextContent]:
             config = saved
             used_saved = True
         else:
-            if XML_RESPONSES_ENABLED:
-                return _text(xml_error(
-                    tool="db_connect",
-                    message="Keine Credentials. user + database angeben.",
-                    data={"hint": "Gib user, password, database an. Nach Erfolg werden sie gespeichert."}
-                ))
-            return _text("⚠ Keine Credentials. user + database angeben.")
+            return _text(_RESP_DB_NO_CREDENTIALS)
     else:
         # Use provided credentials
         config = DBConfig(
@@ -2359,13 +2523,7 @@ async def handle_db_connect(args: Dict[str, Any]) -> List[TextContent]:
         )
 
         if not config.user or not config.database:
-            if XML_RESPONSES_ENABLED:
-                return _text(xml_error(
-                    tool="db_connect",
-                    message="user und database sind erforderlich",
-                    data={"required_params": ["user", "database"]}
-                ))
-            return _text("⚠ user und database sind erforderlich")
+            return _text(_RESP_DB_USER_REQUIRED)
 
     inspector = get_inspector(state.project_id)
     result = await inspector.connect(config)
@@ -2448,24 +2606,12 @@ async def handle_db_schema(args: Dict[str, Any]) -> List[TextContent]:
     inspector = get_inspector(state.project_id)
 
     if not inspector.is_connected():
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_blocked(
-                tool="db_schema",
-                message="Keine DB verbunden",
-                blocker_type="db_not_connected",
-                blocker_data={"action": "chainguard_db_connect(...)"}
-            ))
-        return _text("✗ Keine DB verbunden. Zuerst: chainguard_db_connect(...)")
+        return _text(_RESP_DB_SCHEMA_NOT_CONNECTED)
 
     schema = await inspector.get_schema(force_refresh=refresh)
 
     if not schema:
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="db_schema",
-                message="Schema konnte nicht geladen werden"
-            ))
-        return _text("✗ Schema konnte nicht geladen werden")
+        return _text(_RESP_DB_SCHEMA_LOAD_FAILED)
 
     # v4.18: Mark schema as checked with timestamp (enables TTL-based validation)
     state.set_schema_checked()
@@ -2497,24 +2643,12 @@ async def handle_db_table(args: Dict[str, Any]) -> List[TextContent]:
     sample = args.get("sample", False)
 
     if not table:
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="db_table",
-                message="table parameter erforderlich"
-            ))
-        return _text("⚠ table parameter erforderlich")
+        return _text(_RESP_DB_TABLE_PARAM_REQUIRED)
 
     inspector = get_inspector(state.project_id)
 
     if not inspector.is_connected():
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_blocked(
-                tool="db_table",
-                message="Keine DB verbunden",
-                blocker_type="db_not_connected",
-                blocker_data={"action": "chainguard_db_connect(...)"}
-            ))
-        return _text("✗ Keine DB verbunden. Zuerst: chainguard_db_connect(...)")
+        return _text(_RESP_DB_TABLE_NOT_CONNECTED)
 
     details = await inspector.get_table_details(table, show_sample=sample)
 
@@ -2527,8 +2661,8 @@ async def handle_db_table(args: Dict[str, Any]) -> List[TextContent]:
             ))
         return _text(f"✗ Tabelle '{table}' nicht gefunden")
 
-    state.add_action(f"TABLE: {table}")
-    await pm.save_async(state)
+    if state.add_action_sampled(f"TABLE: {table}"):
+        await pm.save_async(state)
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
@@ -2556,15 +2690,7 @@ async def handle_db_disconnect(args: Dict[str, Any]) -> List[TextContent]:
     state.add_action("DB: disconnected")
     await pm.save_async(state)
 
-    # v6.0: XML Response
-    if XML_RESPONSES_ENABLED:
-        return _text(xml_success(
-            tool="db_disconnect",
-            message="Datenbankverbindung getrennt",
-            data={"disconnected": True, "cache_cleared": True}
-        ))
-
-    return _text("✓ Datenbankverbindung getrennt, Cache gelöscht")
+    return _text(_RESP_DB_DISCONNECTED)
 
 
 @handler.register("chainguard_db_forget")
@@ -2589,24 +2715,70 @@ async def handle_db_forget(args: Dict[str, Any]) -> List[TextContent]:
 
         return _text(f"✓ DB-Credentials gelöscht ({db_name})")
     else:
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_info(
-                tool="db_forget",
-                message="Keine gespeicherten Credentials gefunden",
-                data={"deleted": False}
-            ))
-
-        return _text("ℹ Keine gespeicherten Credentials für dieses Projekt")
+        return _text(_RESP_DB_FORGET_NONE)
 
 
 # =============================================================================
 # MODE-SPECIFIC HANDLERS (v5.0)
 # =============================================================================
 
+# Icon maps shared by the content/research handlers
+_CHAPTER_STATUS_ICONS = {"done": "✓", "review": "👁", "draft": "✏"}
+_RELEVANCE_ICONS = {"high": "⭐", "medium": "📄", "low": "📎"}
+_CONFIDENCE_ICONS = {"verified": "✓", "likely": "○", "uncertain": "?"}
+
 # -----------------------------------------------------------------------------
 # CONTENT MODE HANDLERS
 # -----------------------------------------------------------------------------
 
+# Word count cache: (path, mtime_ns, size) -> words. Unchanged files are not re-read.
+WORD_COUNT_CACHE_SIZE = 64
+WORD_COUNT_READ_TIMEOUT = 10  # seconds
+WORD_COUNT_CHUNK_SIZE = 64 * 1024
+_word_count_cache: LRUCache = LRUCache(maxsize=WORD_COUNT_CACHE_SIZE)
+
+
+def _count_chunk_words(chunk: str, in_word: bool) -> Tuple[int, bool]:
+    """
+    Count whitespace-separated words in one chunk of a larger text.
+
+    in_word tells whether the previous chunk ended inside a word, so a word
+    split across the chunk boundary is only counted once.
+    Returns (word_count, ends_in_word).
+    """
+    if not chunk:
+        return 0, in_word
+    words = len(chunk.split())
+    if in_word and words and not chunk[0].isspace():
+        words -= 1
+    return words, not chunk[-1].isspace()
+
+
+async def _count_words_async(file_path: Path) -> int:
+    """
+    Count words in a file chunk by chunk (same result as len(text.split())).
+
+    Streams the file so memory stays at one chunk instead of the whole text
+    plus a list of all tokens. Non-blocking via aiofiles (sync fallback).
+    """
+    total = 0
+    in_word = False
+    if HAS_AIOFILES:
+        async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                chunk = await f.read(WORD_COUNT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                words, in_word = _count_chunk_words(chunk, in_word)
+                total += words
+    else:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for chunk in iter(lambda: f.read(WORD_COUNT_CHUNK_SIZE), ''):
+                words, in_word = _count_chunk_words(chunk, in_word)
+                total += words
+    return total
+
+
 @handler.register("chainguard_word_count")
 async def handle_word_count(args: Dict[str, Any]) -> List[TextContent]:
     """Get word count statistics (CONTENT mode)."""
@@ -2617,39 +2789,37 @@ async def handle_word_count(args: Dict[str, Any]) -> List[TextContent]:
     if file:
         # Count words in specific file
         try:
-            file_path = Path(state.project_path) / file if not Path(file).is_absolute() else Path(file)
-            if file_path.exists():
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                word_count = len(content.split())
-                # v6.0: XML Response
-                if XML_RESPONSES_ENABLED:
-                    return _text(xml_info(
-                        tool="word_count",
-                        message=f"{file}: {word_count} words",
-                        data={"file": file, "words": word_count}
-                    ))
-                return _text(f"📝 {file}: {word_count} words")
+            file_path = _project_file(state.project_path, file)
+            # One stat() serves both the existence check and the cache key
+            try:
+                st = file_path.stat()
+            except FileNotFoundError:
+                return _respond(xml_warning, "word_count", f"File not found: {file}", "⚠")
+
+            cache_key = (str(file_path), st.st_mtime_ns, st.st_size)
+            if cache_key in _word_count_cache:
+                word_count = _word_count_cache[cache_key]
             else:
-                # v6.0: XML Response
-                if XML_RESPONSES_ENABLED:
-                    return _text(xml_warning(
-                        tool="word_count",
-                        message=f"File not found: {file}"
-                    ))
-                return _text(f"⚠ File not found: {file}")
-        except Exception as e:
+                word_count = await asyncio.wait_for(
+                    _count_words_async(file_path), timeout=WORD_COUNT_READ_TIMEOUT
+                )
+                _word_count_cache[cache_key] = word_count
             # v6.0: XML Response
             if XML_RESPONSES_ENABLED:
-                return _text(xml_error(
+                return _text(xml_info(
                     tool="word_count",
-                    message=f"Error reading file: {str(e)[:50]}"
+                    message=f"{file}: {word_count} words",
+                    data={"file": file, "words": word_count}
                 ))
-            return _text(f"⚠ Error reading file: {str(e)[:50]}")
+            return _text(f"📝 {file}: {word_count} words")
+        except Exception as e:
+            return _respond(xml_error, "word_count", f"Error reading file: {str(e)[:50]}", "⚠")
 
     # Show overall statistics
-    chapters_done = sum(1 for s in state.chapter_status.values() if s == "done")
-    chapters_draft = sum(1 for s in state.chapter_status.values() if s == "draft")
-    chapters_review = sum(1 for s in state.chapter_status.values() if s == "review")
+    status_counts = Counter(state.chapter_status.values())
+    chapters_done = status_counts["done"]
+    chapters_draft = status_counts["draft"]
+    chapters_review = status_counts["review"]
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
@@ -2667,15 +2837,15 @@ async def handle_word_count(args: Dict[str, Any]) -> List[TextContent]:
             }
         ))
 
-    lines = ["📊 **Word Count Statistics**", ""]
-    lines.append(f"Total: **{state.word_count_total}** words")
-    lines.append("")
+    lines = ["📊 **Word Count Statistics**", "", f"Total: **{state.word_count_total}** words", ""]
 
     if state.chapter_status:
         lines.append("**Chapters:**")
-        for chapter, status in state.chapter_status.items():
-            icon = {"done": "✓", "review": "👁", "draft": "✏"}.get(status, "?")
-            lines.append(f"  {icon} {chapter}: {status}")
+        icon_for = _CHAPTER_STATUS_ICONS.get
+        lines.extend(
+            f"  {icon_for(status, '?')} {chapter}: {status}"
+            for chapter, status in state.chapter_status.items()
+        )
         lines.append("")
         lines.append(f"Progress: {chapters_done} done, {chapters_review} review, {chapters_draft} draft")
 
@@ -2712,7 +2882,7 @@ async def handle_track_chapter(args: Dict[str, Any]) -> List[TextContent]:
             }
         ))
 
-    icon = {"done": "✓", "review": "👁", "draft": "✏"}.get(status, "?")
+    icon = _CHAPTER_STATUS_ICONS.get(status, "?")
     result = f"{icon} Chapter '{chapter}': {status}"
     if word_count:
         result += f" ({word_count} words)"
@@ -2773,14 +2943,69 @@ async def handle_checkpoint(args: Dict[str, Any]) -> List[TextContent]:
             }
         ))
 
-    lines = [f"💾 Checkpoint created: **{name}**"]
+    result = f"💾 Checkpoint created: **{name}**"
     if files:
-        lines.append(f"   Files: {', '.join(files[:5])}")
+        result += f"\n   Files: {', '.join(files[:5])}"
         if len(files) > 5:
-            lines.append(f"   +{len(files) - 5} more")
-    lines.append(f"   Total checkpoints: {len(state.checkpoints)}")
+            result += f"\n   +{len(files) - 5} more"
+    result += f"\n   Total checkpoints: {len(state.checkpoints)}"
 
-    return _text("\n".join(lines))
+    return _text(result)
+
+
+# Health check memo: repeated checks of the same targets within a few seconds
+# reuse the last all-healthy results instead of re-probing endpoints and services.
+HEALTH_CACHE_TTL_SECONDS = 5
+_health_cache: TTLLRUCache = TTLLRUCache(maxsize=32, ttl_seconds=HEALTH_CACHE_TTL_SECONDS)
+
+
+async def _systemctl_is_active(units: List[str]) -> Optional[str]:
+    """
+    Run `systemctl is-active` for units and return its stdout.
+
+    Returns None if systemctl could not run or timed out; a timed-out child
+    is killed and reaped.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "systemctl", "is-active", *units,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except Exception:
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+    except Exception:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await proc.wait()
+        return None
+    return stdout.decode()
+
+
+async def _systemctl_statuses(services: List[str]) -> List[Any]:
+    """
+    Query all services with one `systemctl is-active` call.
+
+    systemctl prints one line per unit in argument order. If the line count
+    does not match (e.g. an invalid unit name), the services are queried one
+    by one so each still gets its own result. Returns a status string per
+    service, or None where the query failed.
+    """
+    output = await _systemctl_is_active(services)
+    if output is None:
+        return [None] * len(services)
+    statuses = output.splitlines()
+    if len(statuses) == len(services):
+        return [status.strip() for status in statuses]
+    if len(services) == 1:
+        return [output.strip()]
+    outputs = await asyncio.gather(*(_systemctl_is_active([service]) for service in services))
+    return [None if out is None else out.strip() for out in outputs]
 
 
 @handler.register("chainguard_health_check")
@@ -2793,53 +3018,69 @@ async def handle_health_check(args: Dict[str, Any]) -> List[TextContent]:
 
     results = []
     results_data = []
+    checked_endpoints = endpoints[:10]  # Limit to 10
+    checked_services = services[:10]  # Limit to 10
+
+    # Keyed in request order: the cached results are listed in that order
+    cache_key = (state.project_id, tuple(checked_endpoints), tuple(checked_services))
+    cached = _health_cache.get(cache_key)
+    if cached is not None:
+        results, results_data = cached
+        state.add_action(f"HEALTH: {len(endpoints)}e/{len(services)}s")
+        await pm.save_async(state)
+        return _render_health(results, results_data)
+
+    # Probe all endpoints and the systemd services concurrently
+    probes = [
+        http_session_manager.test_endpoint(url=url, method="GET", project_id=state.project_id)
+        for url in checked_endpoints
+    ]
+    if checked_services:
+        probes.append(_systemctl_statuses(checked_services))
+    outcomes = await asyncio.gather(*probes, return_exceptions=True)
 
     # Check endpoints
-    if endpoints:
-        for url in endpoints[:10]:  # Limit to 10
-            try:
-                # Use http_session_manager for endpoint checks
-                result = await http_session_manager.test_endpoint(
-                    url=url, method="GET", project_id=state.project_id
-                )
-                status = "✓" if result["success"] else "✗"
-                code = result.get("status_code", "?")
-                results.append(f"{status} {url}: {code}")
-                results_data.append({"type": "endpoint", "target": url, "status": code, "ok": result["success"]})
-            except Exception as e:
-                results.append(f"✗ {url}: {str(e)[:30]}")
-                results_data.append({"type": "endpoint", "target": url, "status": "error", "ok": False})
+    for url, result in zip(checked_endpoints, outcomes):
+        if isinstance(result, BaseException):
+            results.append(f"✗ {url}: {str(result)[:30]}")
+            results_data.append({"type": "endpoint", "target": url, "status": "error", "ok": False})
+            continue
+        # Only a real 2xx status counts as healthy
+        code = result.get("status_code", "?")
+        ok = isinstance(code, int) and 200 <= code < 300
+        status = "✓" if ok else "✗"
+        results.append(f"{status} {url}: {code}")
+        results_data.append({"type": "endpoint", "target": url, "status": code, "ok": ok})
 
     # Check services (Linux systemd)
-    if services:
-        import asyncio
-        for service in services[:10]:  # Limit to 10
-            try:
-                proc = await asyncio.create_subprocess_exec(
-                    "systemctl", "is-active", service,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
-                status_str = stdout.decode().strip()
-                icon = "✓" if status_str == "active" else "✗"
-                results.append(f"{icon} {service}: {status_str}")
-                results_data.append({"type": "service", "target": service, "status": status_str, "ok": status_str == "active"})
-            except Exception:
+    if checked_services:
+        statuses = outcomes[-1]
+        if isinstance(statuses, BaseException):
+            statuses = [None] * len(checked_services)
+        for service, status_str in zip(checked_services, statuses):
+            if status_str is None:
                 results.append(f"? {service}: unknown")
                 results_data.append({"type": "service", "target": service, "status": "unknown", "ok": False})
+                continue
+            icon = "✓" if status_str == "active" else "✗"
+            results.append(f"{icon} {service}: {status_str}")
+            results_data.append({"type": "service", "target": service, "status": status_str, "ok": status_str == "active"})
+
+    # Only all-healthy results are reused: a target that is down is probed
+    # again on the next call, so a recovery shows up immediately
+    if results and all(item["ok"] for item in results_data):
+        _health_cache.set(cache_key, (results, results_data))
 
     state.add_action(f"HEALTH: {len(endpoints)}e/{len(services)}s")
     await pm.save_async(state)
 
+    return _render_health(results, results_data)
+
+
+def _render_health(results: List[str], results_data: List[Dict[str, Any]]) -> List[TextContent]:
+    """Format health check results."""
     if not results:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_warning(
-                tool="health_check",
-                message="No endpoints or services specified"
-            ))
-        return _text("⚠ No endpoints or services specified")
+        return _text(_RESP_HEALTH_NOTHING_TO_CHECK)
 
     # Summary
     ok_count = sum(1 for r in results if r.startswith("✓"))
@@ -2867,6 +3108,40 @@ async def handle_health_check(args: Dict[str, Any]) -> List[TextContent]:
 # RESEARCH MODE HANDLERS
 # -----------------------------------------------------------------------------
 
+# Listed sections (bucket, header); the lowest bucket is only counted
+_SOURCE_SECTIONS = (
+    ("high", "⭐ **High Relevance:**"),
+    ("medium", "📄 **Medium Relevance:**"),
+)
+_FACT_SECTIONS = (
+    ("verified", "✓ **Verified:**"),
+    ("likely", "○ **Likely:**"),
+)
+
+
+def _source_label(source: Dict[str, Any]) -> str:
+    return source.get("title") or source.get("url", "")[:40]
+
+
+def _fact_label(fact: Dict[str, Any]) -> str:
+    return fact.get("fact", "")[:60]
+
+
+def _append_sections(
+    lines: List[str],
+    groups: Dict[str, List[Dict[str, Any]]],
+    sections: tuple,
+    label: Callable[[Dict[str, Any]], str]
+) -> None:
+    """Append a header and up to 5 bullets for every non-empty section."""
+    for key, header in sections:
+        bucket = groups[key]
+        if bucket:
+            lines.append(header)
+            lines.extend(f"   • {label(item)}" for item in bucket[:5])
+            lines.append("")
+
+
 @handler.register("chainguard_add_source")
 async def handle_add_source(args: Dict[str, Any]) -> List[TextContent]:
     """Track research source (RESEARCH mode)."""
@@ -2880,7 +3155,7 @@ async def handle_add_source(args: Dict[str, Any]) -> List[TextContent]:
     state.add_action(f"SOURCE: {title[:20] or url[:20]}")
     await pm.save_async(state)
 
-    icon = {"high": "⭐", "medium": "📄", "low": "📎"}.get(relevance, "📄")
+    icon = _RELEVANCE_ICONS.get(relevance, "📄")
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
@@ -2911,7 +3186,7 @@ async def handle_index_fact(args: Dict[str, Any]) -> List[TextContent]:
     state.add_action(f"FACT: {fact[:20]}")
     await pm.save_async(state)
 
-    icon = {"verified": "✓", "likely": "○", "uncertain": "?"}.get(confidence, "○")
+    icon = _CONFIDENCE_ICONS.get(confidence, "○")
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
@@ -2940,28 +3215,18 @@ async def handle_sources(args: Dict[str, Any]) -> List[TextContent]:
     state = await pm.get_async(working_dir)
 
     if not state.sources:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_info(
-                tool="sources",
-                message="No sources tracked yet",
-                data={"hint": "chainguard_add_source(url=\"...\")"}
-            ))
-        return _text("📚 No sources tracked yet.\n\nUse: chainguard_add_source(url=\"...\")")
+        return _text(_RESP_SOURCES_EMPTY)
 
     # Group by relevance
-    high = [s for s in state.sources if s.get("relevance") == "high"]
-    medium = [s for s in state.sources if s.get("relevance") == "medium"]
-    low = [s for s in state.sources if s.get("relevance") == "low"]
+    groups = state.sources_by_relevance()
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
         sources_data = {
             "total": len(state.sources),
             "by_relevance": {
-                "high": [{"url": s.get("url"), "title": s.get("title")} for s in high],
-                "medium": [{"url": s.get("url"), "title": s.get("title")} for s in medium],
-                "low": [{"url": s.get("url"), "title": s.get("title")} for s in low]
+                relevance: [{"url": s.get("url"), "title": s.get("title")} for s in bucket]
+                for relevance, bucket in groups.items()
             }
         }
         return _text(xml_info(
@@ -2971,23 +3236,10 @@ async def handle_sources(args: Dict[str, Any]) -> List[TextContent]:
         ))
 
     lines = [f"📚 **{len(state.sources)} Sources**", ""]
+    _append_sections(lines, groups, _SOURCE_SECTIONS, _source_label)
 
-    if high:
-        lines.append("⭐ **High Relevance:**")
-        for s in high[:5]:
-            title = s.get("title") or s.get("url", "")[:40]
-            lines.append(f"   • {title}")
-        lines.append("")
-
-    if medium:
-        lines.append("📄 **Medium Relevance:**")
-        for s in medium[:5]:
-            title = s.get("title") or s.get("url", "")[:40]
-            lines.append(f"   • {title}")
-        lines.append("")
-
-    if low:
-        lines.append(f"📎 Low Relevance: {len(low)} sources")
+    if groups["low"]:
+        lines.append(f"📎 Low Relevance: {len(groups['low'])} sources")
 
     return _text("\n".join(lines))
 
@@ -2999,28 +3251,18 @@ async def handle_facts(args: Dict[str, Any]) -> List[TextContent]:
     state = await pm.get_async(working_dir)
 
     if not state.facts:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_info(
-                tool="facts",
-                message="No facts indexed yet",
-                data={"hint": "chainguard_index_fact(fact=\"...\")"}
-            ))
-        return _text("🔬 No facts indexed yet.\n\nUse: chainguard_index_fact(fact=\"...\")")
+        return _text(_RESP_FACTS_EMPTY)
 
     # Group by confidence
-    verified = [f for f in state.facts if f.get("confidence") == "verified"]
-    likely = [f for f in state.facts if f.get("confidence") == "likely"]
-    uncertain = [f for f in state.facts if f.get("confidence") == "uncertain"]
+    groups = state.facts_by_confidence()
 
     # v6.0: XML Response
     if XML_RESPONSES_ENABLED:
         facts_data = {
             "total": len(state.facts),
             "by_confidence": {
-                "verified": [{"fact": f.get("fact"), "source": f.get("source")} for f in verified],
-                "likely": [{"fact": f.get("fact"), "source": f.get("source")} for f in likely],
-                "uncertain": [{"fact": f.get("fact"), "source": f.get("source")} for f in uncertain]
+                confidence: [{"fact": f.get("fact"), "source": f.get("source")} for f in bucket]
+                for confidence, bucket in groups.items()
             }
         }
         return _text(xml_info(
@@ -3030,21 +3272,10 @@ async def handle_facts(args: Dict[str, Any]) -> List[TextContent]:
         ))
 
     lines = [f"🔬 **{len(state.facts)} Facts**", ""]
+    _append_sections(lines, groups, _FACT_SECTIONS, _fact_label)
 
-    if verified:
-        lines.append("✓ **Verified:**")
-        for f in verified[:5]:
-            lines.append(f"   • {f.get('fact', '')[:60]}")
-        lines.append("")
-
-    if likely:
-        lines.append("○ **Likely:**")
-        for f in likely[:5]:
-            lines.append(f"   • {f.get('fact', '')[:60]}")
-        lines.append("")
-
-    if uncertain:
-        lines.append(f"? Uncertain: {len(uncertain)} facts")
+    if groups["uncertain"]:
+        lines.append(f"? Uncertain: {len(groups['uncertain'])} facts")
 
     return _text("\n".join(lines))
 
@@ -3053,142 +3284,424 @@ async def handle_facts(args: Dict[str, Any]) -> List[TextContent]:
 # MEMORY HANDLERS (v5.1 - Long-Term Memory)
 # =============================================================================
 
-@handler.register("chainguard_memory_init")
-async def handle_memory_init(args: Dict[str, Any]) -> List[TextContent]:
-    """Initialize project memory with full code indexing."""
-    if not MEMORY_AVAILABLE:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="memory_init",
-                message="Memory not available",
-                data={"install": "pip install chromadb sentence-transformers"}
-            ))
-        return _text("✗ Memory not available. Install: pip install chromadb sentence-transformers")
+def _compile_glob(pattern: str) -> "re.Pattern":
+    """
+    Compile a Path.glob-style pattern for matching relative POSIX paths.
 
-    working_dir = args.get("working_dir")
-    state = await pm.get_async(working_dir)
-    include_patterns = args.get("include_patterns", ["**/*.py", "**/*.php", "**/*.js", "**/*.ts", "**/*.tsx"])
-    exclude_patterns = args.get("exclude_patterns", ["node_modules", "vendor", ".git", "__pycache__", "*.min.js"])
-    force = args.get("force", False)
+    '**/' matches zero or more directories, '*' and '?' never cross '/'.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
 
-    project_id = get_project_id(state.project_path)
 
-    # Check if memory already exists
-    if await memory_manager.memory_exists(project_id) and not force:
+def _iter_project_files(
+    project_path: Path,
+    include_patterns: List[str],
+    exclude_patterns: List[str],
+    errors: List[str]
+):
+    """
+    Walk the project once and yield files matching any include pattern.
+
+    Plain exclude patterns are substrings of the project-relative path;
+    directories containing one are pruned without being descended into.
+    Glob-style excludes ('*.min.js') are matched against the file name.
+    """
+    exclude_subs = [p for p in exclude_patterns if not any(c in p for c in "*?[")]
+    matches = _project_path_filter(include_patterns, exclude_patterns)
+    root_str = str(project_path)
+
+    def _on_error(err: OSError):
+        errors.append(f"Walk {_basename(str(err.filename))}: {str(err)[:30]}")
+
+    for root, dirs, files in os.walk(root_str, onerror=_on_error):
+        rel_root = os.path.relpath(root, root_str).replace(os.sep, "/")
+        prefix = "" if rel_root == "." else rel_root + "/"
+        dirs[:] = [d for d in dirs if not any(excl in prefix + d for excl in exclude_subs)]
+        for name in files:
+            if matches(prefix + name):
+                yield Path(root, name)
+
+
+def _project_path_filter(include_patterns: List[str], exclude_patterns: List[str]):
+    """
+    Predicate on '/'-separated project-relative paths: would _iter_project_files yield it?
+
+    A path inside a pruned directory also contains that exclude substring,
+    so checking the full path matches the pruned walk.
+    """
+    include_res = [_compile_glob(p) for p in include_patterns]
+    exclude_subs = [p for p in exclude_patterns if not any(c in p for c in "*?[")]
+    exclude_globs = [re.compile(fnmatch.translate(p)) for p in exclude_patterns if any(c in p for c in "*?[")]
+
+    def matches(rel_path: str) -> bool:
+        if any(excl in rel_path for excl in exclude_subs):
+            return False
+        name = rel_path.rpartition("/")[2]
+        if any(r.match(name) for r in exclude_globs):
+            return False
+        return any(r.match(rel_path) for r in include_res)
+
+    return matches
+
+
+# Concurrent file preparation in memory_init (read + summary + AST per file)
+MEMORY_INDEX_CONCURRENCY = (os.cpu_count() or 4) * 2
+
+# Larger files (bundles, generated code) are skipped by memory_init,
+# memory_summarize and the auto-update
+MEMORY_INDEX_MAX_FILE_BYTES = 1_000_000
+
+# Bump when _extract_index_payload output changes (invalidates index_cache)
+INDEX_CACHE_VERSION = "4"
+
+# memory_summarize flushes summaries in batches of this size
+MEMORY_SUMMARY_BATCH_SIZE = 128
+
+# Collections holding per-file documents (keyed by metadata "path")
+MEMORY_FILE_COLLECTIONS = ("code_structure", "functions", "code_summaries")
+
+# Uncached extraction is CPU-bound (holds the GIL): from this many files on,
+# memory_init runs it in worker processes instead of threads
+MEMORY_INDEX_PROCESS_MIN_FILES = 32
+
+_index_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_index_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Worker processes for CPU-bound extraction (memory_init, symbol scan);
+    None on single-core. Capped at INDEX_PROCESS_POOL_MAX_WORKERS, since every
+    worker holds its own copy of the imported modules.
+    """
+    global _index_process_pool
+    workers = min(os.cpu_count() or 1, INDEX_PROCESS_POOL_MAX_WORKERS)
+    if workers < 2:
+        return None
+    if _index_process_pool is None:
+        # spawn: forking a process with running threads (event loop executor) is unsafe
+        _index_process_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _index_process_pool
+
+
+def shutdown_index_process_pool():
+    """Stop the extraction worker processes (called on server shutdown)."""
+    global _index_process_pool
+    if _index_process_pool is not None:
+        _index_process_pool.shutdown(wait=False)
+        _index_process_pool = None
+
+
+def _load_index_file(file_path: Path) -> Optional[tuple]:
+    """
+    Read one file for memory_init and look up its cached extraction
+    (runs in a worker thread).
+
+    Returns (content, cache_key, payload) with payload None on a cache miss,
+    or None for empty, binary or oversized files.
+    """
+    if file_path.stat().st_size > MEMORY_INDEX_MAX_FILE_BYTES:
+        return None
+    raw = file_path.read_bytes()
+    if b"\x00" in raw[:4096]:
+        return None
+    # Invalid bytes become U+FFFD; the cache key hashes the decoded content,
+    # so valid UTF-8 files keep their existing cache entries
+    content = raw.decode('utf-8', errors='replace')
+    if not content.strip():
+        return None
+
+    cache_key = ContentCache.key(INDEX_CACHE_VERSION, str(file_path), content)
+    return content, cache_key, index_cache.get(cache_key)
+
+
+def _function_doc_ids(relative_path: str, functions: List[dict]) -> str:
+    """IDs of a file's function documents, stored on its file document for keyed deletes."""
+    return "\n".join(dict.fromkeys(f"func:{relative_path}:{func['name']}" for func in functions))
+
+
+def _index_documents(file_path: Path, project_path: Path, content: str,
+                     payload: Dict[str, Any], mtime_ns: int) -> List[tuple]:
+    """Turn an extraction payload into (collection, content, metadata, doc_id) tuples."""
+    relative_path = str(file_path.relative_to(project_path))
+    documents = [(
+        "code_structure",
+        payload["summary"],
+        {
+            "type": "file",
+            "path": relative_path,
+            "language": file_path.suffix.lstrip('.'),
+            "lines": _line_count(content),
+            "mtime_ns": mtime_ns,  # incremental memory_init
+            "function_ids": _function_doc_ids(relative_path, payload["functions"]),
+        },
+        f"file:{relative_path}"
+    )]
+
+    documents.extend(
+        ("functions", func["description"], dict(func["metadata"], path=relative_path),
+         f"func:{relative_path}:{func['name']}")
+        for func in payload["functions"]
+    )
+
+    logic = payload["logic_summary"]
+    if logic:
+        documents.append((
+            "code_summaries",
+            logic["text"],
+            {
+                "type": "logic_summary",
+                "path": relative_path,
+                "language": logic["language"],
+                "purpose": logic["purpose"],
+                "class_count": logic["class_count"],
+                "function_count": logic["function_count"],
+                "mtime_ns": mtime_ns,  # memory_summarize skip-check
+                "content_hash": _content_hash(content),
+            },
+            f"summary:{relative_path}"
+        ))
+
+    return documents
+
+
+def _extract_index_payload(file_path: Path, content: str) -> Dict[str, Any]:
+    """
+    Run the expensive per-file extraction for memory_init (JSON-serializable).
+
+    The result only depends on the path and content, so it is cached in
+    index_cache and reused while the file is unchanged.
+    """
+    # Extract functions/classes using AST-Analyzer
+    payload: Dict[str, Any] = {
+        "summary": _create_file_summary(file_path, content),
+        "functions": _extract_functions(content, file_path.suffix.lower(), str(file_path)),
+        "logic_summary": None,
+    }
+
+    # v5.4: Create deep logic summary using CodeSummarizer
+    if SUMMARIZER_AVAILABLE and code_summarizer:
+        try:
+            summary = code_summarizer.summarize_file(file_path, content)
+            summary_text = summary.to_text(max_length=2000)
+
+            if summary_text.strip():
+                payload["logic_summary"] = {
+                    "text": summary_text,
+                    "language": summary.language,
+                    "purpose": summary.purpose[:200] if summary.purpose else "",
+                    "class_count": len(summary.classes),
+                    "function_count": len(summary.functions),
+                }
+        except Exception as sum_err:
+            logger.debug(f"Summary error for {file_path.name}: {sum_err}")
+
+    return payload
+
+
+@handler.register("chainguard_memory_init")
+async def handle_memory_init(args: Dict[str, Any]) -> List[TextContent]:
+    """Initialize project memory with full code indexing."""
+    if not MEMORY_AVAILABLE:
         # v6.0: XML Response
         if XML_RESPONSES_ENABLED:
-            return _text(xml_info(
+            return _text(xml_error(
                 tool="memory_init",
-                message=f"Memory bereits initialisiert fuer {state.project_name}",
-                data={
-                    "project": state.project_name,
-                    "hint": "force=true zum Neuinitialisieren oder memory_query() zum Suchen"
-                }
+                message="Memory not available",
+                data={"install": "pip install chromadb sentence-transformers"}
             ))
-        return _text(
-            f"✓ Memory bereits initialisiert für {state.project_name}\n"
-            "→ Nutze force=true zum Neuinitialisieren\n"
-            "→ Oder chainguard_memory_query() zum Suchen"
-        )
+        return _text("✗ Memory not available. Install: pip install chromadb sentence-transformers")
+
+    working_dir = args.get("working_dir")
+    state = await pm.get_async(working_dir)
+    include_patterns = args.get("include_patterns", ["**/*.py", "**/*.php", "**/*.js", "**/*.ts", "**/*.tsx"])
+    exclude_patterns = args.get("exclude_patterns", ["node_modules", "vendor", ".git", "__pycache__", "*.min.js"])
+    force = args.get("force", False)
+
+    project_id = get_project_id(state.project_path)
+
+    # Existing memory without force: only re-index files changed since the last run
+    memory_existed = await memory_manager.memory_exists(project_id)
+    incremental = memory_existed and not force
 
     memory = await memory_manager.get_memory(project_id, state.project_path)
 
     # Index project files
-    indexed_files = 0
-    indexed_functions = 0
+    unchanged_files = 0
     errors = []
 
+    # Per-file documents of the previous run (collection -> doc_id -> metadata)
+    previous: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    if memory_existed:
+        for collection in MEMORY_FILE_COLLECTIONS:
+            previous[collection] = await memory.get_metadatas(collection)
+    indexed_mtimes = {
+        meta.get("path"): meta.get("mtime_ns")
+        for meta in previous.get("code_structure", {}).values()
+        if meta.get("type") == "file"
+    }
+
     project_path = Path(state.project_path)
+    # Documents are written in batches (one embedding call per batch); re-runs
+    # upsert, so a failed write keeps the previous documents of a file
+    batch = MemoryBatch(memory, upsert=memory_existed)
+
+    # Collect candidate files first (one pruned walk), then process them concurrently
+    # Keyed by real path: each physical file is indexed once, preferring
+    # its own path over a symlink pointing to it
+    unique_files: Dict[str, tuple] = {}
+    for file_path in _iter_project_files(project_path, include_patterns, exclude_patterns, errors):
+        # Skip sensitive files
+        if not should_index_file(str(file_path)):
+            continue
 
-    for pattern in include_patterns:
+        # Skip if not a file (e.g. broken symlink)
         try:
-            for file_path in project_path.glob(pattern):
-                # Skip excluded patterns
-                path_str = str(file_path)
-                if any(excl in path_str for excl in exclude_patterns):
-                    continue
-
-                # Skip sensitive files
-                if not should_index_file(path_str):
-                    continue
-
-                # Skip if not a file
-                if not file_path.is_file():
-                    continue
+            st = file_path.stat()
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
 
+        real_path = os.path.realpath(file_path)
+        known = unique_files.get(real_path)
+        if known is None or (known[0].is_symlink() and not file_path.is_symlink()):
+            unique_files[real_path] = (file_path, st.st_mtime_ns)
+
+    current_paths: Set[str] = set()
+    candidates: List[Path] = []
+    mtimes: Dict[Path, int] = {}
+    for file_path, mtime_ns in unique_files.values():
+        relative_path = str(file_path.relative_to(project_path))
+        current_paths.add(relative_path)
+        if incremental and indexed_mtimes.get(relative_path) == mtime_ns:
+            unchanged_files += 1
+            continue
+        candidates.append(file_path)
+        mtimes[file_path] = mtime_ns
+
+    # Previous document IDs per file path (collection -> IDs)
+    previous_ids: Dict[str, Dict[str, List[str]]] = {}
+    for collection, metas in previous.items():
+        for doc_id, meta in metas.items():
+            previous_ids.setdefault(meta.get("path"), {}).setdefault(collection, []).append(doc_id)
+
+    # Drop documents of deleted files. Indexed files this run did not walk
+    # but that still exist outside the current patterns are kept.
+    matches = _project_path_filter(include_patterns, exclude_patterns)
+    removed_paths = [
+        path for path in set(indexed_mtimes) - current_paths
+        if path and (not os.path.lexists(project_path / path) or matches(path.replace(os.sep, "/")))
+    ]
+    removed_ids: Dict[str, List[str]] = {}
+    for path in removed_paths:
+        for collection, ids in previous_ids[path].items():
+            removed_ids.setdefault(collection, []).extend(ids)
+    for collection, ids in removed_ids.items():
+        await memory.delete(collection, doc_ids=ids)
+    removed_files = len(removed_paths)
+
+    # Read files + look up cached extractions in worker threads (bounded)
+    loop = asyncio.get_event_loop()
+    limit = asyncio.Semaphore(MEMORY_INDEX_CONCURRENCY)
+
+    async def _load(file_path: Path):
+        async with limit:
+            return await loop.run_in_executor(None, _load_index_file, file_path)
+
+    loaded = await asyncio.gather(*(_load(fp) for fp in candidates), return_exceptions=True)
+
+    # Extract uncached files (summary + AST); large batches go to worker processes
+    misses = [i for i, result in enumerate(loaded) if isinstance(result, tuple) and result[2] is None]
+    executor = _get_index_process_pool() if len(misses) >= MEMORY_INDEX_PROCESS_MIN_FILES else None
+
+    async def _extract(file_path: Path, content: str):
+        async with limit:
+            if executor is not None:
                 try:
-                    # Read file content
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    if not content.strip():
-                        continue
-
-                    # Create document for file
-                    relative_path = str(file_path.relative_to(project_path))
-                    file_summary = _create_file_summary(file_path, content)
-
-                    await memory.add(
-                        content=file_summary,
-                        collection="code_structure",
-                        metadata={
-                            "type": "file",
-                            "path": relative_path,
-                            "language": file_path.suffix.lstrip('.'),
-                            "lines": len(content.splitlines()),
-                        },
-                        doc_id=f"file:{relative_path}"
-                    )
-                    indexed_files += 1
-
-                    # Extract functions/classes using AST-Analyzer
-                    functions = _extract_functions(content, file_path.suffix, str(file_path))
-                    for func in functions:
-                        # ChromaDB doesn't accept None values in metadata
-                        await memory.add(
-                            content=func["description"],
-                            collection="functions",
-                            metadata={
-                                "type": func["type"],
-                                "name": func["name"],
-                                "path": relative_path,
-                                "params": ",".join(func.get("params", [])),  # Join list to string
-                                "signature": func.get("signature") or "",
-                                "parent": func.get("parent") or "",
-                                "return_type": func.get("return_type") or "",
-                                "line_start": func.get("line_start", 0),
-                            },
-                            doc_id=f"func:{relative_path}:{func['name']}"
-                        )
-                        indexed_functions += 1
-
-                    # v5.4: Create deep logic summary using CodeSummarizer
-                    if SUMMARIZER_AVAILABLE and code_summarizer:
-                        try:
-                            summary = code_summarizer.summarize_file(file_path, content)
-                            summary_text = summary.to_text(max_length=2000)
-
-                            if summary_text.strip():
-                                await memory.add(
-                                    content=summary_text,
-                                    collection="code_summaries",
-                                    metadata={
-                                        "type": "logic_summary",
-                                        "path": relative_path,
-                                        "language": summary.language,
-                                        "purpose": summary.purpose[:200] if summary.purpose else "",
-                                        "class_count": len(summary.classes),
-                                        "function_count": len(summary.functions),
-                                    },
-                                    doc_id=f"summary:{relative_path}"
-                                )
-                        except Exception as sum_err:
-                            logger.debug(f"Summary error for {relative_path}: {sum_err}")
-
-                except Exception as e:
-                    errors.append(f"{file_path.name}: {str(e)[:30]}")
+                    return await loop.run_in_executor(executor, _extract_index_payload, file_path, content)
+                except BrokenProcessPool:
+                    shutdown_index_process_pool()
+            return await loop.run_in_executor(None, _extract_index_payload, file_path, content)
 
+    extracted = await asyncio.gather(
+        *(_extract(candidates[i], loaded[i][0]) for i in misses), return_exceptions=True
+    )
+    new_entries = []
+    for i, payload in zip(misses, extracted):
+        content, cache_key, _ = loaded[i]
+        loaded[i] = payload if isinstance(payload, BaseException) else (content, cache_key, payload)
+        if not isinstance(payload, BaseException):
+            new_entries.append((cache_key, payload))
+    if new_entries:
+        await loop.run_in_executor(None, index_cache.set_many, new_entries)
+
+    # Re-indexed files: previous IDs their new documents no longer use (collection, ID)
+    superseded: Dict[str, List[tuple]] = {}
+    stale_ids: Dict[str, List[str]] = {}
+    for file_path, result in zip(candidates, loaded):
+        if isinstance(result, BaseException):
+            errors.append(f"{file_path.name}: {str(result)[:30]}")
+            continue
+        relative_path = str(file_path.relative_to(project_path))
+        if result is None:
+            # Now empty, binary or oversized: nothing replaces the old documents
+            for collection, ids in previous_ids.get(relative_path, {}).items():
+                stale_ids.setdefault(collection, []).extend(ids)
+            continue
+        try:
+            content, _, payload = result
+            documents = _index_documents(file_path, project_path, content, payload, mtimes[file_path])
         except Exception as e:
-            errors.append(f"Pattern {pattern}: {str(e)[:30]}")
+            errors.append(f"{file_path.name}: {str(e)[:30]}")
+            continue
+        if relative_path in previous_ids:
+            new_ids = {doc_id for _, _, _, doc_id in documents}
+            superseded[relative_path] = [
+                (collection, doc_id)
+                for collection, ids in previous_ids[relative_path].items()
+                for doc_id in ids if doc_id not in new_ids
+            ]
+        for collection, doc, metadata, doc_id in documents:
+            await batch.add(content=doc, collection=collection, metadata=metadata, doc_id=doc_id)
+
+    await batch.flush()
+    errors.extend(batch.errors)
+
+    # Old documents go only once the file's new documents are stored
+    written_files = set(batch.written.get("code_structure", ()))
+    for path, ids in superseded.items():
+        if f"file:{path}" in written_files:
+            for collection, doc_id in ids:
+                stale_ids.setdefault(collection, []).append(doc_id)
+    for collection, ids in stale_ids.items():
+        await memory.delete(collection, doc_ids=ids)
+
+    # Count what was stored, not what was queued (failed batch writes are dropped)
+    indexed_files = len(batch.written.get("code_structure", ()))
+    indexed_functions = len(batch.written.get("functions", ()))
+
+    # Keep the extraction cache bounded
+    await loop.run_in_executor(None, index_cache.prune)
 
     # Save metadata
     await memory.save_metadata(
@@ -3205,55 +3718,9 @@ async def handle_memory_init(args: Dict[str, Any]) -> List[TextContent]:
         from .architecture import architecture_detector
         analysis = architecture_detector.analyze(state.project_path)
 
-        # Always store main architecture info (even with low confidence)
-        arch_content = (
-            f"Project architecture: {analysis.pattern.value}. "
-            f"Framework: {analysis.framework.value if analysis.framework else 'unknown'}. "
-            f"Detected layers: {', '.join(analysis.detected_layers[:5]) if analysis.detected_layers else 'none'}. "
-            f"Design patterns: {', '.join(analysis.detected_patterns[:5]) if analysis.detected_patterns else 'none'}."
-        )
-        await memory.upsert(
-            content=arch_content,
-            collection="architecture",
-            metadata={
-                "type": "architecture",
-                "name": "project_architecture",
-                "pattern": analysis.pattern.value,
-                "framework": analysis.framework.value if analysis.framework else "",
-                "confidence": analysis.confidence,
-                "layers": ",".join(analysis.detected_layers[:10]) if analysis.detected_layers else "",
-                "design_patterns": ",".join(analysis.detected_patterns[:10]) if analysis.detected_patterns else "",
-            },
-            doc_id="arch:main"
-        )
+        # Main info, layers and design patterns (always, even with low confidence)
+        await _store_architecture(memory, analysis)
         architecture_indexed = True
-
-        # Store each detected layer as separate document for better search
-        for layer in analysis.detected_layers[:10]:
-            layer_content = f"Architecture layer: {layer} in {analysis.pattern.value} pattern."
-            await memory.upsert(
-                content=layer_content,
-                collection="architecture",
-                metadata={
-                    "type": "layer",
-                    "name": layer,
-                    "pattern": analysis.pattern.value,
-                },
-                doc_id=f"arch:layer:{layer.lower()}"
-            )
-
-        # Store design patterns (always, even with low architecture confidence)
-        for pattern in analysis.detected_patterns[:10]:
-            pattern_content = f"Design pattern: {pattern} detected in codebase."
-            await memory.upsert(
-                content=pattern_content,
-                collection="architecture",
-                metadata={
-                    "type": "design_pattern",
-                    "name": pattern,
-                },
-                doc_id=f"arch:pattern:{pattern.lower()}"
-            )
     except Exception as e:
         errors.append(f"Architecture detection: {str(e)[:30]}")
 
@@ -3278,6 +3745,9 @@ async def handle_memory_init(args: Dict[str, Any]) -> List[TextContent]:
             },
             "storage_mb": round(stats.storage_size_mb, 1)
         }
+        if incremental:
+            data["indexed"]["unchanged"] = unchanged_files
+            data["indexed"]["removed"] = removed_files
         if architecture_indexed:
             data["architecture"] = {
                 "pattern": analysis.pattern.value,
@@ -3288,13 +3758,15 @@ async def handle_memory_init(args: Dict[str, Any]) -> List[TextContent]:
 
         return _text(xml_success(
             tool="memory_init",
-            message=f"Memory initialisiert fuer {state.project_name}",
+            message=f"Memory {'aktualisiert' if incremental else 'initialisiert'} fuer {state.project_name}",
             data=data
         ))
 
-    lines = [f"✓ Memory initialisiert für: {state.project_name}", ""]
+    lines = [f"✓ Memory {'aktualisiert' if incremental else 'initialisiert'} für: {state.project_name}", ""]
     lines.append("📊 **Indexiert:**")
     lines.append(f"   - {indexed_files} Dateien")
+    if incremental:
+        lines.append(f"   - {unchanged_files} unverändert, {removed_files} entfernt")
     lines.append(f"   - {indexed_functions} Funktionen/Methoden")
     if summaries_count > 0:
         lines.append(f"   - {summaries_count} Code-Logik-Summaries")
@@ -3395,19 +3867,8 @@ async def handle_memory_query(args: Dict[str, Any]) -> List[TextContent]:
     keywords = KeywordExtractor.extract(query)
     task_type = detect_task_type(query)
 
-    # Score and sort results
-    scored_results = []
-    for doc, distance in results:
-        scored = RelevanceScorer.score(
-            document=doc,
-            semantic_distance=distance,
-            keywords=keywords,
-            task_type=task_type,
-            collection=doc.metadata.get("_collection", "unknown")
-        )
-        scored_results.append(scored)
-
-    scored_results.sort(key=lambda x: x.final_score, reverse=True)
+    # Score results, keep the best `limit`
+    scored_results = RelevanceScorer.score_batch(results, keywords, task_type, top_k=limit)
 
     # Build results data for XML
     results_data = []
@@ -3484,15 +3945,9 @@ async def handle_memory_update(args: Dict[str, Any]) -> List[TextContent]:
 
     if action == "reindex_file":
         if not file_path:
-            # v6.0: XML Response
-            if XML_RESPONSES_ENABLED:
-                return _text(xml_warning(
-                    tool="memory_update",
-                    message="file_path required for reindex_file action"
-                ))
-            return _text("⚠ file_path required for reindex_file action")
+            return _respond(xml_warning, "memory_update", "file_path required for reindex_file action", "⚠")
 
-        full_path = Path(state.project_path) / file_path if not Path(file_path).is_absolute() else Path(file_path)
+        full_path = _project_file(state.project_path, file_path)
 
         if not full_path.exists():
             # v6.0: XML Response
@@ -3505,19 +3960,27 @@ async def handle_memory_update(args: Dict[str, Any]) -> List[TextContent]:
             return _text(f"✗ File not found: {file_path}")
 
         try:
-            content = full_path.read_text(encoding='utf-8', errors='ignore')
+            content = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: full_path.read_text(encoding='utf-8', errors='ignore')
+            )
             relative_path = str(full_path.relative_to(state.project_path))
             file_summary = _create_file_summary(full_path, content)
+            metadata = {
+                "type": "file",
+                "path": relative_path,
+                "language": full_path.suffix.lstrip('.'),
+                "lines": _line_count(content),
+            }
+
+            # Functions are not re-extracted here: keep their stored ID list
+            previous = await memory.get(f"file:{relative_path}", "code_structure")
+            if previous and "function_ids" in previous.metadata:
+                metadata["function_ids"] = previous.metadata["function_ids"]
 
             await memory.upsert(
                 content=file_summary,
                 collection="code_structure",
-                metadata={
-                    "type": "file",
-                    "path": relative_path,
-                    "language": full_path.suffix.lstrip('.'),
-                    "lines": len(content.splitlines()),
-                },
+                metadata=metadata,
                 doc_id=f"file:{relative_path}"
             )
 
@@ -3548,13 +4011,7 @@ async def handle_memory_update(args: Dict[str, Any]) -> List[TextContent]:
 
     elif action == "add_learning":
         if not learning:
-            # v6.0: XML Response
-            if XML_RESPONSES_ENABLED:
-                return _text(xml_warning(
-                    tool="memory_update",
-                    message="learning required for add_learning action"
-                ))
-            return _text("⚠ learning required for add_learning action")
+            return _respond(xml_warning, "memory_update", "learning required for add_learning action", "⚠")
 
         await memory.add(
             content=learning,
@@ -3651,7 +4108,7 @@ async def handle_memory_status(args: Dict[str, Any]) -> List[TextContent]:
                 "collections": stats.collections,
                 "total_documents": stats.total_documents,
                 "storage_mb": round(stats.storage_size_mb, 2),
-                "embedding_model": "all-MiniLM-L6-v2"
+                "embedding_model": embedding_engine.model_label
             }
         ))
 
@@ -3736,7 +4193,7 @@ async def handle_memory_summarize(args: Dict[str, Any]) -> List[TextContent]:
 
     if file_path:
         # Summarize single file
-        full_path = project_path / file_path if not Path(file_path).is_absolute() else Path(file_path)
+        full_path = _project_file(project_path, file_path)
 
         if not full_path.exists():
             # v6.0: XML Response
@@ -3759,7 +4216,9 @@ async def handle_memory_summarize(args: Dict[str, Any]) -> List[TextContent]:
             return _text(f"✗ Not a file: {file_path}")
 
         try:
-            content = full_path.read_text(encoding='utf-8', errors='ignore')
+            content = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: full_path.read_text(encoding='utf-8', errors='ignore')
+            )
             relative_path = str(full_path.relative_to(project_path))
 
             summary = code_summarizer.summarize_file(full_path, content)
@@ -3785,6 +4244,8 @@ async def handle_memory_summarize(args: Dict[str, Any]) -> List[TextContent]:
                     "purpose": summary.purpose[:200] if summary.purpose else "",
                     "class_count": len(summary.classes),
                     "function_count": len(summary.functions),
+                    "mtime_ns": full_path.stat().st_mtime_ns,
+                    "content_hash": _content_hash(content),
                 },
                 doc_id=f"summary:{relative_path}"
             )
@@ -3844,57 +4305,80 @@ async def handle_memory_summarize(args: Dict[str, Any]) -> List[TextContent]:
         include_patterns = ["**/*.py", "**/*.php", "**/*.js", "**/*.ts", "**/*.tsx"]
         exclude_patterns = ["node_modules", "vendor", ".git", "__pycache__", "*.min.js"]
 
-        summarized = 0
         errors = []
 
-        for pattern in include_patterns:
+        # Collect candidate files (with mtime) in one walk, then summarize them concurrently
+        files: List[tuple] = []
+        for fp in _iter_project_files(project_path, include_patterns, exclude_patterns, errors):
+            if not should_index_file(str(fp)):
+                continue
             try:
-                for fp in project_path.glob(pattern):
-                    path_str = str(fp)
-                    if any(excl in path_str for excl in exclude_patterns):
-                        continue
-                    if not should_index_file(path_str):
-                        continue
-                    if not fp.is_file():
-                        continue
-
-                    try:
-                        content = fp.read_text(encoding='utf-8', errors='ignore')
-                        if not content.strip():
-                            continue
-
-                        relative_path = str(fp.relative_to(project_path))
-
-                        # Check if summary exists and skip if not forcing
-                        if not force:
-                            existing = await memory.get(f"summary:{relative_path}", "code_summaries")
-                            if existing:
-                                continue
-
-                        summary = code_summarizer.summarize_file(fp, content)
-                        summary_text = summary.to_text(max_length=2000)
-
-                        if summary_text.strip():
-                            await memory.upsert(
-                                content=summary_text,
-                                collection="code_summaries",
-                                metadata={
-                                    "type": "logic_summary",
-                                    "path": relative_path,
-                                    "language": summary.language,
-                                    "purpose": summary.purpose[:200] if summary.purpose else "",
-                                    "class_count": len(summary.classes),
-                                    "function_count": len(summary.functions),
-                                },
-                                doc_id=f"summary:{relative_path}"
-                            )
-                            summarized += 1
-
-                    except Exception as e:
-                        errors.append(f"{fp.name}: {str(e)[:30]}")
+                st = fp.stat()
+            except OSError:
+                continue
+            # Empty and oversized (bundled/generated) files are never read
+            if stat.S_ISREG(st.st_mode) and 0 < st.st_size <= MEMORY_INDEX_MAX_FILE_BYTES:
+                files.append((fp, st.st_mtime_ns))
+
+        # One metadata fetch instead of one lookup per file; summaries
+        # written before mtimes were stored count as changed
+        existing = {} if force else await memory.get_metadatas("code_summaries")
+
+        loop = asyncio.get_event_loop()
+        limit = asyncio.Semaphore(MEMORY_INDEX_CONCURRENCY)
+        # Summaries are written in batches (one embedding call per batch)
+        batch = MemoryBatch(memory, batch_size=MEMORY_SUMMARY_BATCH_SIZE, upsert=True)
+        # Touched but unchanged files: only their stored mtime is refreshed
+        touched: Dict[str, Dict[str, Any]] = {}
+
+        async def _summarize_one(fp: Path, mtime_ns: int) -> bool:
+            relative_path = str(fp.relative_to(project_path))
+
+            # Skip unchanged files that already have a summary (unless forcing);
+            # any mtime difference counts, it also goes backwards (checkout, restore)
+            stored = existing.get(f"summary:{relative_path}")
+            if stored is not None and stored.get("mtime_ns") == mtime_ns:
+                return False
+
+            async with limit:
+                # Read + summarize in a worker thread (blocking I/O, CPU-bound parsing);
+                # a touched file with identical content is skipped after hashing
+                document = await loop.run_in_executor(
+                    None, _summary_document, fp, relative_path,
+                    stored.get("content_hash") if stored is not None else None
+                )
+                if document is _SUMMARY_UNCHANGED:
+                    touched[f"summary:{relative_path}"] = dict(stored, mtime_ns=mtime_ns)
+                    return False
+                if document is None:
+                    return False
+
+                summary_text, metadata = document
+                metadata["mtime_ns"] = mtime_ns
+                await batch.add(
+                    content=summary_text,
+                    collection="code_summaries",
+                    metadata=metadata,
+                    doc_id=f"summary:{relative_path}"
+                )
+                return True
 
-            except Exception as e:
-                errors.append(f"Pattern {pattern}: {str(e)[:30]}")
+        results = await asyncio.gather(*(_summarize_one(fp, mtime_ns) for fp, mtime_ns in files), return_exceptions=True)
+
+        for (fp, _), result in zip(files, results):
+            if isinstance(result, BaseException):
+                errors.append(f"{fp.name}: {str(result)[:30]}")
+
+        # Failed batch writes are reported once per batch; only stored summaries count
+        await batch.flush()
+        errors.extend(batch.errors)
+        summarized = len(batch.written.get("code_summaries", ()))
+
+        # Next run skips touched files on their mtime instead of hashing them again
+        try:
+            await memory.update_metadatas("code_summaries", touched)
+        except Exception as e:
+            errors.append(f"Metadata update: {str(e)[:30]}")
 
         # Invalidate context cache
         context_injector.invalidate_cache(project_id)
@@ -3930,11 +4414,68 @@ async def handle_memory_summarize(args: Dict[str, Any]) -> List[TextContent]:
         return _text("\n".join(lines))
 
 
+def _content_hash(content: str) -> str:
+    """Short content fingerprint stored with summaries (detects touched-but-unchanged files)."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# _summary_document result for content that still matches the stored hash
+_SUMMARY_UNCHANGED = object()
+
+
+def _summary_document(file_path: Path, relative_path: str,
+                      unchanged_hash: Optional[str] = None) -> Optional[Any]:
+    """
+    Read and summarize one file for memory_summarize (runs in a worker thread).
+
+    Returns (summary_text, metadata), _SUMMARY_UNCHANGED if the content still
+    matches unchanged_hash, or None if there is nothing to summarize.
+    """
+    content = file_path.read_text(encoding='utf-8', errors='ignore')
+    if not content.strip():
+        return None
+    content_hash = _content_hash(content)
+    if content_hash == unchanged_hash:
+        return _SUMMARY_UNCHANGED
+
+    summary = code_summarizer.summarize_file(file_path, content)
+    summary_text = summary.to_text(max_length=2000)
+    if not summary_text.strip():
+        return None
+
+    return summary_text, {
+        "type": "logic_summary",
+        "path": relative_path,
+        "language": summary.language,
+        "purpose": summary.purpose[:200] if summary.purpose else "",
+        "class_count": len(summary.classes),
+        "function_count": len(summary.functions),
+        "content_hash": content_hash,
+    }
+
+
 # Helper functions for memory indexing
+
+# Collapses whitespace and '*' gutters of a doc comment (compiled once)
+_WS_STAR_RE = re.compile(r'[\s*]+')
+
+
+def _first_block(content: str, start: str, end: str) -> Optional[str]:
+    """Text between the first start marker and the next end marker (plain str.find, no regex)."""
+    i = content.find(start)
+    if i < 0:
+        return None
+    j = content.find(end, i + len(start))
+    if j < 0:
+        return None
+    return content[i + len(start):j]
+
+
 def _create_file_summary(file_path: Path, content: str) -> str:
     """Create a summary description for a file."""
     name = file_path.name
-    lines = len(content.splitlines())
+    name_lower = name.lower()
+    lines = _line_count(content)
     ext = file_path.suffix.lower()
 
     # Detect common patterns
@@ -3949,13 +4490,13 @@ def _create_file_summary(file_path: Path, content: str) -> str:
         patterns.append("has imports")
     if "@route" in content_lower or "router." in content_lower or "app.get(" in content_lower:
         patterns.append("defines routes")
-    if "test" in name.lower() or "spec" in name.lower():
+    if "test" in name_lower or "spec" in name_lower:
         patterns.append("test file")
-    if "model" in name.lower():
+    if "model" in name_lower:
         patterns.append("model definition")
-    if "controller" in name.lower():
+    if "controller" in name_lower:
         patterns.append("controller")
-    if "config" in name.lower() or "settings" in name.lower():
+    if "config" in name_lower or "settings" in name_lower:
         patterns.append("configuration")
 
     pattern_str = ", ".join(patterns) if patterns else "general code"
@@ -3964,17 +4505,14 @@ def _create_file_summary(file_path: Path, content: str) -> str:
     first_comment = ""
     if ext == ".py":
         # Python docstring
-        import re
-        match = re.search(r'"""(.*?)"""', content, re.DOTALL)
-        if match:
-            first_comment = match.group(1).strip()[:100]
-    elif ext in [".php", ".js", ".ts"]:
+        block = _first_block(content, '"""', '"""')
+        if block is not None:
+            first_comment = block.strip()[:100]
+    elif ext in (".php", ".js", ".ts"):
         # PHPDoc/JSDoc style
-        import re
-        match = re.search(r'/\*\*(.*?)\*/', content, re.DOTALL)
-        if match:
-            first_comment = match.group(1).strip()[:100]
-            first_comment = re.sub(r'[\s*]+', ' ', first_comment)
+        block = _first_block(content, '/**', '*/')
+        if block is not None:
+            first_comment = _WS_STAR_RE.sub(' ', block.strip()[:100])
 
     summary = f"{name}: {pattern_str}. {lines} lines."
     if first_comment:
@@ -3983,112 +4521,206 @@ def _create_file_summary(file_path: Path, content: str) -> str:
     return summary[:500]  # Limit length
 
 
-def _extract_functions(content: str, suffix: str, file_path: str = "") -> list:
+# Symbol types stored in the "functions" collection
+_FUNCTION_SYMBOL_TYPES = frozenset({"function", "method", "class"})
+
+
+def _extract_functions(content: str, suffix_lower: str, file_path: str = "",
+                       incremental: bool = False) -> list:
     """Extract functions/methods from code using AST-Analyzer.
 
     Uses the ast_analyzer module for precise extraction with tree-sitter
     or regex fallback. Returns richer metadata including signatures,
-    parent classes, and return types.
+    parent classes, and return types. suffix_lower is the lowercased
+    file extension (e.g. ".py"); incremental keeps the parse tree so the
+    next edit of the same file is re-parsed incrementally.
     """
-    from .ast_analyzer import ast_analyzer, LANGUAGE_EXTENSIONS
-
-    # Get language from suffix
-    language = LANGUAGE_EXTENSIONS.get(suffix.lower())
+    # Get language from suffix (unsupported files: nothing to extract)
+    language = LANGUAGE_EXTENSIONS.get(suffix_lower)
     if not language:
         return []
 
     # Use AST analyzer for extraction
-    analysis = ast_analyzer.analyze_file(file_path, content) if file_path else None
+    analysis = ast_analyzer.analyze_file(file_path, content, incremental=incremental) if file_path else None
 
     if analysis is None:
         # Fallback: use RegexAnalyzer directly
-        from .ast_analyzer import RegexAnalyzer
         analysis = RegexAnalyzer.analyze(content, language, file_path or "unknown")
 
-    functions = []
-    seen_keys = set()  # Deduplicate by (name, line_start, parent)
+    # Deduplicate by (name, line_start, parent); dicts keep insertion order
+    functions_by_key: Dict[tuple, dict] = {}
 
     for symbol in analysis.symbols:
         # Skip non-function symbols for this collection
-        if symbol.type.value not in ["function", "method", "class"]:
+        if symbol.type.value not in _FUNCTION_SYMBOL_TYPES:
             continue
 
         # Deduplicate: same name + line + parent = same symbol
         dedup_key = (symbol.name, symbol.line_start, symbol.parent or "")
-        if dedup_key in seen_keys:
+        if dedup_key in functions_by_key:
             continue
-        seen_keys.add(dedup_key)
 
+        # Only what the memory documents need: these records are cached
+        # (index_cache) and held for every file during memory_init
         func_data = {
-            "type": symbol.type.value,
             "name": symbol.name,
-            "params": symbol.parameters[:5],
             "description": symbol.to_memory_content(),
-            "signature": symbol.signature[:100] if symbol.signature else "",
-            "parent": symbol.parent,
-            "return_type": symbol.return_type,
-            "line_start": symbol.line_start,
-            "line_end": symbol.line_end,
+            # Chroma-ready metadata (callers add "path");
+            # ChromaDB doesn't accept None or list values in metadata
+            "metadata": {
+                "type": symbol.type.value,
+                "name": symbol.name,
+                "params": ",".join(symbol.parameters[:5]),
+                "signature": symbol.signature[:100] if symbol.signature else "",
+                "parent": symbol.parent or "",
+                "return_type": symbol.return_type or "",
+                "line_start": symbol.line_start or 0,
+            },
         }
-        functions.append(func_data)
+        functions_by_key[dedup_key] = func_data
+        if len(functions_by_key) >= 100:  # Limit to prevent too many entries
+            break
 
-    return functions[:100]  # Limit to prevent too many entries
+    return list(functions_by_key.values())
 
 
 # =============================================================================
 # SYMBOL VALIDATION HELPERS (v6.2)
 # =============================================================================
 
-# Cache for project symbols (per project_path + language)
-_symbol_cache: Dict[str, Set[str]] = {}
-_symbol_cache_time: Dict[str, float] = {}
 SYMBOL_CACHE_TTL = 300  # 5 minutes
+SYMBOL_CACHE_SIZE = 64  # Projects x languages kept at once
+SYMBOL_SCAN_CONCURRENCY = 16  # Parallel file reads while collecting symbols
+SYMBOL_SCAN_EXCLUDED_DIRS = frozenset({'node_modules', 'vendor', '.git', '__pycache__', 'dist', 'build'})
+SYMBOL_FILE_CACHE_SIZE = 20000  # Per-file definitions, reused while (mtime, size) match
+
+# (path, language) -> ((mtime_ns, size), definitions); only touched on the event loop
+_file_symbol_cache: LRUCache = LRUCache(maxsize=SYMBOL_FILE_CACHE_SIZE)
+
+# Cache for project symbols (per project_path + language)
+_symbol_cache: TTLLRUCache = TTLLRUCache(maxsize=SYMBOL_CACHE_SIZE, ttl_seconds=SYMBOL_CACHE_TTL)
+
+
+def _scan_symbol_file(src_file: Path, lang, cached: Optional[tuple]) -> Optional[tuple]:
+    """
+    Definitions of one file as ((mtime_ns, size), frozenset), or None if unreadable.
+
+    Returns cached unchanged when the file's signature still matches. Runs in
+    a worker thread or process (module-level so it can be pickled).
+    """
+    try:
+        st = src_file.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+        if cached is not None and cached[0] == signature:
+            return cached  # Unchanged since last scan
+        content = src_file.read_text(encoding='utf-8', errors='replace')
+        return signature, frozenset(SymbolExtractor().extract_definitions(content, lang))
+    except Exception:
+        return None
+
 
 async def _get_project_symbols(project_path: str, lang) -> Set[str]:
     """
     Get all symbol definitions from the project for a given language.
-    Results are cached for 5 minutes to avoid repeated scans.
+    Results are cached for 5 minutes to avoid repeated scans; a rescan
+    only re-parses files whose mtime or size changed.
     """
-    import time
     from .symbol_patterns import EXTENSION_MAP
 
     cache_key = f"{project_path}:{lang.value if hasattr(lang, 'value') else lang}"
-    now = time.time()
 
     # Check cache
-    if cache_key in _symbol_cache:
-        if now - _symbol_cache_time.get(cache_key, 0) < SYMBOL_CACHE_TTL:
-            return _symbol_cache[cache_key]
+    cached_symbols = _symbol_cache.get(cache_key)
+    if cached_symbols is not None:
+        return cached_symbols
 
     # Collect symbols
     symbols = set()
-    extractor = SymbolExtractor()
     project = Path(project_path)
 
     # Get extensions for this language
     extensions = [ext for ext, l in EXTENSION_MAP.items() if l == lang]
 
-    # Scan project files
-    for ext in extensions:
-        for src_file in project.glob(f"**/*{ext}"):
-            # Skip common directories
-            if any(skip in str(src_file) for skip in ['node_modules', 'vendor', '.git', '__pycache__', 'dist', 'build']):
-                continue
+    suffixes = tuple(extensions)
+
+    def _list_files() -> List[Path]:
+        # One walk for all extensions; excluded directories are never entered
+        files = []
+        if not suffixes:
+            return files
+        for root, dirs, names in os.walk(project):
+            dirs[:] = [d for d in dirs if d not in SYMBOL_SCAN_EXCLUDED_DIRS]
+            files.extend(Path(root, name) for name in names if name.endswith(suffixes))
+        return files
+
+    # Scan project files off the event loop (bounded concurrency)
+    loop = asyncio.get_event_loop()
+    limit = asyncio.Semaphore(SYMBOL_SCAN_CONCURRENCY)
+
+    files = await loop.run_in_executor(None, _list_files)
+
+    # Parsing is pure-Python regex work (holds the GIL): a scan with many
+    # uncached files runs in the worker processes memory_init uses
+    uncached = sum((str(f), cache_key) not in _file_symbol_cache for f in files)
+    executor = _get_index_process_pool() if uncached >= MEMORY_INDEX_PROCESS_MIN_FILES else None
+
+    async def _scan(src_file: Path):
+        file_key = (str(src_file), cache_key)
+        cached = _file_symbol_cache.get(file_key)
+        async with limit:
+            if executor is not None and cached is None:
+                try:
+                    entry = await loop.run_in_executor(executor, _scan_symbol_file, src_file, lang, None)
+                except BrokenProcessPool:
+                    shutdown_index_process_pool()
+                    entry = await loop.run_in_executor(None, _scan_symbol_file, src_file, lang, None)
+            else:
+                entry = await loop.run_in_executor(None, _scan_symbol_file, src_file, lang, cached)
+        if entry is None:
+            _file_symbol_cache.pop(file_key, None)
+            return None
+        _file_symbol_cache[file_key] = entry
+        return entry[1]
 
-            try:
-                content = src_file.read_text(encoding='utf-8', errors='replace')
-                defs = extractor.extract_definitions(content, lang)
-                symbols.update(defs)
-            except Exception:
-                pass
+    for defs in await asyncio.gather(*(_scan(f) for f in files)):
+        if defs:
+            symbols.update(defs)
 
     # Cache result
-    _symbol_cache[cache_key] = symbols
-    _symbol_cache_time[cache_key] = now
+    _symbol_cache.set(cache_key, symbols)
 
     return symbols
 
 
+async def _refresh_file_symbols(project_path: str, full_path: Path, lang) -> None:
+    """
+    Fold the current definitions of an edited file into the cached project
+    symbols, so a validation right after the edit sees new functions before
+    the cache expires. Definitions removed from the file stay until the next
+    full scan.
+    """
+    cache_key = f"{project_path}:{lang.value if hasattr(lang, 'value') else lang}"
+    symbols = _symbol_cache.get(cache_key)
+    if symbols is None:
+        return  # Next lookup scans the project anyway
+
+    try:
+        relative = full_path.relative_to(project_path)
+    except ValueError:
+        return
+    if SYMBOL_SCAN_EXCLUDED_DIRS.intersection(relative.parts[:-1]):
+        return
+
+    file_key = (str(full_path), cache_key)
+    loop = asyncio.get_event_loop()
+    entry = await loop.run_in_executor(
+        None, _scan_symbol_file, full_path, lang, _file_symbol_cache.get(file_key)
+    )
+    if entry is not None:
+        _file_symbol_cache[file_key] = entry
+        symbols.update(entry[1])
+
+
 # =============================================================================
 # MEMORY AUTO-UPDATE HELPERS (v5.2)
 # =============================================================================
@@ -4109,14 +4741,22 @@ async def _update_memory_for_file(project_id: str, file_path: str, project_path:
             return
 
         # Get full path
-        full_path = Path(project_path) / file_path if not Path(file_path).is_absolute() else Path(file_path)
+        full_path = _project_file(project_path, file_path)
 
-        if not full_path.exists():
+        # Skip missing, empty and oversized files before reading
+        try:
+            size = full_path.stat().st_size
+        except OSError:
+            return
+        if size == 0 or size > MEMORY_INDEX_MAX_FILE_BYTES:
             return
 
-        # Read file content
+        # Read file content (off the event loop)
+        loop = asyncio.get_event_loop()
         try:
-            content = full_path.read_text(encoding='utf-8', errors='ignore')
+            content = await loop.run_in_executor(
+                None, lambda: full_path.read_text(encoding='utf-8', errors='ignore')
+            )
         except Exception:
             return
 
@@ -4132,34 +4772,45 @@ async def _update_memory_for_file(project_id: str, file_path: str, project_path:
         except ValueError:
             relative_path = file_path
 
-        # Update file summary
-        file_summary = _create_file_summary(full_path, content)
-        await memory.upsert(
-            content=file_summary,
+        # Same extraction (and per-file limit) as memory_init; the tree is kept for the next edit
+        functions = _extract_functions(
+            content, full_path.suffix.lower(), str(full_path), incremental=True
+        )
+        function_ids = _function_doc_ids(relative_path, functions)
+
+        # Drop function entries that no longer exist, so the stored ID list stays complete
+        file_doc_id = f"file:{relative_path}"
+        previous = await memory.get(file_doc_id, "code_structure")
+        if previous:
+            await _delete_file_functions(
+                memory, relative_path, previous.metadata.get("function_ids"), keep=function_ids.split("\n")
+            )
+
+        # Update file summary + functions (re-extract): one embedding call
+        batch = MemoryBatch(memory, upsert=True)
+        await batch.add(
+            content=_create_file_summary(full_path, content),
             collection="code_structure",
             metadata={
                 "type": "file",
                 "path": relative_path,
                 "language": full_path.suffix.lstrip('.'),
-                "lines": len(content.splitlines()),
+                "lines": _line_count(content),
+                "function_ids": function_ids,
             },
-            doc_id=f"file:{relative_path}"
+            doc_id=file_doc_id
         )
-
-        # Update functions (re-extract)
-        functions = _extract_functions(content, full_path.suffix)
-        for func in functions[:20]:  # Limit per file
-            await memory.upsert(
+        for func in functions:
+            await batch.add(
                 content=func["description"],
                 collection="functions",
-                metadata={
-                    "type": func["type"],
-                    "name": func["name"],
-                    "path": relative_path,
-                    "params": func.get("params", []),
-                },
+                metadata=dict(func["metadata"], path=relative_path),
                 doc_id=f"func:{relative_path}:{func['name']}"
             )
+        await batch.flush()
+        if batch.errors:
+            logger.debug(f"Memory auto-update failed for {file_path}: {batch.errors[0]}")
+            return
 
         # Invalidate context cache for this project
         context_injector.invalidate_cache(project_id)
@@ -4170,6 +4821,24 @@ async def _update_memory_for_file(project_id: str, file_path: str, project_path:
         logger.debug(f"Memory auto-update failed for {file_path}: {e}")
 
 
+async def _delete_file_functions(memory, relative_path: str, function_ids: Optional[str], keep=()):
+    """
+    Delete a file's function entries by ID, except the IDs in keep.
+
+    function_ids is the newline-joined list stored on the file entry. None
+    means an entry written before the list was stored: then all functions of
+    the file are found by path metadata (callers re-add the kept ones).
+    """
+    if function_ids is None:
+        await memory.delete(collection="functions", where={"path": relative_path})
+        return
+
+    kept = set(keep)
+    stale = [doc_id for doc_id in function_ids.split("\n") if doc_id and doc_id not in kept]
+    if stale:
+        await memory.delete(collection="functions", doc_ids=stale)
+
+
 async def _delete_from_memory(project_id: str, file_path: str, project_path: str):
     """
     Remove a deleted file from memory (v5.3).
@@ -4184,25 +4853,25 @@ async def _delete_from_memory(project_id: str, file_path: str, project_path: str
         memory = await memory_manager.get_memory(project_id)
 
         # Create relative path for matching
-        full_path = Path(project_path) / file_path if not Path(file_path).is_absolute() else Path(file_path)
+        full_path = _project_file(project_path, file_path)
         try:
             relative_path = str(full_path.relative_to(project_path))
         except ValueError:
             relative_path = file_path
 
-        # Delete file entry from code_structure
+        # The file entry lists its function IDs (keyed delete instead of a metadata scan)
         file_doc_id = f"file:{relative_path}"
+        file_doc = await memory.get(file_doc_id, "code_structure")
+        function_ids = file_doc.metadata.get("function_ids") if file_doc else None
+
+        # Delete file entry from code_structure
         await memory.delete(
             collection="code_structure",
             doc_ids=[file_doc_id]
         )
 
         # Delete all functions from this file
-        # We need to find and delete by path metadata
-        await memory.delete(
-            collection="functions",
-            where={"path": relative_path}
-        )
+        await _delete_file_functions(memory, relative_path, function_ids)
 
         # Invalidate context cache
         context_injector.invalidate_cache(project_id)
@@ -4273,6 +4942,46 @@ async def _consolidate_session_learnings(state, scope_desc: str):
 # PHASE 3 HANDLERS (v5.3): AST Analysis, Architecture, Export/Import
 # =============================================================================
 
+async def _analyze_directory(directory: str) -> Dict[str, Any]:
+    """
+    Analyze all source files below directory (analyze_directory, off the event loop).
+
+    Files are listed and checked against the analysis cache first; the
+    remaining ones are parsed in parallel, in the worker processes memory_init
+    uses when there are enough of them.
+    """
+    loop = asyncio.get_event_loop()
+
+    files = await loop.run_in_executor(None, ast_analyzer.list_directory, directory)
+    cached, misses = await loop.run_in_executor(None, ast_analyzer.split_cached, files)
+
+    executor = _get_index_process_pool() if len(misses) >= MEMORY_INDEX_PROCESS_MIN_FILES else None
+    limit = asyncio.Semaphore(MEMORY_INDEX_CONCURRENCY)
+
+    async def _parse(file_path: str):
+        async with limit:
+            if executor is not None:
+                try:
+                    signature, analysis = await loop.run_in_executor(executor, analyze_file_signed, file_path)
+                except BrokenProcessPool:
+                    shutdown_index_process_pool()
+                    return await loop.run_in_executor(None, ast_analyzer.analyze_file, file_path)
+                if signature is not None:
+                    ast_analyzer.remember(file_path, signature, analysis)
+                return analysis
+            return await loop.run_in_executor(None, ast_analyzer.analyze_file, file_path)
+
+    parsed = dict(zip(misses, await asyncio.gather(*(_parse(f) for f in misses))))
+
+    # Keep listing order; only files with symbols are reported
+    results = {}
+    for file_path in files:
+        analysis = cached.get(file_path) or parsed.get(file_path)
+        if analysis is not None and analysis.symbols:
+            results[file_path] = analysis
+    return results
+
+
 @handler.register("chainguard_analyze_code")
 async def handle_analyze_code(args: Dict[str, Any]) -> List[TextContent]:
     """Analyze code structure using AST parsing."""
@@ -4280,32 +4989,15 @@ async def handle_analyze_code(args: Dict[str, Any]) -> List[TextContent]:
     file_path = args.get("file", "")
     state = await pm.get_async(working_dir)
 
-    try:
-        from .ast_analyzer import ast_analyzer, LANGUAGE_EXTENSIONS
-    except ImportError as e:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="analyze_code",
-                message=f"AST Analyzer not available: {e}"
-            ))
-        return _text(f"✗ AST Analyzer not available: {e}")
-
     if not file_path:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_warning(
-                tool="analyze_code",
-                message="Missing required parameter: file"
-            ))
-        return _text("✗ Missing required parameter: file")
+        return _respond(xml_warning, "analyze_code", "Missing required parameter: file", "✗")
 
     # Build full path
-    full_path = Path(state.project_path) / file_path if not Path(file_path).is_absolute() else Path(file_path)
+    full_path = _project_file(state.project_path, file_path)
 
     if full_path.is_dir():
         # Directory analysis
-        analyses = ast_analyzer.analyze_directory(str(full_path))
+        analyses = await _analyze_directory(str(full_path))
 
         if not analyses:
             # v6.0: XML Response
@@ -4325,18 +5017,23 @@ async def handle_analyze_code(args: Dict[str, Any]) -> List[TextContent]:
         lines.append(f"Analyzed {len(analyses)} files")
         lines.append("")
 
-        for path, analysis in list(analyses.items())[:10]:  # Limit output
-            rel_path = str(Path(path).relative_to(full_path)) if full_path in Path(path).parents else path
-            symbols_summary = []
+        for path, analysis in islice(analyses.items(), 10):  # Limit output
+            file_path_obj = Path(path)
+            rel_path = str(file_path_obj.relative_to(full_path)) if full_path in file_path_obj.parents else path
+            # First three distinct symbol types, in order of appearance
+            types = []
             for s in analysis.symbols:
-                if s.type.value not in [t.value for t in symbols_summary]:
-                    symbols_summary.append(s.type)
+                value = s.type.value
+                if value not in types:
+                    types.append(value)
+                    if len(types) == 3:
+                        break
 
-            types_str = ", ".join(s.value for s in symbols_summary[:3])
+            types_str = ", ".join(types)
             files_data.append({
                 "path": rel_path,
                 "symbols": len(analysis.symbols),
-                "types": [s.value for s in symbols_summary[:3]]
+                "types": types
             })
             lines.append(f"├─ {rel_path}: {len(analysis.symbols)} symbols ({types_str})")
             total_symbols += len(analysis.symbols)
@@ -4385,7 +5082,8 @@ async def handle_analyze_code(args: Dict[str, Any]) -> List[TextContent]:
                 ))
             return _text(f"✗ Unsupported file type: {ext}")
 
-        analysis = ast_analyzer.analyze_file(str(full_path))
+        # Keep the parse tree: re-analysing after an edit only re-parses the change
+        analysis = ast_analyzer.analyze_file(str(full_path), incremental=True)
 
         # Build symbols data for XML
         symbols_data = []
@@ -4440,6 +5138,52 @@ async def handle_analyze_code(args: Dict[str, Any]) -> List[TextContent]:
         return _text("\n".join(lines))
 
 
+async def _store_architecture(memory, analysis) -> None:
+    """
+    Store an ArchitectureAnalysis in the "architecture" collection
+    (memory_init and detect_architecture).
+    """
+    # Main pattern, layers and design patterns go in as one batch
+    # (one embedding call, one ChromaDB write)
+    contents = [(
+        f"Project architecture: {analysis.pattern.value}. "
+        f"Framework: {analysis.framework.value if analysis.framework else 'unknown'}. "
+        f"Detected layers: {', '.join(analysis.detected_layers[:5]) if analysis.detected_layers else 'none'}. "
+        f"Design patterns: {', '.join(analysis.detected_patterns[:5]) if analysis.detected_patterns else 'none'}."
+    )]
+    metadatas = [{
+        "type": "architecture",
+        "name": "project_architecture",
+        "pattern": analysis.pattern.value,
+        "framework": analysis.framework.value if analysis.framework else "",
+        "confidence": analysis.confidence,
+        "layers": ",".join(analysis.detected_layers[:10]) if analysis.detected_layers else "",
+        "design_patterns": ",".join(analysis.detected_patterns[:10]) if analysis.detected_patterns else "",
+    }]
+    doc_ids = ["arch:main"]
+
+    # Each detected layer
+    for layer in analysis.detected_layers[:10]:
+        contents.append(f"Architecture layer: {layer} in {analysis.pattern.value} pattern.")
+        metadatas.append({
+            "type": "layer",
+            "name": layer,
+            "pattern": analysis.pattern.value,
+        })
+        doc_ids.append(f"arch:layer:{layer.lower()}")
+
+    # Design patterns
+    for pattern in analysis.detected_patterns[:10]:
+        contents.append(f"Design pattern: {pattern} detected in codebase.")
+        metadatas.append({
+            "type": "design_pattern",
+            "name": pattern,
+        })
+        doc_ids.append(f"arch:pattern:{pattern.lower()}")
+
+    await memory.upsert_batch(contents, "architecture", metadatas, doc_ids)
+
+
 @handler.register("chainguard_detect_architecture")
 async def handle_detect_architecture(args: Dict[str, Any]) -> List[TextContent]:
     """Detect architectural patterns in the codebase."""
@@ -4449,13 +5193,7 @@ async def handle_detect_architecture(args: Dict[str, Any]) -> List[TextContent]:
     try:
         from .architecture import architecture_detector
     except ImportError as e:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="detect_architecture",
-                message=f"Architecture Detector not available: {e}"
-            ))
-        return _text(f"✗ Architecture Detector not available: {e}")
+        return _respond(xml_error, "detect_architecture", f"Architecture Detector not available: {e}", "✗")
 
     analysis = architecture_detector.analyze(state.project_path)
 
@@ -4467,55 +5205,8 @@ async def handle_detect_architecture(args: Dict[str, Any]) -> List[TextContent]:
             if await memory_manager.memory_exists(project_id):
                 memory = await memory_manager.get_memory(project_id, state.project_path)
 
-                # Always store main architecture pattern
-                arch_content = (
-                    f"Project architecture: {analysis.pattern.value}. "
-                    f"Framework: {analysis.framework.value if analysis.framework else 'unknown'}. "
-                    f"Detected layers: {', '.join(analysis.detected_layers[:5]) if analysis.detected_layers else 'none'}. "
-                    f"Design patterns: {', '.join(analysis.detected_patterns[:5]) if analysis.detected_patterns else 'none'}."
-                )
-                await memory.upsert(
-                    content=arch_content,
-                    collection="architecture",
-                    metadata={
-                        "type": "architecture",
-                        "name": "project_architecture",
-                        "pattern": analysis.pattern.value,
-                        "framework": analysis.framework.value if analysis.framework else "",
-                        "confidence": analysis.confidence,
-                        "layers": ",".join(analysis.detected_layers[:10]) if analysis.detected_layers else "",
-                        "design_patterns": ",".join(analysis.detected_patterns[:10]) if analysis.detected_patterns else "",
-                    },
-                    doc_id="arch:main"
-                )
+                await _store_architecture(memory, analysis)
                 memory_updated = True
-
-                # Store each detected layer
-                for layer in analysis.detected_layers[:10]:
-                    layer_content = f"Architecture layer: {layer} in {analysis.pattern.value} pattern."
-                    await memory.upsert(
-                        content=layer_content,
-                        collection="architecture",
-                        metadata={
-                            "type": "layer",
-                            "name": layer,
-                            "pattern": analysis.pattern.value,
-                        },
-                        doc_id=f"arch:layer:{layer.lower()}"
-                    )
-
-                # Store design patterns
-                for pattern in analysis.detected_patterns[:10]:
-                    pattern_content = f"Design pattern: {pattern} detected in codebase."
-                    await memory.upsert(
-                        content=pattern_content,
-                        collection="architecture",
-                        metadata={
-                            "type": "design_pattern",
-                            "name": pattern,
-                        },
-                        doc_id=f"arch:pattern:{pattern.lower()}"
-                    )
         except Exception:
             pass  # Silent fail - architecture detection still works without memory
 
@@ -4607,13 +5298,7 @@ async def handle_memory_export(args: Dict[str, Any]) -> List[TextContent]:
     try:
         from .memory_export import memory_exporter
     except ImportError as e:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="memory_export",
-                message=f"Memory Export not available: {e}"
-            ))
-        return _text(f"✗ Memory Export not available: {e}")
+        return _respond(xml_error, "memory_export", f"Memory Export not available: {e}", "✗")
 
     memory = await memory_manager.get_memory(project_id, state.project_path)
 
@@ -4650,13 +5335,7 @@ async def handle_memory_export(args: Dict[str, Any]) -> List[TextContent]:
         lines.append(f"**Collections:** {', '.join(result.collections_exported)}")
         return _text("\n".join(lines))
     else:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="memory_export",
-                message=f"Export failed: {result.error}"
-            ))
-        return _text(f"✗ Export failed: {result.error}")
+        return _respond(xml_error, "memory_export", f"Export failed: {result.error}", "✗")
 
 
 @handler.register("chainguard_memory_import")
@@ -4678,13 +5357,7 @@ async def handle_memory_import(args: Dict[str, Any]) -> List[TextContent]:
     skip_existing = args.get("skip_existing", True)
 
     if not file_path:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_warning(
-                tool="memory_import",
-                message="Missing required parameter: file"
-            ))
-        return _text("✗ Missing required parameter: file")
+        return _respond(xml_warning, "memory_import", "Missing required parameter: file", "✗")
 
     state = await pm.get_async(working_dir)
     project_id = get_project_id(state.project_path)
@@ -4692,13 +5365,7 @@ async def handle_memory_import(args: Dict[str, Any]) -> List[TextContent]:
     try:
         from .memory_export import memory_importer
     except ImportError as e:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="memory_import",
-                message=f"Memory Import not available: {e}"
-            ))
-        return _text(f"✗ Memory Import not available: {e}")
+        return _respond(xml_error, "memory_import", f"Memory Import not available: {e}", "✗")
 
     # Ensure memory exists
     if not await memory_manager.memory_exists(project_id):
@@ -4707,9 +5374,8 @@ async def handle_memory_import(args: Dict[str, Any]) -> List[TextContent]:
     else:
         memory = await memory_manager.get_memory(project_id, state.project_path)
 
-    # Determine format from extension
-    path = Path(file_path)
-    is_jsonl = ".jsonl" in path.name
+    # Determine format from extension (plain or gzipped JSONL export)
+    is_jsonl = file_path.endswith((".jsonl", ".jsonl.gz"))
 
     if is_jsonl:
         result = await memory_importer.import_jsonl(
@@ -4744,13 +5410,7 @@ async def handle_memory_import(args: Dict[str, Any]) -> List[TextContent]:
         lines.append(f"**Collections:** {', '.join(result.collections_imported)}")
         return _text("\n".join(lines))
     else:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="memory_import",
-                message=f"Import failed: {result.error}"
-            ))
-        return _text(f"✗ Import failed: {result.error}")
+        return _respond(xml_error, "memory_import", f"Import failed: {result.error}", "✗")
 
 
 @handler.register("chainguard_list_exports")
@@ -4762,13 +5422,7 @@ async def handle_list_exports(args: Dict[str, Any]) -> List[TextContent]:
     try:
         from .memory_export import list_exports
     except ImportError as e:
-        # v6.0: XML Response
-        if XML_RESPONSES_ENABLED:
-            return _text(xml_error(
-                tool="list_exports",
-                message=f"Memory Export not available: {e}"
-            ))
-        return _text(f"✗ Memory Export not available: {e}")
+        return _respond(xml_error, "list_exports", f"Memory Export not available: {e}", "✗")
 
     project_id = get_project_id(state.project_path) if MEMORY_AVAILABLE else None
     exports = list_exports(project_id[:8] if project_id else None)
@@ -4877,6 +5531,8 @@ async def handle_validate_symbols(args: Dict[str, Any]) -> List[TextContent]:
     if not file_path and not code:
         return _text("✗ Either 'file' or 'code' parameter required")
 
+    loop = asyncio.get_event_loop()
+
     # Get code content
     if file_path:
         full_path = Path(state.project_path) / file_path
@@ -4884,7 +5540,9 @@ async def handle_validate_symbols(args: Dict[str, Any]) -> List[TextContent]:
             return _text(f"✗ File not found: {file_path}")
 
         try:
-            code = full_path.read_text(encoding='utf-8', errors='replace')
+            code = await loop.run_in_executor(
+                None, lambda: full_path.read_text(encoding='utf-8', errors='replace')
+            )
         except Exception as e:
             return _text(f"✗ Cannot read file: {e}")
 
@@ -4895,8 +5553,10 @@ async def handle_validate_symbols(args: Dict[str, Any]) -> List[TextContent]:
 
     known_symbols = await _get_project_symbols(state.project_path, lang)
 
-    # Validate the target code
-    result = SymbolValidator.validate(code, file_path or "inline.txt", known_symbols)
+    # Validate the target code (regex scan over the whole file: off the event loop)
+    result = await loop.run_in_executor(
+        None, SymbolValidator.validate, code, file_path or "inline.txt", known_symbols
+    )
 
     if not result.issues:
         return _text(f"✓ No symbol issues detected in {file_path or 'code'}")
@@ -4919,6 +5579,24 @@ async def handle_validate_symbols(args: Dict[str, Any]) -> List[TextContent]:
     return _text("\n".join(lines))
 
 
+# project_path -> (registry_signature, PackageValidator). The validator keeps
+# the parsed manifests; it is rebuilt when any of them changes.
+PACKAGE_VALIDATOR_CACHE_SIZE = 16
+_package_validators: LRUCache = LRUCache(maxsize=PACKAGE_VALIDATOR_CACHE_SIZE)
+
+
+def _get_package_validator(project_path: str) -> PackageValidator:
+    """Cached PackageValidator for project_path (fresh manifests only)."""
+    signature = registry_signature(project_path)
+    cached = _package_validators.get(project_path)
+    if cached is not None and cached[0] == signature:
+        _package_validators.move_to_end(project_path)
+        return cached[1]
+    validator = PackageValidator(project_path)
+    _package_validators[project_path] = (signature, validator)
+    return validator
+
+
 @handler.register("chainguard_validate_packages")
 async def handle_validate_packages(args: Dict[str, Any]) -> List[TextContent]:
     """Validate package imports against project dependencies.
@@ -4941,7 +5619,7 @@ async def handle_validate_packages(args: Dict[str, Any]) -> List[TextContent]:
     if not file_path and not code:
         return _text("✗ Either 'file' or 'code' parameter required")
 
-    validator = PackageValidator(state.project_path)
+    validator = _get_package_validator(state.project_path)
 
     if file_path:
         full_path = Path(state.project_path) / file_path
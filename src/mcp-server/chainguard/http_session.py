@@ -10,9 +10,14 @@ See LICENSE file in the project root for full license information.
 """
 
 import asyncio
+import importlib.util
 import re
+import urllib.request
+import urllib.error
+import urllib.parse
+import http.cookiejar
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
 from .config import logger, HTTP_REQUEST_TIMEOUT_SECONDS
 from .cache import TTLLRUCache
@@ -21,16 +26,30 @@ from .cache import TTLLRUCache
 MAX_SESSIONS = 50
 SESSION_TTL_SECONDS = 86400  # 24 hours
 
-# HTTP Client imports
-try:
+# Connection pool for endpoint tests (keep-alive across calls)
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 10
+
+# HTTP Client imports (aiohttp itself is imported on first use: it adds
+# ~200 ms to server startup and most sessions never test an endpoint)
+if TYPE_CHECKING:
     import aiohttp
-    HAS_AIOHTTP = True
-except ImportError:
-    HAS_AIOHTTP = False
-    import urllib.request
-    import urllib.error
-    import urllib.parse
-    import http.cookiejar
+
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+
+
+def _import_aiohttp():
+    """Import aiohttp on first use; None if it is missing or fails to import (urllib fallback)."""
+    global HAS_AIOHTTP
+    if not HAS_AIOHTTP:
+        return None
+    try:
+        import aiohttp
+    except ImportError as e:
+        logger.warning(f"aiohttp import failed, using urllib: {e}")
+        HAS_AIOHTTP = False
+        return None
+    return aiohttp
 
 
 class HTTPSessionManager:
@@ -47,6 +66,56 @@ class HTTPSessionManager:
             maxsize=MAX_SESSIONS,
             ttl_seconds=SESSION_TTL_SECONDS
         )
+        # Shared aiohttp client, bound to the event loop that created it
+        self._client = None
+        self._client_loop = None
+
+    async def _get_client(self) -> "aiohttp.ClientSession":
+        """
+        Get the pooled aiohttp client for endpoint tests.
+
+        Connections stay alive between calls, so repeated checks against the
+        same host skip the TCP/TLS handshake. Cookies are not stored in the
+        shared client (DummyCookieJar) - they are passed per request from the
+        project session, keeping projects isolated.
+        """
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._client is not None and not self._client.closed and self._client_loop is not loop:
+            # A client bound to another event loop can't be reused; close it
+            # so its connector isn't leaked
+            await self._close_stale_client(self._client, self._client_loop)
+        if self._client is None or self._client.closed or self._client_loop is not loop:
+            self._client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=HTTP_POOL_LIMIT,
+                    limit_per_host=HTTP_POOL_LIMIT_PER_HOST
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT_SECONDS)
+            )
+            self._client_loop = loop
+        return self._client
+
+    @staticmethod
+    async def _close_stale_client(client: "aiohttp.ClientSession", client_loop) -> None:
+        """Close a pooled client that was created on another event loop."""
+        try:
+            if client_loop is not None and client_loop.is_running():
+                # Its loop still runs in another thread: close it there
+                asyncio.run_coroutine_threadsafe(client.close(), client_loop)
+            else:
+                await client.close()
+        except Exception as e:
+            logger.debug(f"Closing stale HTTP client failed: {e}")
+
+    async def close(self):
+        """Close the pooled HTTP client (call on shutdown)."""
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+        self._client_loop = None
 
     def get_session(self, project_id: str) -> Dict[str, Any]:
         """Get or create session for project."""
@@ -155,7 +224,7 @@ class HTTPSessionManager:
         }
 
         try:
-            if HAS_AIOHTTP:
+            if _import_aiohttp() is not None:
                 result = await self._test_with_aiohttp(url, method, session, data, headers)
             else:
                 result = await self._test_with_urllib(url, method, session, data, headers)
@@ -199,7 +268,8 @@ class HTTPSessionManager:
         result = {"success": False, "error": None}
 
         try:
-            if HAS_AIOHTTP:
+            aiohttp = _import_aiohttp()
+            if aiohttp is not None:
                 async with aiohttp.ClientSession() as http_session:
                     # Step 1: GET login page for CSRF token
                     async with http_session.get(login_url) as resp:
@@ -284,26 +354,30 @@ class HTTPSessionManager:
         """Test endpoint using aiohttp."""
         result = {"status_code": 0, "headers": {}, "body_preview": "", "needs_auth": False, "error": None}
 
-        async with aiohttp.ClientSession(cookies=session.get("cookies", {})) as http_session:
-            req_headers = headers or {}
-            if session.get("csrf_token"):
-                req_headers["X-CSRF-TOKEN"] = session["csrf_token"]
-
-            kwargs = {"headers": req_headers, "allow_redirects": False}
-            if data:
-                kwargs["data" if method == "POST" else "json"] = data
-
-            async with http_session.request(method, url, **kwargs) as resp:
-                result["status_code"] = resp.status
-                result["headers"] = {k.lower(): v for k, v in resp.headers.items()}
-                try:
-                    body = await resp.text()
-                    result["body_preview"] = body[:500]
-                except:
-                    result["body_preview"] = "[binary content]"
-
-                for cookie in resp.cookies.values():
-                    session["cookies"][cookie.key] = cookie.value
+        http_session = await self._get_client()
+        req_headers = headers or {}
+        if session.get("csrf_token"):
+            req_headers["X-CSRF-TOKEN"] = session["csrf_token"]
+
+        kwargs = {
+            "headers": req_headers,
+            "cookies": session.get("cookies", {}),
+            "allow_redirects": False
+        }
+        if data:
+            kwargs["data" if method == "POST" else "json"] = data
+
+        async with http_session.request(method, url, **kwargs) as resp:
+            result["status_code"] = resp.status
+            result["headers"] = {k.lower(): v for k, v in resp.headers.items()}
+            try:
+                body = await resp.text()
+                result["body_preview"] = body[:500]
+            except:
+                result["body_preview"] = "[binary content]"
+
+            for cookie in resp.cookies.values():
+                session["cookies"][cookie.key] = cookie.value
 
         return result
 
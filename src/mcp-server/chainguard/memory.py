@@ -21,8 +21,10 @@ Usage:
 
 import asyncio
 import hashlib
+import heapq
 import json
 import logging
+import os
 import subprocess
 import time
 
@@ -33,13 +35,14 @@ except ImportError:
     AIOFILES_AVAILABLE = False
 from collections import defaultdict
 from dataclasses import dataclass, field
+from operator import attrgetter
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Set
 from concurrent.futures import ThreadPoolExecutor
 
 from .config import CHAINGUARD_HOME
-from .cache import TTLLRUCache, git_cache  # v5.3.1: Bounded cache + git cache
+from .cache import TTLLRUCache, git_cache, resolve_path  # v5.3.1: Bounded cache + git cache
 from .embeddings import embedding_engine, KeywordExtractor, detect_task_type
 
 logger = logging.getLogger("chainguard.memory")
@@ -58,6 +61,10 @@ COLLECTIONS = [
     "code_summaries",      # Deep logic summaries extracted from code (v5.4)
 ]
 
+# Bulk indexing: documents per embedding batch / ChromaDB write
+MEMORY_BATCH_SIZE = 500
+EMBED_BATCH_SIZE = 64  # texts per model forward pass during bulk indexing
+
 # Scoring weights
 SCORING_WEIGHTS = {
     "semantic": 0.60,      # Semantic similarity (main factor)
@@ -143,7 +150,7 @@ def get_project_id(working_dir: str) -> str:
     Note: Uses git_cache to minimize blocking subprocess calls.
     After first call, subsequent calls are instant.
     """
-    resolved_path = str(Path(working_dir).resolve())
+    resolved_path = resolve_path(working_dir)
 
     # v5.3.1: Check cache first to avoid blocking subprocess calls
     cached = git_cache.get(resolved_path)
@@ -224,6 +231,20 @@ class SecurityError(Exception):
     pass
 
 
+def _directory_size(path: str) -> int:
+    """Total size in bytes of all files below path."""
+    total = 0
+    pending = [path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
 class ProjectMemory:
     """
     Memory for a single project.
@@ -340,6 +361,118 @@ class ProjectMemory:
 
         return doc_id
 
+    async def add_batch(
+        self,
+        contents: List[str],
+        collection: str,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        doc_ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None
+    ) -> List[str]:
+        """
+        Add many documents with one embedding batch and one ChromaDB write.
+
+        Same semantics as calling add() per document: repeated IDs within
+        the batch keep the first document (ChromaDB rejects duplicate IDs
+        in a single call). Pass embeddings (aligned with contents) to skip
+        encoding.
+
+        Returns:
+            Document IDs actually submitted
+        """
+        return await self._write_batch(contents, collection, metadatas, doc_ids, embeddings, upsert=False)
+
+    async def upsert_batch(
+        self,
+        contents: List[str],
+        collection: str,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        doc_ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None
+    ) -> List[str]:
+        """
+        Add or update many documents with one embedding batch and one ChromaDB write.
+
+        Same semantics as calling upsert() per document: repeated IDs within
+        the batch keep the last document.
+
+        Returns:
+            Document IDs actually submitted
+        """
+        return await self._write_batch(contents, collection, metadatas, doc_ids, embeddings, upsert=True)
+
+    async def _write_batch(
+        self,
+        contents: List[str],
+        collection: str,
+        metadatas: Optional[List[Dict[str, Any]]],
+        doc_ids: Optional[List[str]],
+        embeddings: Optional[List[List[float]]],
+        upsert: bool
+    ) -> List[str]:
+        if not contents:
+            return []
+
+        await self._ensure_initialized()
+        self.last_access = time.time()
+
+        coll = self._collections.get(collection)
+        if not coll:
+            raise ValueError(f"Unknown collection: {collection}")
+
+        now = datetime.now().isoformat()
+        ids: List[str] = []
+        documents: List[str] = []
+        metas: List[Dict[str, Any]] = []
+        vectors: List[List[float]] = []
+        positions: Dict[str, int] = {}
+
+        for i, content in enumerate(contents):
+            doc_id = doc_ids[i] if doc_ids else None
+            if not doc_id:
+                doc_id = hashlib.sha256(
+                    f"{collection}:{content[:100]}".encode()
+                ).hexdigest()[:16]
+
+            meta = (metadatas[i] if metadatas else None) or {}
+            meta["updated_at"] = now
+            meta["collection"] = collection
+
+            pos = positions.get(doc_id)
+            if pos is not None:
+                if upsert:
+                    # Later document wins, like consecutive upserts
+                    documents[pos] = content
+                    metas[pos] = meta
+                    if embeddings is not None:
+                        vectors[pos] = embeddings[i]
+                continue
+            positions[doc_id] = len(ids)
+
+            ids.append(doc_id)
+            documents.append(content)
+            metas.append(meta)
+            if embeddings is not None:
+                vectors.append(embeddings[i])
+
+        if embeddings is None:
+            # Generate all embeddings in one model call
+            vectors = (await embedding_engine.encode(documents, batch_size=EMBED_BATCH_SIZE)).embeddings
+
+        write = coll.upsert if upsert else coll.add
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            self._executor,
+            lambda: write(
+                ids=ids,
+                embeddings=vectors,
+                documents=documents,
+                metadatas=metas
+            )
+        )
+
+        return ids
+
     async def upsert(
         self,
         content: str,
@@ -412,8 +545,6 @@ class ProjectMemory:
         # Generate query embedding
         query_embedding = await embedding_engine.encode_single(query_text)
 
-        results: List[Tuple[MemoryDocument, float]] = []
-
         # Determine which collections to search
         if collection == "all":
             collections_to_search = list(self._collections.items())
@@ -423,35 +554,42 @@ class ProjectMemory:
                 return []
             collections_to_search = [(collection, coll)]
 
-        # Search each collection
+        # Search the collections concurrently (each is its own HNSW index)
         loop = asyncio.get_event_loop()
-        for coll_name, coll in collections_to_search:
+
+        async def _search(coll_name: str, coll) -> List[Tuple[MemoryDocument, float]]:
             try:
                 hits = await loop.run_in_executor(
                     self._executor,
-                    lambda c=coll: c.query(
+                    lambda: coll.query(
                         query_embeddings=[query_embedding],
                         n_results=n_results,
                         where=where,
                         include=["documents", "metadatas", "distances"]
                     )
                 )
-
-                # Process results
-                if hits and hits.get("ids") and hits["ids"][0]:
-                    for i, doc_id in enumerate(hits["ids"][0]):
-                        doc = MemoryDocument(
-                            id=doc_id,
-                            content=hits["documents"][0][i] if hits.get("documents") else "",
-                            metadata=hits["metadatas"][0][i] if hits.get("metadatas") else {}
-                        )
-                        doc.metadata["_collection"] = coll_name
-                        distance = hits["distances"][0][i] if hits.get("distances") else 1.0
-                        results.append((doc, distance))
-
             except Exception as e:
                 logger.warning(f"Query error in {coll_name}: {e}")
-                continue
+                return []
+
+            # Process results
+            found = []
+            if hits and hits.get("ids") and hits["ids"][0]:
+                for i, doc_id in enumerate(hits["ids"][0]):
+                    doc = MemoryDocument(
+                        id=doc_id,
+                        content=hits["documents"][0][i] if hits.get("documents") else "",
+                        metadata=hits["metadatas"][0][i] if hits.get("metadatas") else {}
+                    )
+                    doc.metadata["_collection"] = coll_name
+                    distance = hits["distances"][0][i] if hits.get("distances") else 1.0
+                    found.append((doc, distance))
+            return found
+
+        per_collection = await asyncio.gather(
+            *(_search(coll_name, coll) for coll_name, coll in collections_to_search)
+        )
+        results = [hit for hits in per_collection for hit in hits]
 
         # Sort by distance (lower is better)
         results.sort(key=lambda x: x[1])
@@ -505,6 +643,36 @@ class ProjectMemory:
 
         return 0
 
+    async def update_metadatas(self, collection: str, metadatas: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Replace the metadata of existing documents (content and embeddings stay).
+
+        Args:
+            collection: Target collection
+            metadatas: Dict of document ID -> complete new metadata
+
+        Returns:
+            Number of updated documents
+        """
+        if not metadatas:
+            return 0
+
+        await self._ensure_initialized()
+        self.last_access = time.time()
+
+        coll = self._collections.get(collection)
+        if not coll:
+            return 0
+
+        ids = list(metadatas)
+        metas = [metadatas[doc_id] for doc_id in ids]
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            self._executor,
+            lambda: coll.update(ids=ids, metadatas=metas)
+        )
+        return len(ids)
+
     async def get_all(
         self,
         collection: str
@@ -552,6 +720,41 @@ class ProjectMemory:
             logger.warning(f"get_all error in {collection}: {e}")
             return []
 
+    async def get_metadatas(self, collection: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metadata of all documents in a collection (no content or embeddings).
+
+        Args:
+            collection: Collection name
+
+        Returns:
+            Dict of document ID -> metadata
+        """
+        await self._ensure_initialized()
+        self.last_access = time.time()
+
+        coll = self._collections.get(collection)
+        if not coll:
+            return {}
+
+        loop = asyncio.get_event_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor,
+                lambda: coll.get(include=["metadatas"])
+            )
+            if not results or not results.get("ids"):
+                return {}
+            metadatas = results.get("metadatas") or []
+            return {
+                doc_id: (metadatas[i] if i < len(metadatas) else None) or {}
+                for i, doc_id in enumerate(results["ids"])
+            }
+
+        except Exception as e:
+            logger.warning(f"get_metadatas error in {collection}: {e}")
+            return {}
+
     async def get(
         self,
         doc_id: str,
@@ -696,16 +899,11 @@ class ProjectMemory:
         """Get statistics about this project's memory."""
         await self._ensure_initialized()
 
-        collections_stats = {}
-        total = 0
-
-        for name, coll in self._collections.items():
-            try:
-                count = coll.count()
-                collections_stats[name] = count
-                total += count
-            except Exception:
-                collections_stats[name] = 0
+        # Collection counts + storage size are blocking - run them off the event loop
+        loop = asyncio.get_event_loop()
+        collections_stats, total, storage_size = await loop.run_in_executor(
+            self._executor, self._collect_stats
+        )
 
         # Load metadata (v5.3.1: async file I/O if available)
         initialized_at = None
@@ -724,16 +922,6 @@ class ProjectMemory:
             except Exception:
                 pass
 
-        # Calculate storage size
-        storage_size = 0.0
-        try:
-            for f in self.path.rglob("*"):
-                if f.is_file():
-                    storage_size += f.stat().st_size
-            storage_size /= (1024 * 1024)  # Convert to MB
-        except Exception:
-            pass
-
         return MemoryStats(
             project_id=self.project_id,
             initialized_at=initialized_at,
@@ -743,6 +931,28 @@ class ProjectMemory:
             storage_size_mb=round(storage_size, 2)
         )
 
+    def _collect_stats(self) -> Tuple[Dict[str, int], int, float]:
+        """Document count per collection, total count and storage size in MB."""
+        collections_stats = {}
+        total = 0
+
+        for name, coll in self._collections.items():
+            try:
+                count = coll.count()
+                collections_stats[name] = count
+                total += count
+            except Exception:
+                collections_stats[name] = 0
+
+        # Calculate storage size (one stat per file)
+        storage_size = 0.0
+        try:
+            storage_size = _directory_size(str(self.path)) / (1024 * 1024)  # Convert to MB
+        except Exception:
+            pass
+
+        return collections_stats, total, storage_size
+
     async def save_metadata(self, **kwargs):
         """Save metadata about this memory (v5.3.1: async file I/O)."""
         existing = {}
@@ -789,6 +999,84 @@ class ProjectMemory:
                 logger.warning(f"Error shutting down executor: {e}")
 
 
+class MemoryBatch:
+    """
+    Buffers documents and writes them via add_batch() (or upsert_batch()).
+
+    Used by bulk indexing (memory_init, memory_summarize) so the embedding
+    model and ChromaDB see batches instead of one document per call. All
+    queued texts - file summaries, functions and logic summaries alike - are
+    embedded in one model call per flush, then written with one add/upsert
+    per collection. Call flush() at the end.
+
+    A failed flush does not raise: its documents are dropped and the error
+    is recorded in errors. written holds the IDs actually stored (per
+    collection), so callers count what was written, not what was queued.
+    """
+
+    def __init__(self, memory: ProjectMemory, batch_size: int = MEMORY_BATCH_SIZE, upsert: bool = False):
+        self.memory = memory
+        self.batch_size = batch_size
+        self.upsert = upsert
+        self._pending: Dict[str, Tuple[List[str], List[Dict[str, Any]], List[str]]] = {}
+        self._count = 0
+        self.written: Dict[str, List[str]] = {}
+        self.errors: List[str] = []
+
+    async def add(
+        self,
+        content: str,
+        collection: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        doc_id: Optional[str] = None
+    ):
+        """Queue a document; flushes once batch_size documents are queued."""
+        contents, metadatas, ids = self._pending.setdefault(collection, ([], [], []))
+        contents.append(content)
+        metadatas.append(metadata or {})
+        ids.append(doc_id or "")
+        self._count += 1
+        if self._count >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> List[str]:
+        """
+        Embed all queued documents in one call and write them.
+
+        Returns:
+            Document IDs written by this flush
+        """
+        if not self._count:
+            return []
+        pending, count = self._pending, self._count
+        self._pending, self._count = {}, 0
+
+        texts = [text for contents, _, _ in pending.values() for text in contents]
+        try:
+            vectors = (await embedding_engine.encode(texts, batch_size=EMBED_BATCH_SIZE)).embeddings
+        except Exception as e:
+            self.errors.append(f"Batch write ({count} docs): {str(e)[:30]}")
+            return []
+
+        write = self.memory.upsert_batch if self.upsert else self.memory.add_batch
+        written: List[str] = []
+        offset = 0
+        for collection, (contents, metadatas, ids) in pending.items():
+            end = offset + len(contents)
+            try:
+                stored = await write(contents, collection, metadatas, ids, embeddings=vectors[offset:end])
+            except Exception as e:
+                self.errors.append(f"Batch write {collection} ({len(contents)} docs): {str(e)[:30]}")
+            else:
+                self.written.setdefault(collection, []).extend(stored)
+                written.extend(stored)
+            offset = end
+        return written
+
+
+_final_score = attrgetter("final_score")
+
+
 class RelevanceScorer:
     """Calculates relevance scores for memory results."""
 
@@ -811,6 +1099,47 @@ class RelevanceScorer:
             task_type: Type of task (bug, feature, database, etc.)
             collection: Source collection name
         """
+        return cls._score(
+            document, semantic_distance, keywords,
+            TYPE_BONUSES.get(task_type, {}), collection, datetime.now()
+        )
+
+    @classmethod
+    def score_batch(
+        cls,
+        results: List[Tuple[MemoryDocument, float]],
+        keywords: List[str],
+        task_type: str = "general",
+        top_k: Optional[int] = None
+    ) -> List[ScoredResult]:
+        """
+        Score (document, distance) pairs from a query, best first.
+
+        Per-query work (type bonuses, current time) is done once for the
+        whole batch; with top_k only the best top_k results are kept.
+        """
+        type_bonuses = TYPE_BONUSES.get(task_type, {})
+        now = datetime.now()
+        scored = [
+            cls._score(doc, distance, keywords, type_bonuses,
+                       doc.metadata.get("_collection", "unknown"), now)
+            for doc, distance in results
+        ]
+        if top_k is not None and top_k < len(scored):
+            return heapq.nlargest(top_k, scored, key=_final_score)
+        scored.sort(key=_final_score, reverse=True)
+        return scored
+
+    @classmethod
+    def _score(
+        cls,
+        document: MemoryDocument,
+        semantic_distance: float,
+        keywords: List[str],
+        type_bonuses: Dict[str, float],
+        collection: str,
+        now: datetime
+    ) -> ScoredResult:
         # 1. Semantic score (convert distance to similarity)
         # ChromaDB cosine distance: 0 = same, 2 = opposite
         semantic_score = 1.0 - (semantic_distance / 2.0)
@@ -822,11 +1151,11 @@ class RelevanceScorer:
 
         # 3. Recency score
         updated_at = document.metadata.get("updated_at", "")
-        recency_score = cls._calculate_recency(updated_at)
+        recency_score = cls._calculate_recency(updated_at, now)
 
         # 4. Type bonus
         doc_type = document.metadata.get("type", "")
-        type_bonus = TYPE_BONUSES.get(task_type, {}).get(doc_type, 0)
+        type_bonus = type_bonuses.get(doc_type, 0)
 
         # 5. Calculate final score
         final_score = (
@@ -849,7 +1178,7 @@ class RelevanceScorer:
         )
 
     @staticmethod
-    def _calculate_recency(updated_at: str) -> float:
+    def _calculate_recency(updated_at: str, now: Optional[datetime] = None) -> float:
         """
         Calculate recency score based on timestamp.
 
@@ -863,7 +1192,7 @@ class RelevanceScorer:
 
         try:
             updated = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-            age = datetime.now() - updated.replace(tzinfo=None)
+            age = (now or datetime.now()) - updated.replace(tzinfo=None)
 
             if age.days < 1:
                 return 1.0
@@ -1180,20 +1509,8 @@ class SmartContextInjector:
         if not raw_results:
             return "\n📚 Memory: Keine stark relevanten Einträge gefunden."
 
-        # Score results
-        scored_results = []
-        for doc, distance in raw_results:
-            scored = RelevanceScorer.score(
-                document=doc,
-                semantic_distance=distance,
-                keywords=expanded_keywords,
-                task_type=task_type,
-                collection=doc.metadata.get("_collection", "unknown")
-            )
-            scored_results.append(scored)
-
-        # Sort by score
-        scored_results.sort(key=lambda x: x.final_score, reverse=True)
+        # Score and sort results
+        scored_results = RelevanceScorer.score_batch(raw_results, expanded_keywords, task_type)
 
         # Filter by relevance threshold
         relevant_results = [r for r in scored_results if r.final_score > 0.5]
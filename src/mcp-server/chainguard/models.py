@@ -11,11 +11,18 @@ See LICENSE file in the project root for full license information.
 import json
 import fnmatch
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 from typing import Dict, Any, List, Optional
 
+# Optional: faster state serialization (falls back to json)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from .config import (
-    CONFIG, MAX_RECENT_ACTIONS, MAX_OUT_OF_SCOPE_FILES,
+    CONFIG, MAX_RECENT_ACTIONS, ACTION_SAMPLE_INTERVAL, MAX_OUT_OF_SCOPE_FILES,
     MAX_CHANGED_FILES, DB_SCHEMA_CHECK_TTL, DB_SCHEMA_PATTERNS,
     TaskMode, get_mode_features
 )
@@ -33,6 +40,10 @@ class ScopeDefinition:
     created_at: str = ""
 
 
+# ProjectState fields that only live in memory (excluded from to_dict/to_json)
+_TRANSIENT_FIELDS = frozenset({"_sampled_action_count", "_group_cache"})
+
+
 @dataclass
 class ProjectState:
     """
@@ -104,8 +115,21 @@ class ProjectState:
     # Symbol Validation Warnings (v6.4.1) - collected during session, shown at finish
     symbol_warnings: List[str] = field(default_factory=list)
 
+    # Runtime only (see _TRANSIENT_FIELDS): never persisted
+    _sampled_action_count: int = field(default=0, init=False, repr=False, compare=False)
+    _group_cache: Dict[str, tuple] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Persisted fields as a dict (runtime-only fields are left out)."""
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name not in _TRANSIENT_FIELDS}
+        if self.scope is not None:
+            data["scope"] = asdict(self.scope)
+        return data
+
     def to_json(self) -> str:
-        return json.dumps(asdict(self), indent=2, default=str, ensure_ascii=False)
+        if HAS_ORJSON:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode()
+        return json.dumps(self.to_dict(), indent=2, default=str, ensure_ascii=False)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ProjectState":
@@ -163,8 +187,8 @@ class ProjectState:
         for key, value in defaults.items():
             data.setdefault(key, value)
 
-        # Filter to only known fields
-        known_fields = {f.name for f in cls.__dataclass_fields__.values()}
+        # Filter to only known fields (runtime-only fields are not init arguments)
+        known_fields = {f.name for f in fields(cls) if f.init}
         filtered_data = {k: v for k, v in data.items() if k in known_fields}
 
         return cls(**filtered_data)
@@ -235,6 +259,21 @@ class ProjectState:
         if len(self.recent_actions) > MAX_RECENT_ACTIONS:
             self.recent_actions = self.recent_actions[-MAX_RECENT_ACTIONS:]
 
+    def add_action_sampled(self, action: str, every: int = ACTION_SAMPLE_INTERVAL) -> bool:
+        """
+        Add a read-only action, but only on every Nth call.
+
+        Informational tools (recall, db_table) would otherwise push real
+        edits out of the short action log and cause a state write per call.
+        Returns True if the action was recorded and the state needs saving.
+        """
+        count = self._sampled_action_count
+        self._sampled_action_count = count + 1
+        if count % every:
+            return False
+        self.add_action(action)
+        return True
+
     def get_status_line(self) -> str:
         """Ultra-compact one-line status."""
         flags = []
@@ -512,6 +551,7 @@ class ProjectState:
         })
         if len(self.sources) > 100:
             self.sources = self.sources[-100:]
+        self._group_cache.pop("sources", None)
 
     def add_fact(self, fact: str, source: str = "", confidence: str = "likely"):
         """
@@ -526,6 +566,37 @@ class ProjectState:
         })
         if len(self.facts) > 200:
             self.facts = self.facts[-200:]
+        self._group_cache.pop("facts", None)
+
+    def sources_by_relevance(self) -> Dict[str, List[Dict[str, Any]]]:
+        """v5.0: Sources grouped into high/medium/low (cached until sources change)."""
+        return self._grouped("sources", "relevance", ("high", "medium", "low"))
+
+    def facts_by_confidence(self) -> Dict[str, List[Dict[str, Any]]]:
+        """v5.0: Facts grouped into verified/likely/uncertain (cached until facts change)."""
+        return self._grouped("facts", "confidence", ("verified", "likely", "uncertain"))
+
+    def _grouped(self, attr: str, key: str, buckets: tuple) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Group a record list by key in one pass, memoized per list.
+
+        add_source/add_fact drop the cached groups; a list assigned directly
+        (e.g. a reset) is caught by its identity and length. _group_cache is
+        a transient field and never persisted.
+        """
+        items = getattr(self, attr)
+        cache = self._group_cache
+        cached = cache.get(attr)
+        if cached is not None and cached[0] is items and cached[1] == len(items):
+            return cached[2]
+
+        groups: Dict[str, List[Dict[str, Any]]] = {b: [] for b in buckets}
+        for item in items:
+            bucket = groups.get(item.get(key))
+            if bucket is not None:
+                bucket.append(item)
+        cache[attr] = (items, len(items), groups)
+        return groups
 
     def update_word_count(self, count: int):
         """v5.0: Update total word count (Content mode)."""
@@ -27,6 +27,25 @@ from .symbol_patterns import Language, detect_language
 
 logger = logging.getLogger(__name__)
 
+# Dependency manifests and install dirs PackageRegistry reads; a change to
+# any of them (mtime) makes a cached registry stale
+REGISTRY_SOURCES = (
+    'composer.json', 'composer.lock', os.path.join('vendor', 'composer', 'installed.json'), 'vendor',
+    'package.json', 'node_modules',
+    'requirements.txt', 'requirements-dev.txt', 'requirements-test.txt', 'pyproject.toml', 'setup.py',
+)
+
+
+def registry_signature(working_dir: str) -> Tuple[Optional[int], ...]:
+    """mtime_ns of each REGISTRY_SOURCES entry in working_dir (None if missing)."""
+    signature = []
+    for name in REGISTRY_SOURCES:
+        try:
+            signature.append(os.stat(os.path.join(working_dir, name)).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
 
 # =============================================================================
 # DATA CLASSES
@@ -178,6 +197,9 @@ PHP_BUILTINS: Set[str] = {
 # Maps Composer package names to their PHP namespaces
 # =============================================================================
 
+# Lowercased PYTHON_STDLIB for the case-insensitive lookup in _is_stdlib
+_PYTHON_STDLIB_LOWER = frozenset(s.lower() for s in PYTHON_STDLIB)
+
 PHP_NAMESPACE_MAPPING: Dict[str, List[str]] = {
     # Laravel/Illuminate
     'laravel/framework': [
@@ -305,6 +327,18 @@ PYTHON_FROM_IMPORT_PATTERN = re.compile(
     re.MULTILINE
 )
 
+# Registry parsing (requirements.txt lines, pyproject.toml, setup.py)
+REQUIREMENT_NAME_PATTERN = re.compile(r'^([a-zA-Z0-9_-]+)')
+PYPROJECT_DEP_PATTERN = re.compile(r'^\s*([a-zA-Z0-9_-]+)\s*[=<>]', re.MULTILINE)
+SETUP_INSTALL_REQUIRES_PATTERN = re.compile(r'install_requires\s*=\s*\[(.*?)\]', re.DOTALL)
+SETUP_DEP_NAME_PATTERN = re.compile(r"['\"]([a-zA-Z0-9_-]+)")
+
+# CamelCase words of a PHP vendor namespace (GuzzleHttp -> Guzzle, Http)
+CAMEL_WORD_PATTERN = re.compile(r'[A-Z][a-z]*')
+
+# Characters never found in legitimate package names
+SUSPICIOUS_PACKAGE_CHARS = re.compile(r'[^a-zA-Z0-9_\-/@.]')
+
 
 # =============================================================================
 # LEVENSHTEIN DISTANCE - For typo/slopsquatting detection
@@ -331,6 +365,28 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     return previous_row[-1]
 
 
+def _levenshtein_within(s1: str, s2: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit."""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            current_row.append(min(
+                previous_row[j + 1] + 1,
+                current_row[j] + 1,
+                previous_row[j] + (c1 != c2),
+            ))
+        # Row minima never decrease: no cheaper path can follow
+        if min(current_row) > limit:
+            return limit + 1
+        previous_row = current_row
+
+    return min(previous_row[-1], limit + 1)
+
+
 def find_similar_packages(
     package: str,
     known_packages: Set[str],
@@ -350,7 +406,7 @@ def find_similar_packages(
         if abs(len(package) - len(known)) > max_distance:
             continue
 
-        distance = levenshtein_distance(package_lower, known_lower)
+        distance = _levenshtein_within(package_lower, known_lower, max_distance)
 
         if 0 < distance <= max_distance:
             similar.append((known, distance))
@@ -498,7 +554,7 @@ class PackageRegistry:
 
     def __init__(self, working_dir: str):
         self.working_dir = Path(working_dir)
-        self._cache: Dict[str, Set[str]] = {}
+        self._cache: Dict[str, Tuple[Set[str], bool]] = {}
         self._namespace_cache: Dict[str, Set[str]] = {}
 
     def get_installed_namespaces(self) -> Set[str]:
@@ -649,7 +705,7 @@ class PackageRegistry:
             vendor_variants = [
                 vendor_name,
                 vendor_name.replace('http', '-http'),  # GuzzleHttp → guzzlehttp
-                '-'.join(re.findall(r'[A-Z][a-z]*', parts[0])).lower(),  # CamelCase → kebab-case
+                '-'.join(CAMEL_WORD_PATTERN.findall(parts[0])).lower(),  # CamelCase → kebab-case
             ]
 
             for vendor in vendor_variants:
@@ -733,7 +789,7 @@ class PackageRegistry:
         """
         cache_key = 'composer'
         if cache_key in self._cache:
-            return self._cache[cache_key], True
+            return self._cache[cache_key]
 
         packages: Set[str] = set()
         composer_json = self.working_dir / 'composer.json'
@@ -798,7 +854,7 @@ class PackageRegistry:
                         if package.is_dir() and not package.name.startswith('.'):
                             packages.add(f"{vendor.name}/{package.name}")
 
-        self._cache[cache_key] = packages
+        self._cache[cache_key] = (packages, found)
         return packages, found
 
     def get_npm_packages(self) -> Tuple[Set[str], bool]:
@@ -808,7 +864,7 @@ class PackageRegistry:
         """
         cache_key = 'npm'
         if cache_key in self._cache:
-            return self._cache[cache_key], True
+            return self._cache[cache_key]
 
         packages: Set[str] = set()
         package_json = self.working_dir / 'package.json'
@@ -845,7 +901,7 @@ class PackageRegistry:
                     elif not item.name.startswith('.'):
                         packages.add(item.name)
 
-        self._cache[cache_key] = packages
+        self._cache[cache_key] = (packages, True)
         return packages, True
 
     def get_pip_packages(self) -> Tuple[Set[str], bool]:
@@ -855,7 +911,7 @@ class PackageRegistry:
         """
         cache_key = 'pip'
         if cache_key in self._cache:
-            return self._cache[cache_key], True
+            return self._cache[cache_key]
 
         packages: Set[str] = set()
         found = False
@@ -871,7 +927,7 @@ class PackageRegistry:
                             line = line.strip()
                             if line and not line.startswith('#') and not line.startswith('-'):
                                 # Extract package name (before version specifier)
-                                match = re.match(r'^([a-zA-Z0-9_-]+)', line)
+                                match = REQUIREMENT_NAME_PATTERN.match(line)
                                 if match:
                                     packages.add(match.group(1).lower())
                 except IOError as e:
@@ -887,8 +943,7 @@ class PackageRegistry:
 
                 # Simple regex extraction (not a full TOML parser)
                 # Match dependencies in [project.dependencies] or [tool.poetry.dependencies]
-                dep_pattern = re.compile(r'^\s*([a-zA-Z0-9_-]+)\s*[=<>]', re.MULTILINE)
-                for match in dep_pattern.finditer(content):
+                for match in PYPROJECT_DEP_PATTERN.finditer(content):
                     packages.add(match.group(1).lower())
 
             except IOError as e:
@@ -903,16 +958,16 @@ class PackageRegistry:
                     content = f.read()
 
                 # Extract from install_requires
-                match = re.search(r'install_requires\s*=\s*\[(.*?)\]', content, re.DOTALL)
+                match = SETUP_INSTALL_REQUIRES_PATTERN.search(content)
                 if match:
                     deps = match.group(1)
-                    for dep_match in re.finditer(r"['\"]([a-zA-Z0-9_-]+)", deps):
+                    for dep_match in SETUP_DEP_NAME_PATTERN.finditer(deps):
                         packages.add(dep_match.group(1).lower())
 
             except IOError as e:
                 logger.warning(f"Failed to read setup.py: {e}")
 
-        self._cache[cache_key] = packages
+        self._cache[cache_key] = (packages, found)
         return packages, found
 
     def get_packages(self, lang: Language) -> Tuple[Set[str], bool]:
@@ -984,6 +1039,9 @@ class PackageValidator:
         # Get known packages
         known_packages, registry_found = self.registry.get_packages(lang)
 
+        # Lowercased once for the case-insensitive checks of every import
+        known_lower = {p.lower() for p in known_packages}
+
         # Get standard library for filtering
         stdlib = self._get_stdlib(lang)
 
@@ -998,7 +1056,7 @@ class PackageValidator:
                 continue
 
             # Check if package is known
-            if self._is_known_package(package, lang, known_packages):
+            if self._is_known_package(package, lang, known_packages, known_lower):
                 continue
 
             # Package not found - create issue
@@ -1037,7 +1095,8 @@ class PackageValidator:
 
         # Case-insensitive for Python
         if lang == Language.PYTHON:
-            if package.lower() in {s.lower() for s in stdlib}:
+            stdlib_lower = _PYTHON_STDLIB_LOWER if stdlib is PYTHON_STDLIB else {s.lower() for s in stdlib}
+            if package.lower() in stdlib_lower:
                 return True
 
         # PHP: Check if it's a built-in class
@@ -1053,17 +1112,23 @@ class PackageValidator:
         self,
         package: str,
         lang: Language,
-        known_packages: Set[str]
+        known_packages: Set[str],
+        known_lower: Optional[Set[str]] = None
     ) -> bool:
-        """Check if package is in the known packages list."""
+        """Check if package is in the known packages list.
+
+        known_lower: known_packages lowercased (computed if not given)
+        """
         # Direct match
         if package in known_packages:
             return True
 
+        if known_lower is None:
+            known_lower = {p.lower() for p in known_packages}
+
         # Case-insensitive match for npm/pip
         if lang in (Language.JAVASCRIPT, Language.TYPESCRIPT, Language.PYTHON):
-            package_lower = package.lower()
-            if any(p.lower() == package_lower for p in known_packages):
+            if package.lower() in known_lower:
                 return True
 
         # PHP: Check namespace against installed packages
@@ -1075,7 +1140,7 @@ class PackageValidator:
             # PRIORITY 2: Static namespace mapping (fallback for projects without vendor/)
             package_with_slash = package + '\\'
             for composer_pkg, namespaces in PHP_NAMESPACE_MAPPING.items():
-                if composer_pkg in known_packages or composer_pkg.lower() in {p.lower() for p in known_packages}:
+                if composer_pkg in known_packages or composer_pkg.lower() in known_lower:
                     for ns in namespaces:
                         ns_clean = ns.rstrip('\\')
                         if package == ns_clean or package.startswith(ns_clean + '\\'):
@@ -1187,7 +1252,7 @@ class PackageValidator:
             confidence *= 1.2
 
         # Package with weird characters (potential attack)
-        if re.search(r'[^a-zA-Z0-9_\-/@.]', package):
+        if SUSPICIOUS_PACKAGE_CHARS.search(package):
             confidence = 0.98
 
         return min(1.0, max(0.0, confidence))
@@ -20,7 +20,7 @@ from .config import (
     CHAINGUARD_HOME, DEBOUNCE_DELAY_SECONDS,
     MAX_PROJECTS_IN_CACHE, logger
 )
-from .cache import LRUCache, AsyncFileLock, git_cache
+from .cache import LRUCache, AsyncFileLock, git_cache, resolve_path
 from .models import ProjectState
 
 # Async file I/O
@@ -39,10 +39,14 @@ class ProjectManager:
     - Async I/O (non-blocking)
     - Write debouncing (batched saves)
     - Git call caching
+    - Path resolution caching (hot get_async path)
+    - Skips writes whose content is already on disk
     """
 
     def __init__(self):
         self.cache: LRUCache = LRUCache(maxsize=MAX_PROJECTS_IN_CACHE)
+        # project_id -> last state JSON written to disk
+        self._written: LRUCache = LRUCache(maxsize=MAX_PROJECTS_IN_CACHE)
         self._default_project_id: Optional[str] = None
         self._dirty: Set[str] = set()
         self._save_task: Optional[asyncio.Task] = None
@@ -50,7 +54,7 @@ class ProjectManager:
 
     async def _get_project_id_async(self, path: str) -> str:
         """Get project ID using async subprocess with caching."""
-        path = str(Path(path).resolve())
+        path = resolve_path(path)
 
         cached = git_cache.get(path)
         if cached:
@@ -94,7 +98,7 @@ class ProjectManager:
     def _get_project_id_sync(self, path: str) -> str:
         """Sync fallback for non-async contexts."""
         import subprocess
-        path = str(Path(path).resolve())
+        path = resolve_path(path)
 
         cached = git_cache.get(path)
         if cached:
@@ -133,13 +137,13 @@ class ProjectManager:
 
     async def resolve_working_dir_async(self, working_dir: Optional[str] = None) -> str:
         if working_dir and working_dir.strip():
-            resolved = str(Path(working_dir).resolve())
+            resolved = resolve_path(working_dir)
             self._default_project_id = await self._get_project_id_async(resolved)
             return resolved
 
         env_path = os.environ.get("CHAINGUARD_PROJECT_PATH")
         if env_path:
-            return str(Path(env_path).resolve())
+            return resolve_path(env_path)
 
         if self._default_project_id and self._default_project_id in self.cache:
             return self.cache[self._default_project_id].project_path
@@ -226,30 +230,49 @@ class ProjectManager:
                 self._save_task = asyncio.create_task(self._debounced_save())
 
     async def _debounced_save(self):
-        """Debounced save - waits then saves all dirty states."""
-        await asyncio.sleep(self._debounce_delay)
-
-        dirty_copy = self._dirty.copy()
-        self._dirty.clear()
+        """
+        Debounced save - waits then saves all dirty states.
+
+        Keeps going until nothing is dirty, so saves requested while a write
+        is in progress are coalesced into the next round instead of waiting
+        for another save_async call. A project leaves the dirty set only
+        right before its write and is put back if that write is cancelled or
+        fails, so flush() cancelling this task mid-way still sees every
+        unwritten project.
+        """
+        while self._dirty:
+            await asyncio.sleep(self._debounce_delay)
 
-        for project_id in dirty_copy:
-            if project_id in self.cache:
-                await self._write_state(self.cache[project_id])
+            for project_id in list(self._dirty):
+                self._dirty.discard(project_id)
+                if project_id in self.cache:
+                    try:
+                        await self._write_state(self.cache[project_id])
+                    except BaseException:
+                        self._dirty.add(project_id)
+                        raise
 
     async def _write_state(self, state: ProjectState):
         """Actually write state to disk."""
+        content = state.to_json()
         state_path = self._get_state_path(state.project_id)
+        # Nothing changed since the last write and the file is still there -
+        # skip file, lock and hook state
+        if (state.project_id in self._written and self._written[state.project_id] == content
+                and state_path.exists()):
+            return
+
         await self._makedirs_async(state_path.parent)
 
         lock = await AsyncFileLock.acquire(state_path)
         async with lock:
-            content = state.to_json()
             if HAS_AIOFILES:
                 async with aiofiles.open(state_path, 'w') as f:
                     await f.write(content)
             else:
                 with open(state_path, 'w') as f:
                     f.write(content)
+        self._written[state.project_id] = content
 
         # v4.17: Write enforcement-state for Hook
         await self._write_enforcement_state(state)
@@ -383,7 +406,7 @@ class ProjectManager:
         # Running loop - use sync file I/O fallback
         resolved_path = working_dir or os.getcwd()
         if working_dir:
-            resolved_path = str(Path(working_dir).resolve())
+            resolved_path = resolve_path(working_dir)
         project_id = self._get_project_id_sync(resolved_path)
 
         if project_id in self.cache:
@@ -22,8 +22,9 @@ except ImportError:
 
 from .config import VERSION, logger
 from .tools import get_tool_definitions
-from .handlers import handle_tool_call
+from .handlers import handle_tool_call, shutdown_index_process_pool
 from .project_manager import project_manager as pm
+from .http_session import http_session_manager
 
 # Check for aiofiles
 try:
@@ -131,12 +132,19 @@ async def main():
     finally:
         logger.info("Flushing pending saves...")
         try:
-            await pm.flush()
-            logger.info("Chainguard MCP Server shutdown complete")
-        except RuntimeError as e:
-            # Some writes failed - log but don't crash (data stays in dirty set)
-            logger.error(f"Shutdown with errors: {e}")
-            logger.warning("Some project states may not have been saved")
+            try:
+                await pm.flush()
+                logger.info("Chainguard MCP Server shutdown complete")
+            except RuntimeError as e:
+                # Some writes failed - log but don't crash (data stays in dirty set)
+                logger.error(f"Shutdown with errors: {e}")
+                logger.warning("Some project states may not have been saved")
+        finally:
+            # Release the HTTP pool and index workers even if the flush failed
+            try:
+                await http_session_manager.close()
+            finally:
+                shutdown_index_process_pool()
 
 
 def run():
@@ -10,15 +10,24 @@ v2.2: Added lazy-loading of PHP builtins from generated JSON (5000+ functions)
 """
 
 import json
+import os
 import re
 import logging
 from pathlib import Path
-from typing import Dict, List, Set, Pattern, Optional
+from typing import Dict, FrozenSet, List, Set, Pattern, Optional
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Optional: faster parsing of the PHP builtins JSON (falls back to json)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 class Language(Enum):
     """Supported programming languages."""
@@ -787,9 +796,9 @@ class PHPBuiltinsLoader:
     """
 
     _loaded: bool = False
-    _functions: Set[str] = set()
-    _classes: Set[str] = set()
-    _methods: Set[str] = set()
+    _functions: FrozenSet[str] = frozenset()
+    _classes: FrozenSet[str] = frozenset()
+    _methods: FrozenSet[str] = frozenset()
 
     @classmethod
     def load(cls) -> None:
@@ -808,18 +817,17 @@ class PHPBuiltinsLoader:
             return
 
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Both parsers accept the raw UTF-8 bytes (no decode pass)
+            raw = json_path.read_bytes()
+            data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
 
             symbols = data.get('symbols', {})
-            cls._functions = set(symbols.get('functions', []))
-            cls._classes = set(symbols.get('classes', []))
-            cls._methods = set(symbols.get('methods', []))
+            cls._functions = frozenset(symbols.get('functions', ()))
+            cls._classes = frozenset(symbols.get('classes', ()))
+            cls._methods = frozenset(symbols.get('methods', ()))
 
             # Merge into global BUILTINS
-            BUILTINS[Language.PHP].update(cls._functions)
-            BUILTINS[Language.PHP].update(cls._classes)
-            BUILTINS[Language.PHP].update(cls._methods)
+            BUILTINS[Language.PHP].update(cls._functions, cls._classes, cls._methods)
 
             stats = data.get('stats', {})
             logger.debug(
@@ -835,19 +843,19 @@ class PHPBuiltinsLoader:
             cls._loaded = True
 
     @classmethod
-    def get_functions(cls) -> Set[str]:
+    def get_functions(cls) -> FrozenSet[str]:
         """Get all PHP built-in functions."""
         cls.load()
         return cls._functions
 
     @classmethod
-    def get_classes(cls) -> Set[str]:
+    def get_classes(cls) -> FrozenSet[str]:
         """Get all PHP built-in classes."""
         cls.load()
         return cls._classes
 
     @classmethod
-    def get_methods(cls) -> Set[str]:
+    def get_methods(cls) -> FrozenSet[str]:
         """Get all PHP built-in methods."""
         cls.load()
         return cls._methods
@@ -861,9 +869,9 @@ class PHPBuiltinsLoader:
     def reset(cls) -> None:
         """Reset loader state (for testing)."""
         cls._loaded = False
-        cls._functions = set()
-        cls._classes = set()
-        cls._methods = set()
+        cls._functions = frozenset()
+        cls._classes = frozenset()
+        cls._methods = frozenset()
 
 
 # =============================================================================
@@ -1041,9 +1049,14 @@ class CompiledPatterns:
         return cls._dynamic_patterns.get(lang, [])
 
 
+# detect_language runs for every tracked, validated and scanned file;
+# repeated paths skip splitext()
+LANGUAGE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=LANGUAGE_CACHE_SIZE)
 def detect_language(file_path: str) -> Optional[Language]:
     """Detect programming language from file extension."""
-    import os
     _, ext = os.path.splitext(file_path)
     return EXTENSION_MAP.get(ext.lower())
 
@@ -28,6 +28,41 @@ from .symbol_patterns import (
 
 logger = logging.getLogger(__name__)
 
+# String literals blanked by _strip_string_contents (compiled once, used per line)
+_DOUBLE_QUOTED_RE = re.compile(r'(?<![f$])"([^"{\\]|\\.)*"')
+_SINGLE_QUOTED_PY_RE = re.compile(r"(?<!f)'([^'{\\]|\\.)*'")
+_SINGLE_QUOTED_RE = re.compile(r"'([^'\\]|\\.)*'")
+_TEMPLATE_LITERAL_RE = re.compile(r'`[^`$]*`')
+
+# Import statements per language (_has_many_imports)
+_IMPORT_PATTERNS: Dict[Language, "re.Pattern"] = {
+    Language.PHP: re.compile(r'use\s+\w+'),
+    Language.JAVASCRIPT: re.compile(r'(?:import|require)\s*\(?'),
+    Language.TYPESCRIPT: re.compile(r'(?:import|require)\s*\(?'),
+    Language.PYTHON: re.compile(r'(?:import|from)\s+\w+'),
+    Language.CSHARP: re.compile(r'using\s+\w+'),
+    Language.GO: re.compile(r'import\s+'),
+    Language.RUST: re.compile(r'use\s+\w+'),
+}
+
+# Names that look like external library methods (matched at the start)
+_EXTERNAL_NAME_RE = re.compile(
+    r'get[A-Z]|set[A-Z]|is[A-Z]|has[A-Z]|on[A-Z]|handle[A-Z]|fetch[A-Z]'
+    r'|Async$|Sync$|Callback$|Handler$'
+)
+
+# Common method naming prefixes (matched at the start, case-insensitive)
+_COMMON_NAME_RE = re.compile(
+    r'(get|set|is|has|can|should|will|did|on|before|after)'
+    r'|(create|update|delete|find|fetch|load|save|store)'
+    r'|(handle|process|execute|perform|run|start|stop)'
+    r'|(init|setup|configure|validate|transform|convert)'
+    r'|(add|remove|clear|reset|enable|disable)',
+    re.IGNORECASE
+)
+
+_CAMEL_CASE_START_RE = re.compile(r'[a-z]+[A-Z]')
+
 
 # =============================================================================
 # DATA CLASSES
@@ -76,6 +111,35 @@ class ValidationResult:
         return self.issues[0].name if self.issues else ""
 
 
+# TRUE language keywords (control flow, declarations) - these can NEVER be
+# function names in any language (_is_valid_symbol, checked per match)
+_NON_SYMBOL_KEYWORDS = frozenset({
+    # Control flow (universal)
+    'if', 'else', 'elseif', 'elif', 'for', 'while', 'do', 'switch', 'case',
+    'break', 'continue', 'return', 'yield', 'try', 'catch', 'finally',
+    'throw', 'throws', 'raise',
+    # Declarations (universal)
+    'class', 'interface', 'trait', 'struct', 'enum', 'function', 'fn', 'func', 'def',
+    'const', 'let', 'var', 'static', 'async', 'await',
+    # Modifiers
+    'public', 'private', 'protected', 'internal', 'final', 'abstract',
+    'virtual', 'override',
+    # Literals and special values
+    'true', 'false', 'null', 'nil', 'None', 'undefined', 'void',
+    # Types (only when they're truly reserved)
+    'int', 'float', 'double', 'bool', 'boolean',
+    # Special
+    'this', 'self', 'super',
+    # Module/import related
+    'import', 'export', 'default', 'use', 'namespace', 'package', 'module',
+    # Rust specific
+    'mod', 'pub', 'crate', 'impl', 'loop', 'move', 'mut', 'ref', 'unsafe',
+    'extern', 'dyn', 'box',
+    # Go specific
+    'go', 'defer', 'chan', 'select', 'range', 'type',
+})
+
+
 # =============================================================================
 # SYMBOL EXTRACTOR
 # =============================================================================
@@ -143,22 +207,22 @@ class SymbolExtractor:
         # - Python f-strings: f"...{...}..."
         # - C# interpolated: $"...{...}..."
         # Pattern: "..." that don't contain { (interpolation marker)
-        line = re.sub(r'(?<![f$])"([^"{\\]|\\.)*"', '""', line)
+        line = _DOUBLE_QUOTED_RE.sub('""', line)
 
         # Replace single-quoted string contents (no interpolation in single quotes for most langs)
         # BUT skip Python f-strings: f'...{...}...'
         if lang == Language.PYTHON:
             # Skip f-strings with single quotes
-            line = re.sub(r"(?<!f)'([^'{\\]|\\.)*'", "''", line)
+            line = _SINGLE_QUOTED_PY_RE.sub("''", line)
         else:
-            line = re.sub(r"'([^'\\]|\\.)*'", "''", line)
+            line = _SINGLE_QUOTED_RE.sub("''", line)
 
         # For JavaScript/TypeScript: handle template literals
         if lang in (Language.JAVASCRIPT, Language.TYPESCRIPT):
             # Only strip simple template literals WITHOUT interpolation
             # Template literals with ${...} contain real code, so keep them
             # Pattern: backtick strings that don't contain ${
-            line = re.sub(r'`[^`$]*`', '``', line)
+            line = _TEMPLATE_LITERAL_RE.sub('``', line)
 
         # For PHP: handle heredoc/nowdoc markers but not full content
         # (multi-line heredocs are handled by _find_docstring_lines)
@@ -287,34 +351,7 @@ class SymbolExtractor:
             return False
 
         # Only filter TRUE language keywords (control flow, declarations)
-        # These can NEVER be function names in any language
-        keywords = {
-            # Control flow (universal)
-            'if', 'else', 'elseif', 'elif', 'for', 'while', 'do', 'switch', 'case',
-            'break', 'continue', 'return', 'yield', 'try', 'catch', 'finally',
-            'throw', 'throws', 'raise',
-            # Declarations (universal)
-            'class', 'interface', 'trait', 'struct', 'enum', 'function', 'fn', 'func', 'def',
-            'const', 'let', 'var', 'static', 'async', 'await',
-            # Modifiers
-            'public', 'private', 'protected', 'internal', 'final', 'abstract',
-            'virtual', 'override',
-            # Literals and special values
-            'true', 'false', 'null', 'nil', 'None', 'undefined', 'void',
-            # Types (only when they're truly reserved)
-            'int', 'float', 'double', 'bool', 'boolean',
-            # Special
-            'this', 'self', 'super',
-            # Module/import related
-            'import', 'export', 'default', 'use', 'namespace', 'package', 'module',
-            # Rust specific
-            'mod', 'pub', 'crate', 'impl', 'loop', 'move', 'mut', 'ref', 'unsafe',
-            'extern', 'dyn', 'box',
-            # Go specific
-            'go', 'defer', 'chan', 'select', 'range', 'type',
-        }
-
-        return name.lower() not in keywords
+        return name.lower() not in _NON_SYMBOL_KEYWORDS
 
 
 # =============================================================================
@@ -328,6 +365,20 @@ class ConfidenceCalculator:
     Lower confidence = more likely a false positive.
     """
 
+    def __init__(self):
+        # File-level traits of the last content scored: all issues of one
+        # file share them, so the file is scanned once instead of per issue
+        self._traits_for: Optional[Tuple[str, Language]] = None
+        self._traits: Tuple[bool, bool] = (False, False)
+
+    def _file_traits(self, content: str, lang: Language) -> Tuple[bool, bool]:
+        """(has many imports, has dynamic patterns) for content."""
+        key = self._traits_for
+        if key is None or key[0] is not content or key[1] is not lang:
+            self._traits = (self._has_many_imports(content, lang), has_dynamic_patterns(content, lang))
+            self._traits_for = (content, lang)
+        return self._traits
+
     def calculate(
         self,
         name: str,
@@ -351,12 +402,14 @@ class ConfidenceCalculator:
         if is_common_external(name):
             confidence -= 0.3
 
+        many_imports, dynamic = self._file_traits(file_content, lang)
+
         # 2. File has many imports? (-0.15)
-        if self._has_many_imports(file_content, lang):
+        if many_imports:
             confidence -= 0.15
 
         # 3. Dynamic patterns in file? (-0.25)
-        if has_dynamic_patterns(file_content, lang):
+        if dynamic:
             confidence -= 0.25
 
         # 4. Similar symbol exists? (+0.1 - likely typo)
@@ -383,19 +436,9 @@ class ConfidenceCalculator:
 
     def _has_many_imports(self, content: str, lang: Language) -> bool:
         """Check if file has many imports (suggests external dependencies)."""
-        import_patterns = {
-            Language.PHP: r'use\s+\w+',
-            Language.JAVASCRIPT: r'(?:import|require)\s*\(?',
-            Language.TYPESCRIPT: r'(?:import|require)\s*\(?',
-            Language.PYTHON: r'(?:import|from)\s+\w+',
-            Language.CSHARP: r'using\s+\w+',
-            Language.GO: r'import\s+',
-            Language.RUST: r'use\s+\w+',
-        }
-
-        pattern = import_patterns.get(lang)
+        pattern = _IMPORT_PATTERNS.get(lang)
         if pattern:
-            matches = re.findall(pattern, content)
+            matches = pattern.findall(content)
             return len(matches) > 5
 
         return False
@@ -403,40 +446,18 @@ class ConfidenceCalculator:
     def _looks_like_external(self, name: str, lang: Language) -> bool:
         """Check if name looks like an external library method."""
         # Common external prefixes/suffixes
-        external_patterns = [
-            r'^get[A-Z]', r'^set[A-Z]', r'^is[A-Z]', r'^has[A-Z]',
-            r'^on[A-Z]', r'^handle[A-Z]', r'^fetch[A-Z]',
-            r'Async$', r'Sync$', r'Callback$', r'Handler$',
-        ]
-
-        for pattern in external_patterns:
-            if re.match(pattern, name):
-                return True
-
-        return False
+        return _EXTERNAL_NAME_RE.match(name) is not None
 
     def _is_common_pattern(self, name: str) -> bool:
         """Check if name follows common method naming patterns."""
-        common_patterns = [
-            r'^(get|set|is|has|can|should|will|did|on|before|after)',
-            r'^(create|update|delete|find|fetch|load|save|store)',
-            r'^(handle|process|execute|perform|run|start|stop)',
-            r'^(init|setup|configure|validate|transform|convert)',
-            r'^(add|remove|clear|reset|enable|disable)',
-        ]
-
-        for pattern in common_patterns:
-            if re.match(pattern, name, re.IGNORECASE):
-                return True
-
-        return False
+        return _COMMON_NAME_RE.match(name) is not None
 
     def _naming_convention_mismatch(self, name: str, lang: Language) -> bool:
         """Check for naming convention mismatch."""
         # Python/Rust use snake_case
         if lang in (Language.PYTHON, Language.RUST, Language.GO):
             # If name is CamelCase in snake_case language
-            if re.match(r'^[a-z]+[A-Z]', name):
+            if _CAMEL_CASE_START_RE.match(name):
                 return True
 
         # PHP/JS/TS/C# use camelCase/PascalCase
@@ -477,6 +498,15 @@ class SymbolValidator:
         # Caches
         self._definition_cache: Dict[Language, Set[str]] = {}
         self._file_cache: Dict[str, str] = {}
+        self._lines_for: Optional[str] = None
+        self._lines_cache: List[str] = []
+
+    def _lines(self, content: str) -> List[str]:
+        """content split into lines (reused for all issues of one file)."""
+        if content is not self._lines_for:
+            self._lines_cache = content.split('\n')
+            self._lines_for = content
+        return self._lines_cache
 
     def validate_file(self, file_path: str) -> List[SymbolIssue]:
         """Validate a single file for hallucinated symbols.
@@ -574,7 +604,7 @@ class SymbolValidator:
         )
 
         # Get context line
-        lines = content.split('\n')
+        lines = self._lines(content)
         context = lines[line - 1].strip() if 0 < line <= len(lines) else ""
 
         # Build reason
@@ -710,6 +740,10 @@ class SymbolValidator:
 
         all_known = (known_symbols or set()) | local_definitions
 
+        # Whole-file scans, done once on the first unknown symbol
+        has_dynamic = None
+        lines = None
+
         issues = []
         for name, line in calls:
             # Skip builtins
@@ -725,7 +759,9 @@ class SymbolValidator:
                 continue
 
             # Check if file has dynamic patterns (reduces confidence)
-            has_dynamic = has_dynamic_patterns(code, lang)
+            if has_dynamic is None:
+                has_dynamic = has_dynamic_patterns(code, lang)
+                lines = code.split('\n')
 
             # Calculate confidence
             confidence = confidence_calc.calculate(
@@ -741,7 +777,6 @@ class SymbolValidator:
                 confidence *= 0.5
 
             # Get context line
-            lines = code.split('\n')
             context = lines[line - 1].strip() if 0 < line <= len(lines) else ""
 
             issues.append(SymbolIssue(
@@ -830,6 +865,7 @@ SYMBOL_RELAXED_PATTERNS = [
     r'/config', r'/migrations', r'/seeds',
     r'\.config\.', r'\.env',
 ]
+_SYMBOL_RELAXED_RES = [re.compile(p, re.IGNORECASE) for p in SYMBOL_RELAXED_PATTERNS]
 
 
 class AdaptiveSymbolValidation:
@@ -864,8 +900,8 @@ class AdaptiveSymbolValidation:
         #         return SymbolValidationMode.STRICT
 
         # 3. Test/Config files -> WARN only
-        for pattern in SYMBOL_RELAXED_PATTERNS:
-            if re.search(pattern, file, re.IGNORECASE):
+        for pattern in _SYMBOL_RELAXED_RES:
+            if pattern.search(file):
                 return SymbolValidationMode.WARN
 
         # 4. Default -> WARN (v2.1: changed from ADAPTIVE)
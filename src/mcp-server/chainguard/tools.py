@@ -602,7 +602,7 @@ Features:
 - Automatic context injection at set_scope
 - Persistent across sessions
 
-First run takes 1-5 minutes depending on project size. Subsequent runs are fast.""",
+First run takes 1-5 minutes depending on project size. Subsequent runs only re-index changed files (force=true rebuilds everything).""",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -619,7 +619,7 @@ First run takes 1-5 minutes depending on project size. Subsequent runs are fast.
                     },
                     "force": {
                         "type": "boolean",
-                        "description": "Force re-initialization even if memory exists",
+                        "description": "Re-index all files (default: only files changed since the last run)",
                         "default": False
                     }
                 },
@@ -35,6 +35,42 @@ class ResponseStatus(str, Enum):
         return self.value
 
 
+def _escape_text(text: str) -> str:
+    """Escape element text like ElementTree does."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _escape_attr(text: str) -> str:
+    """Escape an attribute value like ElementTree does."""
+    text = _escape_text(text)
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+
+def _attrs_to_xml(attrs: Dict[str, Any]) -> str:
+    return "".join(f' {key}="{_escape_attr(str(value))}"' for key, value in attrs.items())
+
+
+def _element(tag: str, attrs: str, content: str) -> str:
+    """Serialize one element; empty content gives a self-closing tag."""
+    if content:
+        return f"<{tag}{attrs}>{content}</{tag}>"
+    return f"<{tag}{attrs} />"
+
+
 @dataclass
 class XMLResponse:
     """
@@ -58,35 +94,33 @@ class XMLResponse:
 
     def to_xml(self) -> str:
         """Generate XML string from response data."""
-        root = ET.Element("chainguard", tool=self.tool, version=VERSION)
-
-        # Status element (required)
-        status_el = ET.SubElement(root, "status")
-        status_el.text = str(self.status)
+        # Serialized directly (same output as ElementTree.tostring, without
+        # building an element tree per response)
+        parts = [
+            '<chainguard tool="', _escape_attr(self.tool), '" version="', VERSION, '">',
+            "<status>", _escape_text(str(self.status)), "</status>",
+        ]
 
         # Message element (optional)
         if self.message:
-            msg_el = ET.SubElement(root, "message")
-            msg_el.text = self.message
+            parts.append(_element("message", "", _escape_text(self.message)))
 
         # Data element (optional)
         if self.data:
-            data_el = ET.SubElement(root, "data")
-            self._dict_to_xml(data_el, self.data)
+            parts.append(_element("data", "", self._dict_to_xml(self.data)))
 
         # Context element (optional)
         if self.context:
-            ctx_el = ET.SubElement(root, "context")
             if isinstance(self.context, dict) and "mode" in self.context:
-                ctx_el.set("mode", str(self.context.get("mode", "")))
+                attrs = _attrs_to_xml({"mode": self.context.get("mode", "")})
                 # Remove mode from dict to avoid duplication
                 context_copy = {k: v for k, v in self.context.items() if k != "mode"}
-                self._dict_to_xml(ctx_el, context_copy)
+                parts.append(_element("context", attrs, self._dict_to_xml(context_copy)))
             else:
-                self._dict_to_xml(ctx_el, self.context)
+                parts.append(_element("context", "", self._dict_to_xml(self.context)))
 
-        # Generate XML string
-        xml_str = ET.tostring(root, encoding="unicode")
+        parts.append("</chainguard>")
+        xml_str = "".join(parts)
 
         if self.pretty:
             # Pretty print with indentation (costs more tokens)
@@ -94,7 +128,7 @@ class XMLResponse:
 
         return xml_str
 
-    def _dict_to_xml(self, parent: ET.Element, data: Dict[str, Any]) -> None:
+    def _dict_to_xml(self, data: Dict[str, Any]) -> str:
         """
         Recursively convert dictionary to XML elements.
 
@@ -105,6 +139,7 @@ class XMLResponse:
         - None -> empty element
         - Attributes via special _attrs key
         """
+        parts = []
         for key, value in data.items():
             # Skip internal keys
             if key.startswith("_"):
@@ -114,24 +149,21 @@ class XMLResponse:
             safe_key = self._sanitize_tag_name(key)
 
             if isinstance(value, dict):
-                child = ET.SubElement(parent, safe_key)
                 # Handle attributes if present
-                if "_attrs" in value:
-                    for attr_key, attr_val in value["_attrs"].items():
-                        child.set(attr_key, str(attr_val))
-                self._dict_to_xml(child, value)
+                attrs = _attrs_to_xml(value["_attrs"]) if "_attrs" in value else ""
+                parts.append(_element(safe_key, attrs, self._dict_to_xml(value)))
 
             elif isinstance(value, (list, tuple)):
                 for item in value:
-                    child = ET.SubElement(parent, safe_key)
                     if isinstance(item, dict):
-                        self._dict_to_xml(child, item)
+                        parts.append(_element(safe_key, "", self._dict_to_xml(item)))
                     else:
-                        child.text = self._to_text(item)
+                        parts.append(_element(safe_key, "", _escape_text(self._to_text(item))))
 
             else:
-                child = ET.SubElement(parent, safe_key)
-                child.text = self._to_text(value)
+                parts.append(_element(safe_key, "", _escape_text(self._to_text(value))))
+
+        return "".join(parts)
 
     def _sanitize_tag_name(self, name: str) -> str:
         """
@@ -8,6 +8,28 @@ import shutil
 from pathlib import Path
 
 
+@pytest.fixture(scope="session")
+def index_cache_dir(tmp_path_factory):
+    """One directory for the per-test extraction caches."""
+    return tmp_path_factory.mktemp("index_cache")
+
+
+@pytest.fixture(autouse=True)
+def isolate_index_cache(index_cache_dir, request, monkeypatch):
+    """Keep the memory_init extraction cache out of the real ~/.chainguard."""
+    import sys
+    from chainguard import cache
+
+    # Opened lazily: tests that never index create no file
+    index_cache = cache.ContentCache(index_cache_dir / f"{abs(hash(request.node.nodeid)):x}.sqlite")
+    monkeypatch.setattr(cache, "index_cache", index_cache)
+    handlers = sys.modules.get("chainguard.handlers")
+    if handlers is not None:
+        monkeypatch.setattr(handlers, "index_cache", index_cache)
+    yield index_cache
+    index_cache.close()
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for tests."""
@@ -4,8 +4,10 @@ Tests for chainguard.ast_analyzer module.
 Tests AST-based code analysis with regex fallback.
 """
 
+import os
 import pytest
 import tempfile
+import threading
 from pathlib import Path
 
 
@@ -181,6 +183,14 @@ class TestRegexAnalyzer:
         from chainguard.ast_analyzer import RegexAnalyzer
         assert RegexAnalyzer is not None
 
+    def test_patterns_compiled_once(self):
+        """Test every pattern string has a compiled counterpart used by analyze()."""
+        from chainguard.ast_analyzer import RegexAnalyzer
+
+        for language, kinds in RegexAnalyzer.PATTERNS.items():
+            compiled = RegexAnalyzer._COMPILED[language]
+            assert {k: p.pattern for k, p in compiled.items()} == kinds
+
     def test_analyze_python_class(self):
         """Test analyzing Python class."""
         from chainguard.ast_analyzer import RegexAnalyzer
@@ -414,6 +424,66 @@ class TestClass:
             Path(f.name).unlink()
 
 
+class TestAnalysisCache:
+    """Tests for the per-file analysis cache of ASTAnalyzer."""
+
+    def test_unchanged_file_reuses_analysis(self, tmp_path, monkeypatch):
+        """Test repeat analyses of an unchanged file skip parsing; edits and invalidate() reparse."""
+        from chainguard.ast_analyzer import ASTAnalyzer, RegexAnalyzer
+
+        analyzer = ASTAnalyzer()
+        analyzer.use_tree_sitter = False
+        calls = []
+        original = RegexAnalyzer.analyze
+        monkeypatch.setattr(RegexAnalyzer, "analyze",
+                            staticmethod(lambda *args: calls.append(args) or original(*args)))
+        src = tmp_path / "mod.py"
+        src.write_text("def one():\n    pass\n")
+
+        first = analyzer.analyze_file(str(src))
+        assert analyzer.analyze_file(str(src)) is first
+        assert len(calls) == 1
+
+        src.write_text("def one():\n    pass\n\n\ndef two():\n    pass\n")
+        assert [s.name for s in analyzer.analyze_file(str(src)).symbols] == ["one", "two"]
+        assert len(calls) == 2
+
+        analyzer.invalidate(str(src))
+        analyzer.analyze_file(str(src))
+        assert len(calls) == 3
+
+        # Content passed in explicitly is never cached
+        analyzer.analyze_file(str(src), content="def three():\n    pass\n")
+        analyzer.analyze_file(str(src), content="def three():\n    pass\n")
+        assert len(calls) == 5
+
+
+class TestListDirectory:
+    """Tests for ASTAnalyzer.list_directory."""
+
+    def test_single_walk_skips_junk_dirs_by_name(self, tmp_path):
+        """Test source files are found once, skipped directories are matched by name only."""
+        from chainguard.ast_analyzer import ASTAnalyzer
+
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("x = 1\n")
+        (tmp_path / "src" / "view.tsx").write_text("")
+        (tmp_path / "src" / "build_utils.py").write_text("")
+        (tmp_path / "src" / "notes.txt").write_text("")
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "index.js").write_text("")
+        (tmp_path / "src" / "build").mkdir()
+        (tmp_path / "src" / "build" / "out.js").write_text("")
+
+        analyzer = ASTAnalyzer()
+        found = sorted(os.path.relpath(p, tmp_path) for p in analyzer.list_directory(str(tmp_path)))
+
+        assert found == [os.path.join("src", n) for n in ("app.py", "build_utils.py", "view.tsx")]
+        assert sorted(analyzer.list_directory(str(tmp_path), {".py"})) == [
+            str(tmp_path / "src" / "app.py"), str(tmp_path / "src" / "build_utils.py")
+        ]
+
+
 class TestTreeSitterAnalyzer:
     """Tests for TreeSitterAnalyzer (when available)."""
 
@@ -430,6 +500,124 @@ class TestTreeSitterAnalyzer:
         result = TreeSitterAnalyzer.is_available()
         assert isinstance(result, bool)
 
+    def test_parser_reused_across_files(self, monkeypatch):
+        """Test one parser per language is created and reused for later files."""
+        import sys
+        import types
+        from chainguard.ast_analyzer import TreeSitterAnalyzer
+
+        created = []
+
+        class FakeParser:
+            def __init__(self):
+                created.append(self)
+                self.language = None
+
+            def parse(self, data):
+                assert isinstance(data, bytes)
+                return types.SimpleNamespace(root_node=None)
+
+        monkeypatch.setitem(sys.modules, "tree_sitter", types.SimpleNamespace(Parser=FakeParser))
+        monkeypatch.setattr(TreeSitterAnalyzer, "_languages", {"python": "PY"})
+        monkeypatch.setattr(TreeSitterAnalyzer, "_local", threading.local())
+        monkeypatch.setattr(TreeSitterAnalyzer, "_walk_tree", classmethod(lambda cls, *args: None))
+
+        for name in ["a.py", "b.py", "c.py"]:
+            analysis = TreeSitterAnalyzer.analyze("x = 1\n", "python", name)
+            assert analysis.file_path == name
+
+        assert len(created) == 1
+        assert created[0].language == "PY"
+
+    def test_edit_range(self):
+        """Test the edit spans exactly the bytes between common prefix and suffix."""
+        from chainguard.ast_analyzer import TreeSitterAnalyzer
+
+        edit = TreeSitterAnalyzer._edit_range(b"a = 1\nb = 2\nc = 3\n", b"a = 1\nb = 42\nc = 3\n")
+        assert edit == {
+            "start_byte": 10, "old_end_byte": 10, "new_end_byte": 11,
+            "start_point": (1, 4), "old_end_point": (1, 4), "new_end_point": (1, 5),
+        }
+        # Pure append: prefix and suffix must not overlap
+        edit = TreeSitterAnalyzer._edit_range(b"aa", b"aaa")
+        assert (edit["start_byte"], edit["old_end_byte"], edit["new_end_byte"]) == (2, 2, 3)
+
+    def test_edit_range_matches_bytewise_scan(self):
+        """Test the bisected prefix/suffix equal a plain byte-by-byte scan."""
+        import random
+        from chainguard.ast_analyzer import TreeSitterAnalyzer
+
+        rng = random.Random(7)
+        for _ in range(200):
+            old = bytes(rng.choice(b"ab\n") for _ in range(rng.randint(0, 40)))
+            i, j = sorted(rng.randint(0, len(old)) for _ in range(2))
+            new = old[:i] + bytes(rng.choice(b"ab\n") for _ in range(rng.randint(0, 5))) + old[j:]
+
+            limit = min(len(old), len(new))
+            start = 0
+            while start < limit and old[start] == new[start]:
+                start += 1
+            suffix = 0
+            while suffix < limit - start and old[-1 - suffix] == new[-1 - suffix]:
+                suffix += 1
+
+            edit = TreeSitterAnalyzer._edit_range(old, new)
+            assert (edit["start_byte"], edit["old_end_byte"], edit["new_end_byte"]) == (
+                start, len(old) - suffix, len(new) - suffix
+            )
+
+    def test_incremental_parse_reuses_edited_tree(self, monkeypatch):
+        """Test incremental analysis edits the previous tree and passes it to the parser."""
+        import sys
+        import types
+        from collections import OrderedDict
+        from chainguard.ast_analyzer import TreeSitterAnalyzer
+
+        parses = []
+
+        class FakeTree:
+            def __init__(self):
+                self.root_node = None
+                self.edits = []
+
+            def edit(self, **kwargs):
+                self.edits.append(kwargs)
+
+        class FakeParser:
+            language = None
+
+            def parse(self, data, old_tree=None):
+                parses.append((data, old_tree))
+                return FakeTree()
+
+        monkeypatch.setitem(sys.modules, "tree_sitter", types.SimpleNamespace(Parser=FakeParser))
+        monkeypatch.setattr(TreeSitterAnalyzer, "_languages", {"python": "PY"})
+        monkeypatch.setattr(TreeSitterAnalyzer, "_local", threading.local())
+        monkeypatch.setattr(TreeSitterAnalyzer, "_trees", OrderedDict())
+        monkeypatch.setattr(TreeSitterAnalyzer, "_walk_tree", classmethod(lambda cls, *args: None))
+
+        TreeSitterAnalyzer.analyze("x = 1\n", "python", "m.py", incremental=True)
+        TreeSitterAnalyzer.analyze("x = 1\n", "python", "m.py", incremental=True)
+        assert len(parses) == 1  # Unchanged content reuses the tree as is
+
+        first_tree = TreeSitterAnalyzer._trees[("m.py", "python")][1]
+        TreeSitterAnalyzer.analyze("x = 2\n", "python", "m.py", incremental=True)
+        assert parses[1] == (b"x = 2\n", first_tree)
+        assert first_tree.edits[0]["start_byte"] == 4
+
+        TreeSitterAnalyzer.analyze("y = 1\n", "python", "other.py")
+        assert parses[2][1] is None
+        assert list(TreeSitterAnalyzer._trees) == [("m.py", "python")]
+
+        # A tree that can't be edited falls back to a full parse
+        def broken_edit(**kwargs):
+            raise ValueError("mismatched tree")
+
+        TreeSitterAnalyzer._trees[("m.py", "python")][1].edit = broken_edit
+        analysis = TreeSitterAnalyzer.analyze("x = 3\n", "python", "m.py", incremental=True)
+        assert parses[3] == (b"x = 3\n", None)
+        assert analysis.file_path == "m.py"
+
 
 class TestFileRelation:
     """Tests for FileRelation dataclass."""
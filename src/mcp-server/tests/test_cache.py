@@ -1,12 +1,12 @@
 """
 Tests for chainguard.cache module.
 
-Tests LRUCache, TTLLRUCache, and GitCache functionality.
+Tests LRUCache, TTLLRUCache, GitCache, and ContentCache functionality.
 """
 
 import time
 import pytest
-from chainguard.cache import LRUCache, TTLLRUCache, GitCache
+from chainguard.cache import LRUCache, TTLLRUCache, GitCache, ContentCache
 
 
 class TestLRUCache:
@@ -186,3 +186,95 @@ class TestGitCache:
         """Test invalidating nonexistent key doesn't raise."""
         cache = GitCache(ttl_seconds=60)
         cache.invalidate("/nonexistent")  # Should not raise
+
+
+class TestResolvePath:
+    """Tests for the cached resolve_path helper."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self, monkeypatch):
+        import chainguard.cache as cache_module
+        monkeypatch.setattr(cache_module, "resolved_path_cache", TTLLRUCache(maxsize=8, ttl_seconds=60))
+
+    def test_hit_skips_resolve(self, tmp_path, monkeypatch):
+        """Test a known absolute path is answered from the cache."""
+        from pathlib import Path
+        from chainguard.cache import resolve_path
+
+        expected = str(tmp_path.resolve())
+        assert resolve_path(str(tmp_path)) == expected
+
+        def fail_resolve(self, strict=False):
+            raise AssertionError("resolve() called on a cache hit")
+
+        monkeypatch.setattr(Path, "resolve", fail_resolve)
+        assert resolve_path(str(tmp_path)) == expected
+
+    def test_relative_path_follows_cwd(self, tmp_path, monkeypatch):
+        """Test '.' resolves against the current cwd, not a cached earlier one."""
+        from chainguard.cache import resolve_path
+
+        first, second = tmp_path / "first", tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+
+        monkeypatch.chdir(first)
+        assert resolve_path(".") == str(first.resolve())
+        monkeypatch.chdir(second)
+        assert resolve_path(".") == str(second.resolve())
+
+
+class TestContentCache:
+    """Tests for the sqlite-backed ContentCache."""
+
+    def test_set_get_persists(self, temp_dir):
+        """Test payloads survive reopening the database."""
+        db = temp_dir / "cache.sqlite"
+        cache = ContentCache(db)
+        key = ContentCache.key("1", "a.py", "x = 1")
+        assert cache.get(key) is None
+        cache.set(key, {"summary": "a.py", "functions": [{"name": "f"}]})
+        cache.close()
+
+        reopened = ContentCache(db)
+        assert reopened.get(key) == {"summary": "a.py", "functions": [{"name": "f"}]}
+        reopened.close()
+
+    def test_key_depends_on_all_parts(self):
+        """Test keys differ when any part differs."""
+        assert ContentCache.key("1", "a.py", "x") != ContentCache.key("1", "b.py", "x")
+        assert ContentCache.key("1", "a.py", "x") != ContentCache.key("2", "a.py", "x")
+        assert ContentCache.key("ab", "c") != ContentCache.key("a", "bc")
+
+    def test_prune_keeps_newest(self, temp_dir):
+        """Test prune drops the oldest entries beyond max_entries."""
+        cache = ContentCache(temp_dir / "cache.sqlite", max_entries=2)
+        for i in range(4):
+            cache.set(f"k{i}", i)
+            time.sleep(0.01)
+
+        assert cache.prune() == 2
+        assert cache.get("k0") is None
+        assert cache.get("k1") is None
+        assert cache.get("k3") == 3
+        cache.close()
+
+    def test_prune_keeps_recently_read(self, temp_dir):
+        """Test an old entry that is still read survives newer, unused ones."""
+        cache = ContentCache(temp_dir / "cache.sqlite", max_entries=2)
+        for i in range(3):
+            cache.set(f"k{i}", i)
+            time.sleep(0.01)
+        assert cache.get("k0") == 0
+
+        assert cache.prune() == 1
+        assert cache.get("k0") == 0
+        assert cache.get("k1") is None
+        assert cache.get("k2") == 2
+        cache.close()
+
+    def test_unwritable_path_is_a_miss(self, temp_dir):
+        """Test sqlite errors degrade to cache misses."""
+        cache = ContentCache(temp_dir / "missing" / "cache.sqlite")
+        cache.set("k", 1)
+        assert cache.get("k") is None
@@ -123,6 +123,20 @@ class TestKeywordExtractor:
         keywords = KeywordExtractor.extract(text)
         assert keywords == []
 
+    def test_repeated_extract_is_cached_copy(self):
+        """Test repeated texts hit the cache but return independent lists."""
+        from chainguard.embeddings import KeywordExtractor, _extract_keywords
+
+        text = "Cache lookup for payment controller"
+        first = KeywordExtractor.extract(text)
+        hits = _extract_keywords.cache_info().hits
+        first.append("mutated")
+
+        second = KeywordExtractor.extract(text)
+        assert _extract_keywords.cache_info().hits == hits + 1
+        assert "mutated" not in second
+        assert sorted(second) == ["cache", "controller", "lookup", "payment"]
+
 
 class TestDetectTaskType:
     """Tests for detect_task_type function."""
@@ -255,6 +269,33 @@ class TestEmbeddingEngine:
         assert engine.model_name == "custom-model"
         assert engine.is_loaded is False
 
+    def test_onnx_backend_falls_back_to_torch(self):
+        """Test ONNX loading failures fall back to the PyTorch model."""
+        import sys
+        from unittest.mock import MagicMock, patch
+        from chainguard.embeddings import EmbeddingEngine, ONNX_MODEL_FILE
+
+        st_module = MagicMock()
+        torch_model = object()
+
+        def fake_model(name, backend=None, model_kwargs=None):
+            if backend == "onnx":
+                raise ImportError("optimum not installed")
+            return torch_model
+
+        st_module.SentenceTransformer.side_effect = fake_model
+        engine = EmbeddingEngine(use_onnx=True)
+        assert engine.model_label == "all-MiniLM-L6-v2-onnx-int8"
+
+        with patch.dict(sys.modules, {"sentence_transformers": st_module}):
+            engine._load_model_sync()
+
+        assert engine._model is torch_model
+        assert engine.model_label == "all-MiniLM-L6-v2"
+        first_call = st_module.SentenceTransformer.call_args_list[0]
+        assert first_call.kwargs["model_kwargs"] == {"file_name": ONNX_MODEL_FILE}
+        engine.close()
+
     def test_global_engine_exists(self):
         """Test that global embedding_engine instance exists."""
         from chainguard.embeddings import embedding_engine
@@ -4,10 +4,13 @@ Tests for chainguard.handlers module.
 Tests HandlerRegistry and individual handler functions.
 """
 
+import asyncio
+import os
 import pytest
 import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
+from pathlib import Path
 from dataclasses import dataclass
 
 # Mock TextContent before importing handlers
@@ -27,6 +30,11 @@ from chainguard.handlers import (
     HandlerRegistry,
     handler,
     _text,
+    _project_file,
+    _line_count,
+    _respond_text,
+    _respond_xml,
+    _basename,
     _check_context,
     handle_set_scope,
     handle_track,
@@ -48,9 +56,20 @@ from chainguard.handlers import (
     handle_recall,
     handle_history,
     handle_learn,
+    handle_word_count,
+    _count_chunk_words,
+    handle_health_check,
+    handle_sources,
+    handle_facts,
+    _load_index_file,
+    _extract_index_payload,
+    _index_documents,
+    _compile_glob,
+    _iter_project_files,
 )
 from chainguard.models import ScopeDefinition, ProjectState
 from chainguard.config import CONTEXT_MARKER, CONTEXT_REFRESH_TEXT
+from chainguard.cache import ContentCache
 
 # Patch TextContent in the handlers module
 import chainguard.handlers as handlers_module
@@ -242,6 +261,38 @@ class TestHelperFunctions:
         assert result[0].type == "text"
         assert result[0].text == "Hello World"
 
+    def test_basename(self):
+        """Test _basename handles posix, windows and bare names."""
+        assert _basename("src/app/Controller.php") == "Controller.php"
+        assert _basename("C:\\proj\\main.py") == "main.py"
+        assert _basename("README.md") == "README.md"
+
+    def test_respond_variants(self):
+        """Test message-only responses in text and XML form."""
+        from chainguard.xml_response import xml_warning
+        assert _respond_text(xml_warning, "analyze", "target missing", "⚠")[0].text == "⚠ target missing"
+        xml = _respond_xml(xml_warning, "analyze", "target missing", "⚠")[0].text
+        assert 'tool="analyze"' in xml
+        assert "target missing" in xml
+
+    def test_project_file(self, temp_dir):
+        """Test _project_file joins relative paths and keeps absolute ones."""
+        absolute = str(temp_dir / "abs.txt")
+        assert _project_file(str(temp_dir), "docs/a.md") == temp_dir / "docs" / "a.md"
+        assert _project_file(temp_dir, absolute) == Path(absolute)
+
+    def test_line_count_matches_splitlines(self):
+        """Test _line_count agrees with splitlines() for LF and CRLF text."""
+        for text in ["", "a", "a\n", "a\nb", "a\r\nb\r\n", "\n\n", "x\n\ny"]:
+            assert _line_count(text) == len(text.splitlines())
+
+    def test_create_file_summary_doc_comments(self):
+        """Test file summaries pick up the first docstring / JSDoc comment."""
+        py = handlers_module._create_file_summary(Path("user_model.py"), '"""User model."""\nclass User:\n    pass\n')
+        assert py == "user_model.py: defines classes, model definition. 3 lines. User model."
+        js = handlers_module._create_file_summary(Path("api.js"), "/**\n * Fetch\n * helpers\n */\nfunction a() {}\n")
+        assert js.endswith("Fetch helpers")
+
     def test_check_context_with_marker(self):
         """Test context check with correct marker."""
         result = _check_context({"ctx": CONTEXT_MARKER})
@@ -977,6 +1028,34 @@ class TestHandleHistory:
 
                 assert "Keine History" in result[0].text
 
+    @pytest.mark.asyncio
+    async def test_history_entries(self, mock_state):
+        """Test history renders entries with the import-time renderer."""
+        from chainguard.history import HistoryEntry
+        entries = [HistoryEntry(
+            ts="2024-01-01T12:34:56", file="src/app/Controller.php",
+            action="edit", validation="PASS"
+        )]
+        with patch('chainguard.handlers.pm') as pm_mock:
+            pm_mock.get_async = AsyncMock(return_value=mock_state)
+
+            with patch('chainguard.handlers.HistoryManager') as hm_mock:
+                hm_mock.get_history = AsyncMock(return_value=entries)
+
+                result = await handle_history({"working_dir": "/tmp"})
+
+                assert "Controller.php" in result[0].text
+                assert "src/app" not in result[0].text
+
+    def test_history_legacy_renderer(self):
+        """Test the legacy history renderer output."""
+        from chainguard.handlers import _render_history_legacy
+        text = _render_history_legacy(
+            [{"time": "12:34", "file": "a.py", "action": "edit", "status": "ok"}], 1, True
+        )
+        assert "1 Einträge (aktueller Scope)" in text
+        assert "a.py" in text and "✓" in text
+
 
 class TestHandleLearn:
     """Tests for handle_learn handler."""
@@ -1013,3 +1092,1079 @@ class TestHandleLearn:
 
                 assert "✓" in result[0].text or "dokumentiert" in result[0].text
                 hm_mock.update_resolution.assert_called_once()
+
+
+# =============================================================================
+# Test Mode-Specific Handlers
+# =============================================================================
+
+class TestHandleWordCount:
+    """Tests for handle_word_count handler."""
+
+    @pytest.mark.asyncio
+    async def test_word_count_file(self, mock_state, temp_dir):
+        """Test counting words in a file relative to the project."""
+        mock_state.project_path = str(temp_dir)
+        (temp_dir / "chapter1.md").write_text("one two three\nfour  five")
+
+        with patch('chainguard.handlers.pm') as pm_mock:
+            pm_mock.get_async = AsyncMock(return_value=mock_state)
+
+            result = await handle_word_count({"working_dir": "/tmp", "file": "chapter1.md"})
+
+            assert "5 words" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_word_count_cached_until_changed(self, mock_state, temp_dir):
+        """Test unchanged files are served from the cache."""
+        mock_state.project_path = str(temp_dir)
+        chapter = temp_dir / "chapter2.md"
+        chapter.write_text("alpha beta")
+
+        with patch('chainguard.handlers.pm') as pm_mock:
+            pm_mock.get_async = AsyncMock(return_value=mock_state)
+
+            await handle_word_count({"working_dir": "/tmp", "file": "chapter2.md"})
+            with patch('chainguard.handlers._count_words_async') as read_mock:
+                result = await handle_word_count({"working_dir": "/tmp", "file": "chapter2.md"})
+                read_mock.assert_not_called()
+            assert "2 words" in result[0].text
+
+            chapter.write_text("alpha beta gamma")
+            result = await handle_word_count({"working_dir": "/tmp", "file": "chapter2.md"})
+            assert "3 words" in result[0].text
+
+    def test_count_chunk_words_across_boundaries(self):
+        """Test chunked counting matches str.split() across chunk borders."""
+        text = "The  quick brown\nfox jumps\u00a0over the lazy dog "
+        for size in (1, 2, 3, 5, 7, 64):
+            total, in_word = 0, False
+            for i in range(0, len(text), size):
+                words, in_word = _count_chunk_words(text[i:i + size], in_word)
+                total += words
+            assert total == len(text.split())
+
+    @pytest.mark.asyncio
+    async def test_word_count_missing_file(self, mock_state, temp_dir):
+        """Test missing files produce a not-found warning."""
+        mock_state.project_path = str(temp_dir)
+
+        with patch('chainguard.handlers.pm') as pm_mock:
+            pm_mock.get_async = AsyncMock(return_value=mock_state)
+
+            result = await handle_word_count({"working_dir": "/tmp", "file": "missing.md"})
+
+            assert "not found" in result[0].text
+
+
+class TestHandleHealthCheck:
+    """Tests for handle_health_check."""
+
+    @pytest.fixture(autouse=True)
+    def clear_health_cache(self):
+        handlers_module._health_cache.clear()
+        yield
+        handlers_module._health_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_repeated_check_uses_cached_results(self, mock_state):
+        """Test a repeated check within the TTL does not re-probe."""
+        proc = MagicMock()
+        proc.communicate = AsyncMock(return_value=(b"active\n", b""))
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.asyncio.create_subprocess_exec',
+                   AsyncMock(return_value=proc)) as exec_mock:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+
+            first = await handle_health_check({"services": ["nginx"]})
+            second = await handle_health_check({"services": ["nginx"]})
+
+        exec_mock.assert_awaited_once()
+        assert first[0].text == second[0].text
+        assert mock_pm.save_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_check_is_not_cached(self, mock_state):
+        """Test a service that was down is probed again and shows its recovery."""
+        down, up = MagicMock(), MagicMock()
+        down.communicate = AsyncMock(return_value=(b"inactive\n", b""))
+        up.communicate = AsyncMock(return_value=(b"active\n", b""))
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.asyncio.create_subprocess_exec',
+                   AsyncMock(side_effect=[down, up])) as exec_mock:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+
+            first = await handle_health_check({"services": ["nginx"]})
+            second = await handle_health_check({"services": ["nginx"]})
+
+        assert exec_mock.await_count == 2
+        assert "✗ nginx: inactive" in first[0].text
+        assert "✓ nginx: active" in second[0].text
+
+    @pytest.mark.asyncio
+    async def test_cache_key_keeps_separators_apart(self, mock_state):
+        """Test ['a,b'] and ['a', 'b'] are different cache entries."""
+        probe = AsyncMock(return_value={"success": True, "status_code": 200})
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.http_session_manager') as mock_http:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+            mock_http.test_endpoint = probe
+
+            await handle_health_check({"endpoints": ["a,b"]})
+            result = await handle_health_check({"endpoints": ["a", "b"]})
+
+        assert probe.await_count == 3
+        assert "2/2 OK" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_cached_results_follow_request_order(self, mock_state):
+        """Test the same targets in another order are listed in that order."""
+        probe = AsyncMock(return_value={"success": True, "status_code": 200})
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.http_session_manager') as mock_http:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+            mock_http.test_endpoint = probe
+
+            await handle_health_check({"endpoints": ["http://a/", "http://b/"]})
+            result = await handle_health_check({"endpoints": ["http://b/", "http://a/"]})
+
+        text = result[0].text
+        assert text.index("http://b/") < text.index("http://a/")
+
+    @pytest.mark.asyncio
+    async def test_services_use_single_systemctl_call(self, mock_state):
+        """Test all services are queried with one systemctl process."""
+        proc = MagicMock()
+        proc.communicate = AsyncMock(return_value=(b"active\ninactive\n", b""))
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.asyncio.create_subprocess_exec',
+                   AsyncMock(return_value=proc)) as exec_mock:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+
+            result = await handle_health_check({"services": ["nginx", "redis"]})
+
+        exec_mock.assert_awaited_once()
+        assert exec_mock.call_args[0][:4] == ("systemctl", "is-active", "nginx", "redis")
+        assert "✓ nginx: active" in result[0].text
+        assert "✗ redis: inactive" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_services_fall_back_to_single_calls_on_line_mismatch(self, mock_state):
+        """Test one bad unit name does not make every service unknown."""
+        batch, nginx, bad = MagicMock(), MagicMock(), MagicMock()
+        batch.communicate = AsyncMock(return_value=(b"active\n", b""))
+        nginx.communicate = AsyncMock(return_value=(b"active\n", b""))
+        bad.communicate = AsyncMock(return_value=(b"", b""))
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.asyncio.create_subprocess_exec',
+                   AsyncMock(side_effect=[batch, nginx, bad])) as exec_mock:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+
+            result = await handle_health_check({"services": ["nginx", "bad unit"]})
+
+        assert exec_mock.await_count == 3
+        assert "✓ nginx: active" in result[0].text
+        assert "✗ bad unit: " in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_timed_out_systemctl_is_killed(self, mock_state):
+        """Test a systemctl call that times out is killed and reaped."""
+        proc = MagicMock(returncode=None)
+        proc.communicate = AsyncMock(side_effect=asyncio.TimeoutError())
+        proc.wait = AsyncMock(return_value=-9)
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.asyncio.create_subprocess_exec',
+                   AsyncMock(return_value=proc)):
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+
+            result = await handle_health_check({"services": ["nginx"]})
+
+        proc.kill.assert_called_once()
+        proc.wait.assert_awaited_once()
+        assert "? nginx: unknown" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_endpoints_probed_concurrently(self, mock_state):
+        """Test endpoint probes run concurrently and failures stay per-URL."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_probe(url, method, project_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if "down" in url:
+                raise ConnectionError("refused")
+            return {"success": True, "status_code": 200}
+
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.http_session_manager') as mock_http:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+            mock_http.test_endpoint = fake_probe
+
+            result = await handle_health_check({
+                "endpoints": ["http://a/", "http://down/", "http://b/"]
+            })
+
+        assert max_in_flight == 3
+        text = result[0].text
+        assert "2/3 OK" in text
+        assert "✓ http://a/: 200" in text
+        assert "✗ http://down/: refused" in text
+
+    @pytest.mark.asyncio
+    async def test_endpoint_ok_requires_2xx(self, mock_state):
+        """Test a non-2xx status is never shown as healthy."""
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.http_session_manager') as mock_http:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+            mock_http.test_endpoint = AsyncMock(return_value={"success": True, "status_code": 502})
+
+            result = await handle_health_check({"endpoints": ["http://gw/"]})
+
+        assert "✗ http://gw/: 502" in result[0].text
+        assert "0/1 OK" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_services_unknown_when_systemctl_missing(self, mock_state):
+        """Test services are reported unknown if systemctl cannot run."""
+        with patch('chainguard.handlers.pm') as mock_pm, \
+             patch('chainguard.handlers.asyncio.create_subprocess_exec',
+                   AsyncMock(side_effect=FileNotFoundError())):
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            mock_pm.save_async = AsyncMock()
+
+            result = await handle_health_check({"services": ["nginx"]})
+
+        assert "? nginx: unknown" in result[0].text
+
+
+class TestHandleResearchListings:
+    """Tests for handle_sources and handle_facts."""
+
+    @pytest.mark.asyncio
+    async def test_sources_sections(self, mock_state):
+        """Test sources are listed per relevance, low ones only counted."""
+        mock_state.add_source("https://a.example", title="Alpha", relevance="high")
+        mock_state.add_source("https://b.example", relevance="medium")
+        mock_state.add_source("https://c.example", relevance="low")
+        with patch('chainguard.handlers.pm') as mock_pm:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+
+            result = await handle_sources({})
+
+        assert result[0].text.split("\n") == [
+            "📚 **3 Sources**", "",
+            "⭐ **High Relevance:**", "   • Alpha", "",
+            "📄 **Medium Relevance:**", "   • https://b.example", "",
+            "📎 Low Relevance: 1 sources",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_facts_skip_empty_sections(self, mock_state):
+        """Test empty confidence sections are omitted."""
+        mock_state.add_fact("Water boils at 100C", confidence="verified")
+        with patch('chainguard.handlers.pm') as mock_pm:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+
+            result = await handle_facts({})
+
+        text = result[0].text
+        assert "✓ **Verified:**\n   • Water boils at 100C" in text
+        assert "Likely" not in text
+        assert "Uncertain" not in text
+
+
+class FakeMemoryStore:
+    """In-memory stand-in for ProjectMemory (documents per collection)."""
+
+    def __init__(self):
+        self.docs = {}
+        self.save_metadata = AsyncMock()
+        self.get_stats = AsyncMock(return_value=MagicMock(
+            collections={}, total_documents=0, storage_size_mb=0.0
+        ))
+
+    async def upsert(self, content, collection, metadata=None, doc_id=None):
+        self.docs.setdefault(collection, {})[doc_id] = metadata
+
+    async def upsert_batch(self, contents, collection, metadatas=None, doc_ids=None):
+        self.batch_calls = getattr(self, "batch_calls", 0) + 1
+        for metadata, doc_id in zip(metadatas, doc_ids):
+            self.docs.setdefault(collection, {})[doc_id] = metadata
+        return doc_ids
+
+    async def update_metadatas(self, collection, metadatas):
+        docs = self.docs.get(collection, {})
+        for doc_id, metadata in metadatas.items():
+            if doc_id in docs:
+                docs[doc_id] = metadata
+        return len(metadatas)
+
+    async def get(self, doc_id, collection):
+        metadata = self.docs.get(collection, {}).get(doc_id)
+        return None if metadata is None else MagicMock(id=doc_id, metadata=metadata)
+
+    async def get_metadatas(self, collection):
+        return {doc_id: meta for doc_id, meta in self.docs.get(collection, {}).items()}
+
+    async def delete(self, collection, doc_ids=None, where=None):
+        docs = self.docs.get(collection, {})
+        if where:
+            doc_ids = [i for i, meta in docs.items() if all(meta.get(k) == v for k, v in where.items())]
+        for doc_id in doc_ids or []:
+            docs.pop(doc_id, None)
+        return len(doc_ids or [])
+
+
+class FakeMemoryBatch:
+    def __init__(self, memory, batch_size=None, upsert=False):
+        self.memory = memory
+        self.upsert = upsert
+        self.written = {}
+        self.errors = []
+
+    async def add(self, content, collection, metadata=None, doc_id=None):
+        docs = self.memory.docs.setdefault(collection, {})
+        if self.upsert:
+            docs[doc_id] = metadata
+        else:
+            docs.setdefault(doc_id, metadata)
+        self.written.setdefault(collection, []).append(doc_id)
+
+    async def flush(self):
+        return []
+
+
+@pytest.fixture
+def memory_env(temp_dir, monkeypatch):
+    """Project dir + fake memory wired into the memory handlers."""
+    state = ProjectState(project_id="p1", project_name="Proj", project_path=str(temp_dir))
+    memory = FakeMemoryStore()
+    manager = MagicMock()
+    manager.memory_exists = AsyncMock(return_value=False)
+    manager.get_memory = AsyncMock(return_value=memory)
+    monkeypatch.setattr(handlers_module, "MEMORY_AVAILABLE", True)
+    monkeypatch.setattr(handlers_module, "memory_manager", manager, raising=False)
+    monkeypatch.setattr(handlers_module, "MemoryBatch", FakeMemoryBatch, raising=False)
+    monkeypatch.setattr(handlers_module, "index_cache", ContentCache(temp_dir / "cache.sqlite"))
+    monkeypatch.setattr(handlers_module, "get_project_id", lambda path: "p1", raising=False)
+    pm_mock = MagicMock()
+    pm_mock.get_async = AsyncMock(return_value=state)
+    pm_mock.save_async = AsyncMock()
+    monkeypatch.setattr(handlers_module, "pm", pm_mock)
+    return temp_dir, memory, manager
+
+
+class TestDetectArchitectureMemory:
+    """Tests for storing detect_architecture results in memory."""
+
+    @pytest.mark.asyncio
+    async def test_stores_architecture_with_one_batch_write(self, memory_env, monkeypatch):
+        """Test main pattern, layers and design patterns are upserted in a single batch."""
+        import chainguard.architecture as architecture_module
+        from chainguard.architecture import ArchitecturePattern
+
+        project, memory, manager = memory_env
+        manager.memory_exists = AsyncMock(return_value=True)
+        analysis = MagicMock(
+            pattern=ArchitecturePattern.MVC, framework=None, confidence=0.8,
+            detected_layers=["Controllers", "Models"], detected_patterns=["Repository"],
+            suggestions=[],
+        )
+        monkeypatch.setattr(architecture_module.architecture_detector, "analyze", lambda path: analysis)
+
+        await handlers_module.handle_detect_architecture({})
+
+        assert memory.batch_calls == 1
+        assert set(memory.docs["architecture"]) == {
+            "arch:main", "arch:layer:controllers", "arch:layer:models", "arch:pattern:repository"
+        }
+        assert memory.docs["architecture"]["arch:main"]["layers"] == "Controllers,Models"
+
+    @pytest.mark.asyncio
+    async def test_memory_init_stores_architecture_with_one_batch_write(self, memory_env):
+        """Test memory_init writes the detected architecture through the same batch."""
+        project, memory, manager = memory_env
+        (project / "app.py").write_text("def main():\n    pass\n")
+
+        await handlers_module.handle_memory_init({})
+
+        assert memory.batch_calls == 1
+        assert "arch:main" in memory.docs["architecture"]
+
+
+class TestMemoryImportFormat:
+    """Tests for choosing the import format in memory_import."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("file_name,expected", [
+        ("export.jsonl", "import_jsonl"),
+        ("export.jsonl.gz", "import_jsonl"),
+        ("export.json", "import_json"),
+        ("export.json.gz", "import_json"),
+        ("export.jsonlog", "import_json"),
+    ])
+    async def test_format_follows_suffix(self, memory_env, monkeypatch, file_name, expected):
+        """Test only .jsonl / .jsonl.gz files are imported as JSONL."""
+        import chainguard.memory_export as memory_export_module
+
+        importer = MagicMock()
+        importer.import_json = AsyncMock(return_value=MagicMock(success=False, error="x"))
+        importer.import_jsonl = AsyncMock(return_value=MagicMock(success=False, error="x"))
+        monkeypatch.setattr(memory_export_module, "memory_importer", importer)
+
+        await handlers_module.handle_memory_import({"file": file_name})
+
+        getattr(importer, expected).assert_awaited_once()
+
+
+class TestMemoryInitIncremental:
+    """Tests for incremental re-runs of memory_init."""
+
+    @pytest.mark.asyncio
+    async def test_rerun_reindexes_only_changed_and_drops_deleted(self, memory_env):
+        """Test a second run skips unchanged files and removes deleted ones."""
+        project, memory, manager = memory_env
+        (project / "keep.py").write_text("def keep():\n    pass\n")
+        (project / "edit.py").write_text("def old_name():\n    pass\n")
+        (project / "gone.py").write_text("def gone():\n    pass\n")
+        await handlers_module.handle_memory_init({})
+
+        manager.memory_exists = AsyncMock(return_value=True)
+        (project / "edit.py").write_text("def new_name():\n    pass\n")
+        os.utime(project / "edit.py", ns=(1, 1))
+        (project / "gone.py").unlink()
+        with patch('chainguard.handlers._load_index_file', wraps=handlers_module._load_index_file) as load:
+            result = await handlers_module.handle_memory_init({})
+
+        assert [call.args[0].name for call in load.call_args_list] == ["edit.py"]
+        assert "1 unverändert, 1 entfernt" in result[0].text
+        assert sorted(memory.docs["functions"]) == ["func:edit.py:new_name", "func:keep.py:keep"]
+        assert sorted(memory.docs["code_structure"]) == ["file:edit.py", "file:keep.py"]
+
+    @pytest.mark.asyncio
+    async def test_narrower_patterns_keep_existing_files(self, memory_env):
+        """Test files outside the patterns of a re-run are kept, not reported as removed."""
+        project, memory, manager = memory_env
+        (project / "a.py").write_text("def a():\n    pass\n")
+        (project / "b.js").write_text("function b() { return 1; }\n")
+        await handlers_module.handle_memory_init({})
+
+        manager.memory_exists = AsyncMock(return_value=True)
+        result = await handlers_module.handle_memory_init({"include_patterns": ["**/*.py"]})
+
+        assert "1 unverändert, 0 entfernt" in result[0].text
+        assert sorted(memory.docs["code_structure"]) == ["file:a.py", "file:b.js"]
+
+    @pytest.mark.asyncio
+    async def test_failed_reindex_keeps_previous_documents(self, memory_env, monkeypatch):
+        """Test a changed file that fails to load keeps its old documents."""
+        project, memory, manager = memory_env
+        (project / "edit.py").write_text("def old_name():\n    pass\n")
+        await handlers_module.handle_memory_init({})
+
+        manager.memory_exists = AsyncMock(return_value=True)
+        (project / "edit.py").write_text("def new_name():\n    pass\n")
+        os.utime(project / "edit.py", ns=(1, 1))
+
+        def broken_load(file_path):
+            raise OSError("read failed")
+
+        monkeypatch.setattr(handlers_module, "_load_index_file", broken_load)
+        result = await handlers_module.handle_memory_init({})
+
+        assert "edit.py: read failed" in result[0].text
+        assert sorted(memory.docs["functions"]) == ["func:edit.py:old_name"]
+        assert sorted(memory.docs["code_structure"]) == ["file:edit.py"]
+
+    @pytest.mark.asyncio
+    async def test_force_reindexes_everything(self, memory_env):
+        """Test force=true re-indexes unchanged files too."""
+        project, memory, manager = memory_env
+        (project / "a.py").write_text("def a():\n    pass\n")
+        await handlers_module.handle_memory_init({})
+
+        manager.memory_exists = AsyncMock(return_value=True)
+        with patch('chainguard.handlers._load_index_file', wraps=handlers_module._load_index_file) as load:
+            result = await handlers_module.handle_memory_init({"force": True})
+
+        assert load.call_count == 1
+        assert "initialisiert" in result[0].text
+        assert sorted(memory.docs["functions"]) == ["func:a.py:a"]
+
+
+class TestMemoryAutoUpdate:
+    """Tests for the background memory update/delete of tracked files."""
+
+    @pytest.mark.asyncio
+    async def test_function_ids_drive_keyed_deletes(self, memory_env):
+        """Test removed functions are dropped on update and file deletes go by stored IDs."""
+        project, memory, manager = memory_env
+        src = project / "svc.py"
+        src.write_text("def alpha():\n    pass\n\n\ndef beta():\n    pass\n")
+
+        await handlers_module._update_memory_for_file("p1", "svc.py", str(project))
+        file_meta = memory.docs["code_structure"]["file:svc.py"]
+        assert file_meta["function_ids"] == "func:svc.py:alpha\nfunc:svc.py:beta"
+
+        src.write_text("def alpha():\n    return 1\n")
+        await handlers_module._update_memory_for_file("p1", "svc.py", str(project))
+        assert sorted(memory.docs["functions"]) == ["func:svc.py:alpha"]
+
+        memory.delete = AsyncMock(wraps=memory.delete)
+        await handlers_module._delete_from_memory("p1", "svc.py", str(project))
+        assert memory.docs["functions"] == {}
+        assert memory.docs["code_structure"] == {}
+        assert all(call.kwargs.get("where") is None for call in memory.delete.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_update_keeps_all_functions_of_large_file(self, memory_env):
+        """Test an update keeps every function memory_init stores, not just the first 20."""
+        project, memory, manager = memory_env
+        src = project / "big.py"
+        src.write_text("".join(f"def f{i}():\n    pass\n\n\n" for i in range(30)))
+
+        await handlers_module._update_memory_for_file("p1", "big.py", str(project))
+        assert len(memory.docs["functions"]) == 30
+
+        src.write_text(src.read_text() + "def extra():\n    pass\n")
+        await handlers_module._update_memory_for_file("p1", "big.py", str(project))
+        assert len(memory.docs["functions"]) == 31
+        assert "func:big.py:f29" in memory.docs["functions"]
+
+    @pytest.mark.asyncio
+    async def test_delete_falls_back_to_path_filter_for_old_entries(self, memory_env):
+        """Test entries without a stored ID list are still cleaned up by path."""
+        project, memory, manager = memory_env
+        memory.docs["code_structure"] = {"file:old.py": {"type": "file", "path": "old.py"}}
+        memory.docs["functions"] = {
+            "func:old.py:a": {"path": "old.py"}, "func:keep.py:b": {"path": "keep.py"}
+        }
+
+        await handlers_module._delete_from_memory("p1", "old.py", str(project))
+
+        assert list(memory.docs["functions"]) == ["func:keep.py:b"]
+
+
+class TestMemorySummarizeAll:
+    """Tests for memory_summarize over the whole project."""
+
+    @pytest.mark.asyncio
+    async def test_summarizes_all_files_and_skips_existing(self, memory_env):
+        """Test every file is summarized once; existing summaries are kept without force."""
+        project, memory, manager = memory_env
+        manager.memory_exists = AsyncMock(return_value=True)
+        for name in ["a.py", "b.py", "c.js"]:
+            (project / name).write_text(f'"""Module {name}."""\n\ndef run():\n    return 1\n')
+        (project / "empty.py").write_text("\n")
+        (project / "node_modules").mkdir()
+        (project / "node_modules" / "dep.js").write_text("function dep() { return 1; }\n")
+        (project / "app.min.js").write_text("function m(){return 1}\n")
+        stored = {"path": "a.py", "type": "logic_summary", "mtime_ns": os.stat(project / "a.py").st_mtime_ns}
+        memory.docs["code_summaries"] = {"summary:a.py": stored}
+
+        result = await handlers_module.handle_memory_summarize({})
+
+        assert "2 Dateien summarisiert" in result[0].text
+        assert sorted(memory.docs["code_summaries"]) == ["summary:a.py", "summary:b.py", "summary:c.js"]
+        assert memory.docs["code_summaries"]["summary:a.py"] is stored
+
+        result = await handlers_module.handle_memory_summarize({"force": True})
+        assert "3 Dateien summarisiert" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_skips_empty_and_oversized_files_without_reading(self, memory_env, monkeypatch):
+        """Test empty and oversized files never reach the summarizer."""
+        project, memory, manager = memory_env
+        manager.memory_exists = AsyncMock(return_value=True)
+        monkeypatch.setattr(handlers_module, "MEMORY_INDEX_MAX_FILE_BYTES", 200)
+        (project / "ok.py").write_text("def run():\n    return 1\n")
+        (project / "empty.py").write_text("")
+        (project / "bundle.js").write_text("function f() {}\n" * 50)
+        summarized = []
+        original = handlers_module._summary_document
+        monkeypatch.setattr(handlers_module, "_summary_document",
+                            lambda fp, rel, known=None: summarized.append(rel) or original(fp, rel, known))
+
+        await handlers_module.handle_memory_summarize({})
+
+        assert summarized == ["ok.py"]
+
+    @pytest.mark.asyncio
+    async def test_resummarizes_files_changed_since_last_summary(self, memory_env):
+        """Test summaries are refreshed only for files modified after they were stored."""
+        project, memory, manager = memory_env
+        manager.memory_exists = AsyncMock(return_value=True)
+        for name in ["a.py", "b.py"]:
+            (project / name).write_text(f'"""Module {name}."""\n\ndef run():\n    return 1\n')
+
+        result = await handlers_module.handle_memory_summarize({})
+        assert "2 Dateien summarisiert" in result[0].text
+        assert all("mtime_ns" in meta for meta in memory.docs["code_summaries"].values())
+
+        result = await handlers_module.handle_memory_summarize({})
+        assert "0 Dateien summarisiert" in result[0].text
+
+        # Touched but identical content: hashed, not re-summarized
+        st = os.stat(project / "a.py")
+        os.utime(project / "a.py", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        result = await handlers_module.handle_memory_summarize({})
+        assert "0 Dateien summarisiert" in result[0].text
+
+        (project / "b.py").write_text('"""Changed."""\n\ndef run():\n    return 2\n')
+        st = os.stat(project / "b.py")
+        os.utime(project / "b.py", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        result = await handlers_module.handle_memory_summarize({})
+        assert "1 Dateien summarisiert" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_touched_file_is_hashed_only_once(self, memory_env, monkeypatch):
+        """Test a touched but unchanged file gets its mtime refreshed and is not read again."""
+        project, memory, manager = memory_env
+        manager.memory_exists = AsyncMock(return_value=True)
+        src = project / "a.py"
+        src.write_text('"""Module a."""\n\ndef run():\n    return 1\n')
+        await handlers_module.handle_memory_summarize({})
+
+        st = os.stat(src)
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        read = []
+        original = handlers_module._summary_document
+        monkeypatch.setattr(handlers_module, "_summary_document",
+                            lambda fp, rel, known=None: read.append(rel) or original(fp, rel, known))
+
+        result = await handlers_module.handle_memory_summarize({})
+        assert "0 Dateien summarisiert" in result[0].text
+        assert read == ["a.py"]
+        assert memory.docs["code_summaries"]["summary:a.py"]["mtime_ns"] == os.stat(src).st_mtime_ns
+
+        result = await handlers_module.handle_memory_summarize({})
+        assert "0 Dateien summarisiert" in result[0].text
+        assert read == ["a.py"]
+
+    @pytest.mark.asyncio
+    async def test_resummarizes_older_mtime_and_summaries_without_mtime(self, memory_env):
+        """Test an mtime that went backwards and a summary without mtime both count as changed."""
+        project, memory, manager = memory_env
+        manager.memory_exists = AsyncMock(return_value=True)
+        for name in ["restored.py", "legacy.py"]:
+            (project / name).write_text(f'"""Module {name}."""\n\ndef run():\n    return 1\n')
+        mtime_ns = os.stat(project / "restored.py").st_mtime_ns
+        memory.docs["code_summaries"] = {
+            "summary:restored.py": {"path": "restored.py", "mtime_ns": mtime_ns + 1_000_000_000},
+            "summary:legacy.py": {"path": "legacy.py"},
+        }
+
+        result = await handlers_module.handle_memory_summarize({})
+
+        assert "2 Dateien summarisiert" in result[0].text
+        assert memory.docs["code_summaries"]["summary:restored.py"]["mtime_ns"] == mtime_ns
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_write_is_not_counted(self, memory_env, monkeypatch):
+        """Test summaries lost in a failed auto-flush are reported, not counted."""
+        from chainguard.embeddings import EmbeddingResult
+        from chainguard.memory import MemoryBatch
+
+        project, memory, manager = memory_env
+        manager.memory_exists = AsyncMock(return_value=True)
+        monkeypatch.setattr(handlers_module, "MemoryBatch", MemoryBatch)
+        monkeypatch.setattr(handlers_module, "MEMORY_SUMMARY_BATCH_SIZE", 2)
+        for name in ["a.py", "b.py", "c.py"]:
+            (project / name).write_text(f'"""Module {name}."""\n\ndef run():\n    return 1\n')
+        calls = []
+
+        async def upsert_batch(contents, collection, metadatas=None, doc_ids=None, embeddings=None):
+            calls.append(doc_ids)
+            if len(calls) == 1:
+                raise RuntimeError("write failed")
+            return doc_ids
+
+        memory.upsert_batch = upsert_batch
+        engine = MagicMock()
+        engine.encode = AsyncMock(side_effect=lambda texts, batch_size=None: EmbeddingResult(
+            embeddings=[[0.0]] * len(texts), model="m", dimensions=1, count=len(texts)
+        ))
+        with patch("chainguard.memory.embedding_engine", engine):
+            result = await handlers_module.handle_memory_summarize({})
+
+        assert [len(ids) for ids in calls] == [2, 1]
+        assert "1 Dateien summarisiert" in result[0].text
+        assert "Batch write code_summaries (2 docs): write failed" in result[0].text
+
+
+class TestMemoryIndexDocuments:
+    """Tests for the per-file load, extract and document steps of memory_init."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_index_cache(self, temp_dir, monkeypatch):
+        cache = ContentCache(temp_dir / "index_cache.sqlite")
+        monkeypatch.setattr(handlers_module, "index_cache", cache)
+        yield cache
+        cache.close()
+
+    def test_index_documents(self, temp_dir):
+        """Test a file yields its file document plus one per function."""
+        src = temp_dir / "pkg" / "mod.py"
+        src.parent.mkdir()
+        src.write_text("def alpha(x):\n    return x\n\n\ndef beta():\n    pass\n")
+
+        content, _, cached = _load_index_file(src)
+        assert cached is None
+        payload = _extract_index_payload(src, content)
+        docs = _index_documents(src, temp_dir, content, payload, 123)
+
+        collections = [d[0] for d in docs]
+        assert collections[0] == "code_structure"
+        assert docs[0][3] == "file:pkg/mod.py"
+        assert docs[0][2]["lines"] == 6
+        assert docs[0][2]["mtime_ns"] == 123
+        func_ids = [d[3] for d in docs if d[0] == "functions"]
+        assert func_ids == ["func:pkg/mod.py:alpha", "func:pkg/mod.py:beta"]
+        alpha_meta = docs[1][2]
+        assert alpha_meta["path"] == "pkg/mod.py"
+        assert alpha_meta["params"] == "x"
+        assert None not in alpha_meta.values()
+
+    def test_load_index_file_returns_cached_extraction(self, temp_dir, isolated_index_cache):
+        """Test unchanged files come back with their cached payload, changed files without."""
+        src = temp_dir / "mod.py"
+        src.write_text("def alpha():\n    pass\n")
+        content, cache_key, cached = _load_index_file(src)
+        assert cached is None
+        payload = _extract_index_payload(src, content)
+        isolated_index_cache.set_many([(cache_key, payload)])
+
+        assert _load_index_file(src) == (content, cache_key, payload)
+
+    def test_load_index_file_replaces_invalid_utf8(self, temp_dir):
+        """Test undecodable bytes become U+FFFD instead of being dropped."""
+        src = temp_dir / "latin1.py"
+        src.write_bytes(b"name = 'caf\xe9'\n")
+        content, _, _ = _load_index_file(src)
+        assert content == "name = 'caf\ufffd'\n"
+
+        src.write_text("def gamma():\n    pass\n")
+        assert _load_index_file(src)[2] is None
+
+    def test_extract_index_payload_in_worker_process(self, temp_dir):
+        """Test extraction runs in a spawned process and returns the same payload."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        src = temp_dir / "mod.py"
+        content = "class Foo:\n    def bar(self, x):\n        return x\n"
+        src.write_text(content)
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            remote = pool.submit(_extract_index_payload, src, content).result(timeout=60)
+
+        assert remote == _extract_index_payload(src, content)
+        assert [f["name"] for f in remote["functions"]] == ["Foo", "bar"]
+
+    def test_compile_glob(self):
+        """Test glob patterns match like Path.glob on relative paths."""
+        py = _compile_glob("**/*.py")
+        assert py.match("main.py")
+        assert py.match("src/app/main.py")
+        assert not py.match("main.pyc")
+        top = _compile_glob("src/*.js")
+        assert top.match("src/a.js")
+        assert not top.match("src/lib/a.js")
+
+    def test_iter_project_files_prunes_excluded(self, temp_dir):
+        """Test excluded directories and glob excludes are skipped."""
+        for rel in ["a.py", "src/b.js", "src/c.min.js", "node_modules/pkg/d.js", "src/vendor/e.py", "f.txt"]:
+            path = temp_dir / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x = 1\n")
+        errors = []
+
+        found = _iter_project_files(
+            temp_dir, ["**/*.py", "**/*.js"], ["node_modules", "vendor", "*.min.js"], errors
+        )
+
+        rel_paths = sorted(p.relative_to(temp_dir).as_posix() for p in found)
+        assert rel_paths == ["a.py", "src/b.js"]
+        assert errors == []
+
+    def test_load_index_file_empty_file(self, temp_dir):
+        """Test whitespace-only files produce no documents."""
+        src = temp_dir / "empty.py"
+        src.write_text("  \n")
+        assert _load_index_file(src) is None
+
+    def test_load_index_file_skips_binary_and_oversized(self, temp_dir, monkeypatch):
+        """Test NUL-containing and oversized files produce no documents."""
+        binary = temp_dir / "blob.py"
+        binary.write_bytes(b"x = 1\x00\x01\x02")
+        assert _load_index_file(binary) is None
+
+        big = temp_dir / "big.py"
+        big.write_text("x = 1\n" * 10)
+        monkeypatch.setattr(handlers_module, "MEMORY_INDEX_MAX_FILE_BYTES", 20)
+        assert _load_index_file(big) is None
+
+
+class TestProjectSymbols:
+    """Tests for the project symbol scan used by symbol validation."""
+
+    @pytest.mark.asyncio
+    async def test_collects_definitions_and_skips_vendor_dirs(self, temp_dir, monkeypatch):
+        """Test definitions from all project files are collected, excluded dirs are not."""
+        from chainguard.symbol_patterns import Language
+
+        monkeypatch.setattr(handlers_module, "_symbol_cache", handlers_module.TTLLRUCache(maxsize=4))
+        (temp_dir / "pkg").mkdir()
+        (temp_dir / "pkg" / "a.py").write_text("def alpha():\n    pass\n")
+        (temp_dir / "b.py").write_text("class Beta:\n    pass\n")
+        (temp_dir / "node_modules").mkdir()
+        (temp_dir / "node_modules" / "c.py").write_text("def gamma():\n    pass\n")
+        (temp_dir / "pkg" / "build_utils.py").write_text("def delta():\n    pass\n")
+        (temp_dir / "pkg" / "dist").mkdir()
+        (temp_dir / "pkg" / "dist" / "out.py").write_text("def epsilon():\n    pass\n")
+
+        symbols = await handlers_module._get_project_symbols(str(temp_dir), Language.PYTHON)
+
+        assert {"alpha", "Beta", "delta"} <= symbols
+        assert not {"gamma", "epsilon"} & symbols
+
+    @pytest.mark.asyncio
+    async def test_rescan_reparses_only_changed_files(self, temp_dir, monkeypatch):
+        """Test an expired project cache reuses per-file results for unchanged files."""
+        from chainguard.symbol_patterns import Language
+        from chainguard.symbol_validator import SymbolExtractor
+
+        monkeypatch.setattr(handlers_module, "_symbol_cache", handlers_module.TTLLRUCache(maxsize=4))
+        monkeypatch.setattr(handlers_module, "_file_symbol_cache", handlers_module.LRUCache(maxsize=100))
+        (temp_dir / "a.py").write_text("def alpha():\n    pass\n")
+        (temp_dir / "b.py").write_text("def beta():\n    pass\n")
+
+        parsed = []
+        original = SymbolExtractor.extract_definitions
+
+        def counting(self, content, lang):
+            parsed.append(content)
+            return original(self, content, lang)
+
+        monkeypatch.setattr(SymbolExtractor, "extract_definitions", counting)
+        await handlers_module._get_project_symbols(str(temp_dir), Language.PYTHON)
+        assert len(parsed) == 2
+
+        handlers_module._symbol_cache.clear()
+        (temp_dir / "b.py").write_text("def beta_two():\n    pass\n")
+        symbols = await handlers_module._get_project_symbols(str(temp_dir), Language.PYTHON)
+
+        assert len(parsed) == 3
+        assert {"alpha", "beta_two"} <= symbols
+        assert "beta" not in symbols
+
+    @pytest.mark.asyncio
+    async def test_tracked_edit_updates_cached_symbols(self, temp_dir, monkeypatch):
+        """Test an edited file's new definitions reach the cached set without a rescan."""
+        from chainguard.symbol_patterns import Language
+
+        monkeypatch.setattr(handlers_module, "_symbol_cache", handlers_module.TTLLRUCache(maxsize=4))
+        monkeypatch.setattr(handlers_module, "_file_symbol_cache", handlers_module.LRUCache(maxsize=100))
+        (temp_dir / "a.py").write_text("def alpha():\n    pass\n")
+        await handlers_module._get_project_symbols(str(temp_dir), Language.PYTHON)
+
+        edited = temp_dir / "a.py"
+        edited.write_text("def alpha():\n    pass\n\n\ndef beta():\n    pass\n")
+        await handlers_module._refresh_file_symbols(str(temp_dir), edited, Language.PYTHON)
+        (temp_dir / "vendor").mkdir()
+        vendored = temp_dir / "vendor" / "lib.py"
+        vendored.write_text("def gamma():\n    pass\n")
+        await handlers_module._refresh_file_symbols(str(temp_dir), vendored, Language.PYTHON)
+
+        async def no_rescan(*args):
+            raise AssertionError("project was rescanned")
+
+        monkeypatch.setattr(handlers_module.asyncio, "gather", no_rescan)
+        symbols = await handlers_module._get_project_symbols(str(temp_dir), Language.PYTHON)
+        assert {"alpha", "beta"} <= symbols
+        assert "gamma" not in symbols
+
+    def test_scan_symbol_file_in_worker_process(self, temp_dir):
+        """Test the per-file symbol scan runs in a spawned process with the same result."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from chainguard.symbol_patterns import Language
+
+        src = temp_dir / "mod.py"
+        src.write_text("class Foo:\n    def bar(self):\n        pass\n")
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            remote = pool.submit(handlers_module._scan_symbol_file, src, Language.PYTHON, None).result(timeout=60)
+
+        local = handlers_module._scan_symbol_file(src, Language.PYTHON, None)
+        assert remote == local
+        assert {"Foo", "bar"} <= remote[1]
+        assert handlers_module._scan_symbol_file(src, Language.PYTHON, local) is local
+
+
+class TestValidateSymbols:
+    """Tests for chainguard_validate_symbols."""
+
+    @pytest.mark.asyncio
+    async def test_file_is_read_and_validated_off_the_event_loop(self, temp_dir, mock_state, monkeypatch):
+        """Test reading and validating a file both go through the executor."""
+        monkeypatch.setattr(handlers_module, "_symbol_cache", handlers_module.TTLLRUCache(maxsize=4))
+        mock_state.project_path = str(temp_dir)
+        (temp_dir / "app.py").write_text("def helper():\n    pass\n\nhelper()\n")
+
+        loop = asyncio.get_event_loop()
+        submitted = []
+        original = loop.run_in_executor
+
+        def tracking(executor, func, *args):
+            submitted.append(func)
+            return original(executor, func, *args)
+
+        monkeypatch.setattr(loop, "run_in_executor", tracking)
+        with patch('chainguard.handlers.pm') as mock_pm:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            result = await handlers_module.handle_validate_symbols({"file": "app.py"})
+
+        assert "No symbol issues" in result[0].text
+        assert handlers_module.SymbolValidator.validate in submitted
+
+
+class TestValidatePackages:
+    """Tests for the cached PackageValidator behind chainguard_validate_packages."""
+
+    def test_validator_reused_until_manifest_changes(self, temp_dir, monkeypatch):
+        """Test one validator per project, rebuilt when a dependency manifest changes."""
+        monkeypatch.setattr(handlers_module, "_package_validators", handlers_module.LRUCache(maxsize=4))
+        req = temp_dir / "requirements.txt"
+        req.write_text("requests\n")
+
+        first = handlers_module._get_package_validator(str(temp_dir))
+        assert handlers_module._get_package_validator(str(temp_dir)) is first
+        assert first.registry.get_pip_packages()[0] == {"requests"}
+
+        req.write_text("requests\nhttpx\n")
+        os.utime(req, ns=(req.stat().st_atime_ns, req.stat().st_mtime_ns + 1_000_000))
+        second = handlers_module._get_package_validator(str(temp_dir))
+
+        assert second is not first
+        assert second.registry.get_pip_packages()[0] == {"requests", "httpx"}
+
+        (temp_dir / "package.json").write_text('{"dependencies": {"react": "^18"}}')
+        assert handlers_module._get_package_validator(str(temp_dir)) is not second
+
+
+class TestAnalyzeDirectory:
+    """Tests for the parallel directory analysis behind analyze_code."""
+
+    @pytest.mark.asyncio
+    async def test_parses_in_worker_processes_and_caches(self, temp_dir, monkeypatch):
+        """Test uncached files go to the process pool, results are cached in this process."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from chainguard.ast_analyzer import ASTAnalyzer
+
+        analyzer = ASTAnalyzer()
+        monkeypatch.setattr(handlers_module, "ast_analyzer", analyzer)
+        monkeypatch.setattr(handlers_module, "MEMORY_INDEX_PROCESS_MIN_FILES", 2)
+        (temp_dir / "a.py").write_text("def alpha():\n    pass\n")
+        (temp_dir / "b.py").write_text("class Beta:\n    pass\n")
+        (temp_dir / "empty.py").write_text("")
+        (temp_dir / "node_modules").mkdir()
+        (temp_dir / "node_modules" / "c.py").write_text("def gamma():\n    pass\n")
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            monkeypatch.setattr(handlers_module, "_get_index_process_pool", lambda: pool)
+            analyses = await handlers_module._analyze_directory(str(temp_dir))
+
+        names = {Path(p).name: [s.name for s in a.symbols] for p, a in analyses.items()}
+        assert names == {"a.py": ["alpha"], "b.py": ["Beta"]}
+
+        # Second run is served from the cache without any executor
+        monkeypatch.setattr(handlers_module, "_get_index_process_pool", lambda: None)
+        cached, misses = analyzer.split_cached(analyzer.list_directory(str(temp_dir)))
+        assert misses == [] and len(cached) == 3
+        again = await handlers_module._analyze_directory(str(temp_dir))
+        assert all(again[p] is a for p, a in analyses.items())
+
+    def test_index_process_pool_worker_cap(self, monkeypatch):
+        """Test the extraction pool never starts more than the configured workers."""
+        executor = MagicMock()
+        monkeypatch.setattr(handlers_module, "_index_process_pool", None)
+        monkeypatch.setattr(handlers_module, "ProcessPoolExecutor", executor)
+        monkeypatch.setattr(handlers_module.os, "cpu_count", lambda: 64)
+
+        assert handlers_module._get_index_process_pool() is executor.return_value
+        assert executor.call_args.kwargs["max_workers"] == handlers_module.INDEX_PROCESS_POOL_MAX_WORKERS
+
+    @pytest.mark.asyncio
+    async def test_directory_response_lists_distinct_types(self, temp_dir, mock_state, monkeypatch):
+        """Test the directory response reports up to three distinct symbol types per file."""
+        from chainguard.ast_analyzer import ASTAnalyzer
+
+        monkeypatch.setattr(handlers_module, "ast_analyzer", ASTAnalyzer())
+        monkeypatch.setattr(handlers_module, "XML_RESPONSES_ENABLED", False)
+        mock_state.project_path = str(temp_dir)
+        (temp_dir / "src").mkdir()
+        (temp_dir / "src" / "mod.py").write_text(
+            "class A:\n    def m(self):\n        pass\n\n\ndef f():\n    pass\n\n\ndef g():\n    pass\n"
+        )
+
+        with patch('chainguard.handlers.pm') as mock_pm:
+            mock_pm.get_async = AsyncMock(return_value=mock_state)
+            result = await handlers_module.handle_analyze_code({"file": "src"})
+
+        text = result[0].text
+        assert "Analyzed 1 files" in text
+        assert "symbols (class, method, function)" in text
+
+
+class TestStaticResponses:
+    """Tests that the precomputed constant responses keep their text."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("handler_name,args,expected", [
+        ("handle_test_config", {},
+         "Kein Test-Command konfiguriert.\n\nBeispiel:\nchainguard_test_config(\n"
+         "  command=\"./vendor/bin/phpunit\",\n  args=\"tests/\"\n)"),
+        ("handle_run_tests", {},
+         "✗ Kein Test-Command konfiguriert.\n\nZuerst: chainguard_test_config(command=\"...\")"),
+        ("handle_test_status", {}, "Keine Tests ausgeführt.\n\nNutze: chainguard_run_tests()"),
+        ("handle_recall", {},
+         "⚠ Query required. Example: chainguard_recall(query=\"php syntax Controller\")"),
+        ("handle_learn", {},
+         "⚠ resolution required. Example: chainguard_learn(resolution=\"Missing semicolon before }\")"),
+        ("handle_db_table", {}, "⚠ table parameter erforderlich"),
+        ("handle_db_disconnect", {}, "✓ Datenbankverbindung getrennt, Cache gelöscht"),
+        ("handle_health_check", {}, "⚠ No endpoints or services specified"),
+        ("handle_sources", {}, "📚 No sources tracked yet.\n\nUse: chainguard_add_source(url=\"...\")"),
+        ("handle_facts", {}, "🔬 No facts indexed yet.\n\nUse: chainguard_index_fact(fact=\"...\")"),
+    ])
+    async def test_legacy_text_unchanged(self, mock_pm, handler_name, args, expected):
+        """Test each handler still returns the same plain-text response."""
+        with patch('chainguard.handlers.pm', mock_pm):
+            result = await getattr(handlers_module, handler_name)(args)
+
+        assert result[0].text == expected
+
+    def test_xml_variant_built_from_factory(self, monkeypatch):
+        """Test the XML output is the factory's output when XML responses are enabled."""
+        from chainguard.xml_response import xml_warning
+
+        factory = lambda: xml_warning(tool="health_check", message="No endpoints or services specified")
+        monkeypatch.setattr(handlers_module, "XML_RESPONSES_ENABLED", True)
+        assert handlers_module._static(factory, "legacy") == factory()
+        monkeypatch.setattr(handlers_module, "XML_RESPONSES_ENABLED", False)
+        assert handlers_module._static(factory, "legacy") == "legacy"
@@ -4,6 +4,8 @@ Tests for chainguard.http_session module.
 v4.15: Tests Auto-Re-Login functionality.
 """
 
+import asyncio
+
 import pytest
 from chainguard.http_session import HTTPSessionManager
 
@@ -169,3 +171,102 @@ class TestSessionIsolation:
 
         assert manager.is_logged_in("project_a") is False
         assert manager.is_logged_in("project_b") is True
+
+
+class TestPooledClient:
+    """Tests for the pooled aiohttp client used by test_endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_and_cookies_isolated(self):
+        """Test one client serves all calls and cookies stay per project."""
+        web = pytest.importorskip("aiohttp.web")
+
+        seen_cookies = []
+
+        async def handle(request):
+            seen_cookies.append(request.cookies.get("sid"))
+            resp = web.Response(text="ok")
+            resp.set_cookie("sid", "server-set")
+            return resp
+
+        app = web.Application()
+        app.router.add_get("/", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/"
+
+        manager = HTTPSessionManager()
+        try:
+            manager.get_session("project_a")["cookies"]["sid"] = "a-cookie"
+
+            result_a = await manager.test_endpoint(url, project_id="project_a")
+            client = manager._client
+            result_b = await manager.test_endpoint(url, project_id="project_b")
+
+            assert result_a["success"] is True
+            assert result_b["status_code"] == 200
+            assert manager._client is client
+            # project_b must not see project_a's cookie via the shared client
+            assert seen_cookies == ["a-cookie", None]
+            assert manager.get_session("project_b")["cookies"]["sid"] == "server-set"
+        finally:
+            await manager.close()
+            await runner.cleanup()
+
+        assert manager._client is None
+
+    def test_client_from_old_loop_is_closed(self):
+        """Test a client bound to a finished event loop is closed when replaced."""
+        pytest.importorskip("aiohttp")
+        manager = HTTPSessionManager()
+
+        old = asyncio.run(manager._get_client())
+        assert not old.closed
+
+        async def replace():
+            new = await manager._get_client()
+            await manager.close()
+            return new
+
+        new = asyncio.run(replace())
+        assert new is not old
+        assert old.closed
+
+
+class TestLazyImport:
+    """Tests that aiohttp stays out of server startup."""
+
+    def test_module_import_does_not_load_aiohttp(self):
+        """Test importing http_session does not import aiohttp."""
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        code = "import sys, chainguard.http_session; print('aiohttp' in sys.modules)"
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=str(Path(__file__).parent.parent), capture_output=True, text=True, timeout=60
+        )
+        assert out.stdout.strip() == "False"
+
+    @pytest.mark.asyncio
+    async def test_broken_aiohttp_falls_back_to_urllib(self, monkeypatch):
+        """Test an aiohttp install that fails to import falls back to urllib."""
+        import sys
+        from unittest.mock import AsyncMock
+        import chainguard.http_session as http_session_module
+
+        monkeypatch.setattr(http_session_module, "HAS_AIOHTTP", True)
+        monkeypatch.setitem(sys.modules, "aiohttp", None)  # import raises ImportError
+        manager = HTTPSessionManager()
+        urllib_result = {"status_code": 200, "headers": {}, "body_preview": "ok", "needs_auth": False, "error": None}
+        manager._test_with_urllib = AsyncMock(return_value=urllib_result)
+
+        result = await manager.test_endpoint("http://127.0.0.1:1/", project_id="p")
+
+        assert result["success"] is True
+        manager._test_with_urllib.assert_awaited_once()
+        assert http_session_module.HAS_AIOHTTP is False
@@ -9,7 +9,7 @@ import pytest
 import tempfile
 import os
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 
 class TestGetProjectId:
@@ -52,6 +52,30 @@ class TestGetProjectId:
             project_id = get_project_id(tmpdir)
             assert len(project_id) == 16
 
+    def test_cached_call_skips_path_resolution(self):
+        """Test a repeated call neither resolves the path nor runs git again."""
+        from chainguard.memory import get_project_id
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = get_project_id(tmpdir)
+            with patch("chainguard.memory.Path.resolve", side_effect=AssertionError("resolved")), \
+                 patch("chainguard.memory.subprocess.run", side_effect=AssertionError("git")):
+                assert get_project_id(tmpdir) == first
+
+    def test_relative_path_follows_cwd(self, tmp_path, monkeypatch):
+        """Test '.' maps to the project of the current cwd after a cwd change."""
+        from chainguard.memory import get_project_id
+
+        first, second = tmp_path / "first", tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+
+        monkeypatch.chdir(first)
+        assert get_project_id(".") == get_project_id(str(first))
+        monkeypatch.chdir(second)
+        assert get_project_id(".") == get_project_id(str(second))
+        assert get_project_id(str(first)) != get_project_id(str(second))
+
 
 class TestValidateProjectIsolation:
     """Tests for validate_project_isolation function."""
@@ -241,6 +265,26 @@ class TestRelevanceScorer:
         # Should have type bonus for database task + table type
         assert result.final_score > 0.4
 
+    def test_score_batch_matches_score_and_keeps_top_k(self):
+        """Test batch scoring equals per-document scoring, best first."""
+        from chainguard.memory import RelevanceScorer, MemoryDocument
+
+        results = [
+            (MemoryDocument(id=f"d{i}", content=f"login handler {i}",
+                            metadata={"type": "file", "_collection": "code_structure"}), i * 0.3)
+            for i in range(6)
+        ]
+
+        batch = RelevanceScorer.score_batch(results, ["login"], "bug", top_k=3)
+
+        single = sorted(
+            (RelevanceScorer.score(doc, dist, ["login"], "bug", "code_structure") for doc, dist in results),
+            key=lambda r: r.final_score, reverse=True
+        )
+        assert [r.document.id for r in batch] == ["d0", "d1", "d2"]
+        assert [r.final_score for r in batch] == [r.final_score for r in single[:3]]
+        assert all(r.collection == "code_structure" for r in batch)
+
 
 class TestContextFormatter:
     """Tests for ContextFormatter class."""
@@ -713,6 +757,209 @@ class TestProjectMemoryMethods:
             assert hasattr(ProjectMemory, method_name), f"Missing method: {method_name}"
 
 
+class TestBatchedIndexing:
+    """Tests for ProjectMemory.add_batch and MemoryBatch (no chromadb needed)."""
+
+    def _memory(self, tmp_path):
+        from chainguard.memory import ProjectMemory
+
+        memory = ProjectMemory("batchtest", tmp_path)
+        memory._initialized = True
+        memory._collections = {"functions": MagicMock(), "code_structure": MagicMock()}
+        return memory
+
+    @pytest.mark.asyncio
+    async def test_query_all_merges_collections_by_distance(self, tmp_path):
+        """Test 'all' queries every collection and merges hits by distance."""
+        memory = self._memory(tmp_path)
+        memory._collections["functions"].query.return_value = {
+            "ids": [["func:a"]], "documents": [["def a"]],
+            "metadatas": [[{"name": "a"}]], "distances": [[0.4]]
+        }
+        memory._collections["code_structure"].query.return_value = {
+            "ids": [["file:a", "file:b"]], "documents": [["a.py", "b.py"]],
+            "metadatas": [[{"path": "a.py"}, {"path": "b.py"}]], "distances": [[0.1, 0.9]]
+        }
+        memory._collections["learnings"] = MagicMock()
+        memory._collections["learnings"].query.side_effect = RuntimeError("broken index")
+
+        with patch("chainguard.memory.embedding_engine") as engine:
+            engine.encode_single = AsyncMock(return_value=[0.0])
+            results = await memory.query("auth", collection="all", n_results=2)
+
+        assert [(doc.id, doc.metadata["_collection"]) for doc, _ in results] == [
+            ("file:a", "code_structure"), ("func:a", "functions"), ("file:b", "code_structure")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_stats_counts_and_storage_size(self, tmp_path):
+        """Test stats report collection counts and the on-disk size."""
+        memory = self._memory(tmp_path)
+        memory._collections["functions"].count.return_value = 3
+        memory._collections["code_structure"].count.side_effect = RuntimeError("closed")
+        (tmp_path / "seg").mkdir()
+        (tmp_path / "seg" / "data.bin").write_bytes(b"x" * 1024 * 1024)
+        (tmp_path / "chroma.sqlite3").write_bytes(b"x" * 512 * 1024)
+
+        stats = await memory.get_stats()
+
+        assert stats.collections == {"functions": 3, "code_structure": 0}
+        assert stats.total_documents == 3
+        assert stats.storage_size_mb == 1.5
+
+    @pytest.mark.asyncio
+    async def test_add_batch_single_write_and_dedup(self, tmp_path):
+        """Test one encode + one add call, repeated IDs keep the first document."""
+        from chainguard.embeddings import EmbeddingResult
+
+        memory = self._memory(tmp_path)
+        encode = AsyncMock(return_value=EmbeddingResult(
+            embeddings=[[0.1], [0.2]], model="m", dimensions=1, count=2
+        ))
+        with patch("chainguard.memory.embedding_engine") as engine:
+            engine.encode = encode
+            ids = await memory.add_batch(
+                ["def a", "def b", "def a again"],
+                "functions",
+                [{"name": "a"}, {"name": "b"}, {"name": "a"}],
+                ["func:x.py:a", "func:x.py:b", "func:x.py:a"]
+            )
+
+        assert ids == ["func:x.py:a", "func:x.py:b"]
+        encode.assert_awaited_once()
+        assert encode.await_args.args[0] == ["def a", "def b"]
+        coll = memory._collections["functions"]
+        coll.add.assert_called_once()
+        kwargs = coll.add.call_args.kwargs
+        assert kwargs["documents"] == ["def a", "def b"]
+        assert kwargs["metadatas"][0]["collection"] == "functions"
+        memory._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_memory_batch_embeds_across_collections(self, tmp_path):
+        """Test MemoryBatch embeds all collections in one call per flush."""
+        from chainguard.memory import MemoryBatch
+        from chainguard.embeddings import EmbeddingResult
+
+        memory = MagicMock()
+        memory.add_batch = AsyncMock()
+        batch = MemoryBatch(memory, batch_size=3)
+        encode = AsyncMock(return_value=EmbeddingResult(
+            embeddings=[[1.0], [2.0], [3.0]], model="m", dimensions=1, count=3
+        ))
+
+        with patch("chainguard.memory.embedding_engine") as engine:
+            engine.encode = encode
+            await batch.add("f1", "code_structure", {"path": "a"}, "file:a")
+            await batch.add("fn1", "functions", {"name": "x"}, "func:a:x")
+            assert memory.add_batch.await_count == 0
+
+            await batch.add("f2", "code_structure", {"path": "b"}, "file:b")
+            await batch.flush()  # nothing left
+
+        encode.assert_awaited_once()
+        assert encode.await_args.args[0] == ["f1", "f2", "fn1"]
+        calls = memory.add_batch.await_args_list
+        assert len(calls) == 2
+        assert calls[0].args == (
+            ["f1", "f2"], "code_structure", [{"path": "a"}, {"path": "b"}], ["file:a", "file:b"]
+        )
+        assert calls[0].kwargs["embeddings"] == [[1.0], [2.0]]
+        assert calls[1].args[1] == "functions"
+        assert calls[1].kwargs["embeddings"] == [[3.0]]
+
+    @pytest.mark.asyncio
+    async def test_add_batch_with_precomputed_embeddings(self, tmp_path):
+        """Test add_batch skips encoding when embeddings are given."""
+        memory = self._memory(tmp_path)
+        with patch("chainguard.memory.embedding_engine") as engine:
+            engine.encode = AsyncMock()
+            await memory.add_batch(["a", "a2"], "functions", None, ["id1", "id1"], embeddings=[[1.0], [9.0]])
+
+        engine.encode.assert_not_awaited()
+        assert memory._collections["functions"].add.call_args.kwargs["embeddings"] == [[1.0]]
+        memory._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_upsert_batch_single_write_last_wins(self, tmp_path):
+        """Test upsert_batch writes once via upsert; repeated IDs keep the last document."""
+        memory = self._memory(tmp_path)
+        with patch("chainguard.memory.embedding_engine") as engine:
+            engine.encode = AsyncMock()
+            ids = await memory.upsert_batch(
+                ["old", "other", "new"], "functions", None, ["id1", "id2", "id1"],
+                embeddings=[[1.0], [2.0], [3.0]]
+            )
+
+        assert ids == ["id1", "id2"]
+        coll = memory._collections["functions"]
+        coll.add.assert_not_called()
+        coll.upsert.assert_called_once()
+        kwargs = coll.upsert.call_args.kwargs
+        assert kwargs["documents"] == ["new", "other"]
+        assert kwargs["embeddings"] == [[3.0], [2.0]]
+        memory._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_memory_batch_upsert_mode(self, tmp_path):
+        """Test MemoryBatch(upsert=True) flushes through upsert_batch."""
+        from chainguard.memory import MemoryBatch
+        from chainguard.embeddings import EmbeddingResult
+
+        memory = MagicMock()
+        memory.add_batch = AsyncMock()
+        memory.upsert_batch = AsyncMock()
+        batch = MemoryBatch(memory, upsert=True)
+        with patch("chainguard.memory.embedding_engine") as engine:
+            engine.encode = AsyncMock(return_value=EmbeddingResult(
+                embeddings=[[1.0]], model="m", dimensions=1, count=1
+            ))
+            await batch.add("s1", "code_summaries", {"path": "a"}, "summary:a")
+            await batch.flush()
+
+        memory.add_batch.assert_not_awaited()
+        memory.upsert_batch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_update_metadatas_skips_embedding(self, tmp_path):
+        """Test metadata updates go through one collection update without re-encoding."""
+        memory = self._memory(tmp_path)
+        with patch("chainguard.memory.embedding_engine") as engine:
+            engine.encode = AsyncMock()
+            count = await memory.update_metadatas("functions", {"id1": {"mtime_ns": 2}})
+            assert await memory.update_metadatas("functions", {}) == 0
+
+        assert count == 1
+        engine.encode.assert_not_awaited()
+        memory._collections["functions"].update.assert_called_once_with(
+            ids=["id1"], metadatas=[{"mtime_ns": 2}]
+        )
+        memory._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_memory_batch_reports_failed_write(self, tmp_path):
+        """Test a failing collection write is recorded and not counted as written."""
+        from chainguard.memory import MemoryBatch
+        from chainguard.embeddings import EmbeddingResult
+
+        memory = self._memory(tmp_path)
+        memory._collections["code_structure"].add.side_effect = RuntimeError("disk full")
+        batch = MemoryBatch(memory)
+        with patch("chainguard.memory.embedding_engine") as engine:
+            engine.encode = AsyncMock(return_value=EmbeddingResult(
+                embeddings=[[1.0], [2.0], [3.0]], model="m", dimensions=1, count=3
+            ))
+            await batch.add("f1", "code_structure", {"path": "a"}, "file:a")
+            await batch.add("f2", "code_structure", {"path": "b"}, "file:b")
+            await batch.add("fn1", "functions", {"name": "x"}, "func:a:x")
+            written = await batch.flush()
+
+        assert written == ["func:a:x"]
+        assert batch.written == {"functions": ["func:a:x"]}
+        assert batch.errors == ["Batch write code_structure (2 docs): disk full"]
+        memory._executor.shutdown(wait=True)
+
+
 class TestArchitectureMemoryIntegration:
     """Tests for v5.4 Architecture-Memory Integration."""
 
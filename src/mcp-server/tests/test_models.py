@@ -6,6 +6,7 @@ Tests ScopeDefinition and ProjectState functionality.
 
 import json
 import pytest
+from unittest.mock import patch
 from chainguard.models import ScopeDefinition, ProjectState
 
 
@@ -65,6 +66,21 @@ class TestProjectState:
         assert data["project_name"] == "TestProject"
         assert data["phase"] == "unknown"
 
+    def test_to_json_matches_stdlib(self):
+        """Test orjson output matches the json fallback."""
+        pytest.importorskip("orjson")
+        state = ProjectState(
+            project_id="test123",
+            project_name="Prüfprojekt ✓",
+            project_path="/tmp/test"
+        )
+        state.add_action("EDIT: über.py")
+        state.chapter_status["Kapitel 1"] = "done"
+        with patch("chainguard.models.HAS_ORJSON", False):
+            expected = state.to_json()
+
+        assert state.to_json() == expected
+
     def test_from_dict_basic(self):
         """Test creating from dictionary."""
         data = {
@@ -194,6 +210,68 @@ class TestProjectState:
 
         assert len(state.recent_actions) <= 5
 
+    def test_add_action_sampled(self):
+        """Test that sampled actions are only recorded every Nth call."""
+        state = ProjectState(
+            project_id="test",
+            project_name="Test",
+            project_path="/tmp"
+        )
+        recorded = [state.add_action_sampled(f"RECALL: {i}", every=3) for i in range(7)]
+
+        assert recorded == [True, False, False, True, False, False, True]
+        assert len(state.recent_actions) == 3
+        assert state._sampled_action_count == 7
+        assert "_sampled_action_count" not in state.to_json()
+        assert "_sampled_action_count" not in repr(state)
+
+        restored = ProjectState.from_dict(dict(json.loads(state.to_json()), _sampled_action_count=7))
+        assert restored._sampled_action_count == 0
+        assert restored == state
+
+    def test_sources_by_relevance_cached_until_changed(self):
+        """Test grouped sources are reused until sources change."""
+        state = ProjectState(
+            project_id="test",
+            project_name="Test",
+            project_path="/tmp"
+        )
+        state.add_source("https://a", relevance="high")
+        state.add_source("https://b", relevance="low")
+        state.add_source("https://c", relevance="bogus")
+
+        groups = state.sources_by_relevance()
+        assert [s["url"] for s in groups["high"]] == ["https://a"]
+        assert groups["medium"] == []
+        assert [s["url"] for s in groups["low"]] == ["https://b"]
+        assert state.sources_by_relevance() is groups
+
+        state.add_source("https://d", relevance="high")
+        assert [s["url"] for s in state.sources_by_relevance()["high"]] == ["https://a", "https://d"]
+
+        state.add_source("https://e", relevance="low")
+        assert "sources" not in state._group_cache
+
+        state.sources = []
+        assert state.sources_by_relevance()["high"] == []
+        assert "_group_cache" not in state.to_json()
+        assert "_group_cache" not in repr(state)
+
+    def test_facts_by_confidence(self):
+        """Test facts are grouped by confidence."""
+        state = ProjectState(
+            project_id="test",
+            project_name="Test",
+            project_path="/tmp"
+        )
+        state.add_fact("A", confidence="verified")
+        state.add_fact("B")
+
+        groups = state.facts_by_confidence()
+        assert [f["fact"] for f in groups["verified"]] == ["A"]
+        assert [f["fact"] for f in groups["likely"]] == ["B"]
+        assert groups["uncertain"] == []
+
     def test_get_status_line(self):
         """Test status line generation."""
         state = ProjectState(
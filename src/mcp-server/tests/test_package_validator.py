@@ -162,6 +162,16 @@ class TestFindSimilarPackages:
         # Should find test, tests (both distance 1)
         assert len(similar) >= 2
 
+    def test_distances_match_full_levenshtein(self):
+        """Early-exit distance check reports the same matches as levenshtein_distance."""
+        known = {"requests", "request", "reqests", "urllib3", "Requests-Oauth", "rq", "resque"}
+        for name in ("requets", "Request", "rqeuests", "urlib3", "x"):
+            expected = sorted(
+                (k, levenshtein_distance(name.lower(), k.lower())) for k in known
+                if abs(len(name) - len(k)) <= 2 and 0 < levenshtein_distance(name.lower(), k.lower()) <= 2
+            )
+            assert sorted(find_similar_packages(name, known)) == expected
+
 
 # =============================================================================
 # PHP TESTS (15 Tests)
@@ -493,6 +503,13 @@ class TestPythonPackageValidation:
         result = validator.validate_content(content, "test.py", Language.PYTHON)
         assert result.has_issues
 
+    def test_case_insensitive_matches(self, python_project):
+        """Package and stdlib names match regardless of case."""
+        content = "import Requests\nimport cprofile"
+        validator = PackageValidator(str(python_project))
+        result = validator.validate_content(content, "test.py", Language.PYTHON)
+        assert not result.has_issues
+
     def test_standard_library(self, python_project):
         """Standard library modules pass validation."""
         content = "import os\nimport json\nimport asyncio"
@@ -537,6 +554,15 @@ class TestPythonPackageValidation:
         result = validator.validate_content(content, "test.py", Language.PYTHON)
         assert not result.registry_found
 
+    def test_no_requirements_txt_repeated(self, temp_project):
+        """A reused validator keeps reporting the missing registry."""
+        content = "import requests\nimport numpy"
+        validator = PackageValidator(str(temp_project))
+        first = validator.validate_content(content, "test.py", Language.PYTHON)
+        second = validator.validate_content(content, "test.py", Language.PYTHON)
+        assert not second.registry_found
+        assert [i.confidence for i in second.issues] == [i.confidence for i in first.issues]
+
     def test_conditional_import(self, python_project):
         """Conditional imports in try/except are handled."""
         content = """
@@ -598,6 +624,13 @@ class TestPackageRegistry:
         packages2, _ = registry.get_composer_packages()
         assert packages1 == packages2
 
+    def test_cache_keeps_not_found(self, temp_project):
+        """Cached lookups keep the found flag of the first read."""
+        registry = PackageRegistry(str(temp_project))
+        for _ in range(2):
+            assert registry.get_pip_packages() == (set(), False)
+            assert registry.get_composer_packages() == (set(), False)
+
     def test_clear_cache(self, php_project):
         """Clear cache works correctly."""
         registry = PackageRegistry(str(php_project))
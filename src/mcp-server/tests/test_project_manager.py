@@ -0,0 +1,81 @@
+"""
+Tests for chainguard.project_manager module.
+"""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch
+
+from chainguard.models import ProjectState
+from chainguard.project_manager import ProjectManager
+
+
+class TestWriteState:
+    """Tests for skipping state writes whose content is already on disk."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        with patch("chainguard.project_manager.CHAINGUARD_HOME", tmp_path):
+            yield ProjectManager()
+
+    @pytest.mark.asyncio
+    async def test_identical_write_skipped_until_changed_or_deleted(self, manager, tmp_path):
+        """Test a repeated write is skipped; a changed state or deleted file is written again."""
+        state = ProjectState(project_id="p1", project_name="Proj", project_path=str(tmp_path))
+        state_path = tmp_path / "projects" / "p1" / "state.json"
+
+        with patch.object(manager, "_write_enforcement_state") as hook:
+            await manager._write_state(state)
+            assert state_path.exists()
+            first_mtime = state_path.stat().st_mtime_ns
+
+            await manager._write_state(state)
+            assert hook.await_count == 1
+            assert state_path.stat().st_mtime_ns == first_mtime
+
+            state.phase = "implementation"
+            await manager._write_state(state)
+            assert hook.await_count == 2
+            assert '"implementation"' in state_path.read_text()
+
+            state_path.unlink()
+            await manager._write_state(state)
+            assert hook.await_count == 3
+            assert ProjectState.from_dict(json.loads(state_path.read_text())) == state
+
+
+class TestDebouncedSave:
+    """Tests for the debounced background save."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        with patch("chainguard.project_manager.CHAINGUARD_HOME", tmp_path):
+            manager = ProjectManager()
+            manager._debounce_delay = 0
+            yield manager
+
+    @pytest.mark.asyncio
+    async def test_write_cancelled_mid_way_is_flushed(self, manager, tmp_path):
+        """Test a project whose write is cancelled stays pending for flush()."""
+        state = ProjectState(project_id="p1", project_name="Proj", project_path=str(tmp_path))
+        started = asyncio.Event()
+
+        async def slow_write(s):
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch.object(manager, "_write_enforcement_state"):
+            with patch.object(manager, "_write_state", side_effect=slow_write):
+                await manager.save_async(state)
+                await started.wait()
+                manager._save_task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await manager._save_task
+
+            assert "p1" in manager._dirty
+            await manager.flush()
+
+        assert (tmp_path / "projects" / "p1" / "state.json").exists()
+        assert not manager._dirty
@@ -1970,6 +1970,27 @@ async fn third() { }
         # (generics are compile-time, not runtime)
 
 
+# =============================================================================
+# PATTERN COMPILATION TESTS
+# =============================================================================
+
+class TestPatternCompilation:
+    """Tests for the compiled symbol patterns (Unicode-aware re module)."""
+
+    def test_patterns_use_re_multiline(self):
+        """Test all patterns are compiled with re and MULTILINE."""
+        import re
+
+        patterns = CompiledPatterns.get_call_patterns(Language.PYTHON)
+        assert patterns
+        assert all(isinstance(p, re.Pattern) and p.flags & re.MULTILINE for p in patterns)
+
+    def test_non_ascii_identifier_is_not_split(self):
+        """Test a call with non-ASCII letters is not reported as its ASCII tail."""
+        calls = extractor.extract_calls("x = größe_berechnen()\n", Language.PYTHON)
+        assert ("e_berechnen", 1) not in calls
+
+
 # =============================================================================
 # LANGUAGE DETECTION TESTS
 # =============================================================================
@@ -2010,6 +2031,12 @@ class TestLanguageDetection:
     def test_detect_unknown(self):
         assert detect_language("test.xyz") is None
 
+    def test_repeated_path_is_cached(self):
+        detect_language.cache_clear()
+        assert detect_language("src/Model.PHP") == Language.PHP
+        assert detect_language("src/Model.PHP") == Language.PHP
+        assert detect_language.cache_info().hits == 1
+
 
 # =============================================================================
 # COMMON EXTERNAL NAMES TESTS
@@ -2041,6 +2068,27 @@ class TestCommonExternalNames:
 class TestConfidenceCalculator:
     """Tests for confidence calculation."""
 
+    def test_file_traits_scanned_once_per_content(self, monkeypatch):
+        """Scoring many symbols of one file scans it for imports/dynamic patterns once."""
+        from chainguard import symbol_validator
+
+        scans = []
+        original = symbol_validator.has_dynamic_patterns
+        monkeypatch.setattr(symbol_validator, "has_dynamic_patterns",
+                            lambda content, lang: scans.append(lang) or original(content, lang))
+        code = "import os\n" + "".join(f"missing_{i}()\n" for i in range(20))
+
+        result = symbol_validator.SymbolValidator.validate(code, "x.py", set())
+        assert len(result.issues) == 20
+        assert len(scans) == 2  # validate() itself + the calculator, not once per issue
+
+        calc = ConfidenceCalculator()
+        other = "eval(x)\n"
+        assert calc.calculate("aaaa", Language.PYTHON, other, False, []) == \
+            calc.calculate("aaaa", Language.PYTHON, other, False, [])
+        assert calc.calculate("aaaa", Language.PYTHON, "x = 1\n", False, []) > \
+            calc.calculate("aaaa", Language.PYTHON, other, False, [])
+
     def test_high_confidence_unknown(self):
         """Unknown symbol should have high confidence."""
         calc = ConfidenceCalculator()
@@ -2210,3 +2258,39 @@ class TestSymbolIssue:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
+
+
+class TestPHPBuiltinsLoader:
+    """Tests for lazy loading of the generated PHP builtins."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_loader(self):
+        from chainguard.symbol_patterns import PHPBuiltinsLoader
+        PHPBuiltinsLoader.reset()
+        yield
+        PHPBuiltinsLoader.reset()
+
+    @pytest.mark.parametrize("has_orjson", [False, True])
+    def test_loads_frozensets_with_either_parser(self, monkeypatch, has_orjson):
+        """Test builtins load into frozensets with the json fallback and with orjson."""
+        import json
+        import types
+        from chainguard import symbol_patterns
+        from chainguard.symbol_patterns import PHPBuiltinsLoader, BUILTINS, Language
+
+        parsed = []
+
+        def fake_loads(raw):
+            parsed.append(type(raw))
+            return json.loads(raw)
+
+        monkeypatch.setattr(symbol_patterns, "HAS_ORJSON", has_orjson)
+        monkeypatch.setattr(symbol_patterns, "orjson", types.SimpleNamespace(loads=fake_loads), raising=False)
+        monkeypatch.setitem(BUILTINS, Language.PHP, set(BUILTINS[Language.PHP]))
+
+        functions = PHPBuiltinsLoader.get_functions()
+
+        assert isinstance(functions, frozenset)
+        assert "array_map" in functions
+        assert "array_map" in BUILTINS[Language.PHP]
+        assert parsed == ([bytes] if has_orjson else [])
@@ -447,6 +447,21 @@ class TestEdgeCases:
         items_count = xml.count("<items>") + xml.count("<items />")
         assert items_count == 4
 
+    def test_special_characters_escaped(self):
+        """Test markup characters in text and attributes are escaped."""
+        xml = xml_info(
+            tool='a"b',
+            message="x < y & z > w",
+            data={"entry": {"_attrs": {"note": 'say "hi"\n'}, "code": "<?php"}}
+        )
+
+        assert is_valid_xml(xml)
+        assert 'tool="a&quot;b"' in xml
+        assert "<message>x &lt; y &amp; z &gt; w</message>" in xml
+        assert '<entry note="say &quot;hi&quot;&#10;"><code>&lt;?php</code></entry>' in xml
+        parsed = parse_xml_response(xml)
+        assert parsed["message"] == "x < y & z > w"
+
 
 # =============================================================================
 # Integration Tests